@@ -0,0 +1,11 @@
+from fastapi import Request
+
+from logic.mediator.base import Mediator
+
+
+async def get_mediator(request: Request) -> Mediator:
+    """The mediator built once in the lifespan.
+
+    Async so FastAPI calls it on the event loop instead of a worker thread.
+    """
+    return request.app.state.mediator
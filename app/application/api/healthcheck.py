@@ -1,6 +1,8 @@
 from dataclasses import dataclass
 
-from fastapi import APIRouter, status
+from fastapi import APIRouter, HTTPException, Request, status
+
+from application.api.schemas import SErrorMessage
 
 
 healthcheck_router = APIRouter()
@@ -12,8 +14,24 @@ class OKStatus:
 
 
 OK_STATUS = OKStatus()
+READY_STATUS = OKStatus(status="READY")
 
 
 @healthcheck_router.get("/", status_code=status.HTTP_200_OK)
 async def get_status() -> OKStatus:
-    return OK_STATUS
\ No newline at end of file
+    return OK_STATUS
+
+
+@healthcheck_router.get(
+    "/ready/",
+    status_code=status.HTTP_200_OK,
+    responses={status.HTTP_503_SERVICE_UNAVAILABLE: {"model": SErrorMessage}},
+)
+async def get_readiness(request: Request) -> OKStatus:
+    """Ready once the database pool has been warmed up."""
+    if not getattr(request.app.state, "is_ready", False):
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Warming up"
+        )
+
+    return READY_STATUS
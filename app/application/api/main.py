@@ -1,7 +1,89 @@
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager, suppress
+
 from fastapi import FastAPI
 
 from application.api.healthcheck import healthcheck_router
+from application.api.metrics import metrics_router
+from application.api.middlewares import (
+    DeferredPublicationsMiddleware,
+    TracingMiddleware,
+)
+from application.api.products.routers import product_router
+from application.api.stats import stats_router
 from application.api.users.routers import user_router
+from infrastructure.message_brokers.base import IMessageBroker
+from infrastructure.repositories.common.warm_up import DatabaseWarmUp
+from infrastructure.repositories.users.availability import UsernameAvailability
+from logic.init import init_container
+from logic.mediator.base import Mediator
+from settings.settings import Settings
+
+
+logger = logging.getLogger(__name__)
+
+
+async def warm_up(
+    app: FastAPI, database_warm_up: DatabaseWarmUp, retry_interval: float
+) -> None:
+    """Retry the warm-up until it succeeds, then report the app ready."""
+    while True:
+        try:
+            await database_warm_up.run()
+        except Exception:
+            logger.exception("Database warm-up failed")
+            await asyncio.sleep(retry_interval)
+        else:
+            break
+
+    app.state.is_ready = True
+    logger.info("Warm-up finished, ready for traffic")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    container = init_container()
+    settings: Settings = container.resolve(Settings)
+    username_availability: UsernameAvailability = container.resolve(
+        UsernameAvailability
+    )
+
+    try:
+        await username_availability.load()
+    except Exception:
+        # Without the filter every availability check goes to the database.
+        logger.exception("Could not load the username filter")
+
+    refresh_task = asyncio.create_task(
+        username_availability.refresh_periodically(
+            settings.USERNAME_FILTER_REFRESH_SECONDS
+        )
+    )
+
+    app.state.mediator = container.resolve(Mediator)
+
+    # Liveness answers right away; readiness waits for the warm pool.
+    app.state.is_ready = False
+    warm_up_task = asyncio.create_task(
+        warm_up(
+            app,
+            container.resolve(DatabaseWarmUp),
+            settings.DB_WARM_UP_RETRY_SECONDS,
+        )
+    )
+
+    yield
+
+    app.state.is_ready = False
+    for task in (warm_up_task, refresh_task):
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+
+    # Never started here, but the mediator created its Kafka clients.
+    await container.resolve(IMessageBroker).stop()
 
 
 def create_app() -> FastAPI:
@@ -9,9 +91,17 @@ def create_app() -> FastAPI:
         title="product service",
         description="Ping? Are they playing table tennis?",
         debug=True,
+        lifespan=lifespan,
     )
 
+    app.add_middleware(DeferredPublicationsMiddleware)
+    # Added last to run first, so deferred event handlers join the trace.
+    app.add_middleware(TracingMiddleware)
+
     app.include_router(healthcheck_router, prefix="/healthcheck", tags=["HEALTHCHECK"])
     app.include_router(user_router, prefix="/users", tags=["USERS"])
+    app.include_router(product_router, prefix="/products", tags=["PRODUCTS"])
+    app.include_router(stats_router, prefix="/stats", tags=["STATS"])
+    app.include_router(metrics_router, tags=["METRICS"])
 
     return app
@@ -0,0 +1,16 @@
+from fastapi import APIRouter, Response, status
+
+from infrastructure.metrics.registry import metrics_registry
+
+
+metrics_router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@metrics_router.get("/metrics", status_code=status.HTTP_200_OK)
+async def get_metrics() -> Response:
+    """Metrics of this process in the Prometheus text format."""
+    return Response(
+        content=metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE
+    )
@@ -0,0 +1,73 @@
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from infrastructure.tracing.base import SpanContext, SpanStatus
+from infrastructure.tracing.tracer import TRACEPARENT_HEADER, tracer
+from logic.mediator.deferred import collect_deferred_publications
+
+
+class DeferredPublicationsMiddleware:
+    """Runs event handlers deferred by the mediator after the response is sent.
+
+    Plain ASGI rather than `BaseHTTPMiddleware`, so the endpoint shares this
+    context and nothing buffers the response.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        async with collect_deferred_publications():
+            await self.app(scope, receive, send)
+
+
+class TracingMiddleware:
+    """Opens the root span of every request, continuing the caller's trace.
+
+    The span is named after the matched route once the router has run, so
+    `/users/{user_oid}/` stays one name whatever the oid.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self.traceparent_header = TRACEPARENT_HEADER.encode("ascii")
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        with tracer.start_trace(
+            f"{method} {scope['path']}",
+            parent=self._get_parent(scope),
+            attributes={"http.request.method": method, "url.path": scope["path"]},
+        ) as span:
+            if span is None:
+                await self.app(scope, receive, send)
+                return
+
+            async def send_recording_status(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.response.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.status = SpanStatus.ERROR
+                await send(message)
+
+            try:
+                await self.app(scope, receive, send_recording_status)
+            finally:
+                route = scope.get("route")
+                if route is not None:
+                    span.name = f"{method} {route.path}"
+                    span.set_attribute("http.route", route.path)
+
+    def _get_parent(self, scope: Scope) -> SpanContext | None:
+        for name, value in scope["headers"]:
+            if name == self.traceparent_header:
+                return SpanContext.from_traceparent(value.decode("latin-1"))
+
+        return None
@@ -0,0 +1,55 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Annotated
+
+from fastapi import Query
+
+from application.api.common.filters.base import BaseGetAllFilters
+from infrastructure.repositories.products.filters.products import (
+    ArrayMatch,
+    GetProductsFilters as GetProductsInfrastructureFilters,
+    SearchProductsFilters as SearchProductsInfrastructureFilters,
+)
+
+
+@dataclass
+class GetProductsFilters(BaseGetAllFilters):
+    limit: Annotated[int, Query(ge=1, le=100)] = 10
+    offset: int = 0
+    cursor: str | None = None
+    show_deleted: bool = False
+    # Lists have to be declared as query parameters or FastAPI reads a body.
+    categories: Annotated[list[str] | None, Query()] = None
+    categories_match: ArrayMatch = ArrayMatch.ALL
+    tags: Annotated[list[str] | None, Query()] = None
+    tags_match: ArrayMatch = ArrayMatch.ALL
+    vendor: str | None = None
+    min_price: Decimal | None = None
+    max_price: Decimal | None = None
+
+    def to_infrastructure_filters(self):
+        return GetProductsInfrastructureFilters(
+            limit=self.limit,
+            offset=self.offset,
+            cursor=self.cursor,
+            show_deleted=self.show_deleted,
+            categories=tuple(self.categories or ()),
+            categories_match=self.categories_match,
+            tags=tuple(self.tags or ()),
+            tags_match=self.tags_match,
+            vendor=self.vendor,
+            min_price=self.min_price,
+            max_price=self.max_price,
+        )
+
+
+@dataclass
+class SearchProductsFilters:
+    q: Annotated[str, Query(min_length=1, max_length=200)]
+    limit: Annotated[int, Query(ge=1, le=100)] = 10
+    cursor: str | None = None
+
+    def to_infrastructure_filters(self):
+        return SearchProductsInfrastructureFilters(
+            query=self.q, limit=self.limit, cursor=self.cursor
+        )
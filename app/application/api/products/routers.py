@@ -0,0 +1,84 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from application.api.products.filters import GetProductsFilters, SearchProductsFilters
+from application.api.products.schemas import (
+    SGetProduct,
+    SGetProductsQueryResponse,
+    SSearchProductsResponse,
+)
+from application.api.dependencies import get_mediator
+from application.api.schemas import SErrorMessage
+from domain.exceptions.base import ApplicationException
+from logic.mediator.base import Mediator
+from logic.queries.products import GetProductsQuery, SearchProductsQuery
+
+
+product_router = APIRouter()
+
+
+@product_router.get(
+    "/",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {"model": SGetProductsQueryResponse},
+        status.HTTP_400_BAD_REQUEST: {"model": SErrorMessage},
+    },
+)
+async def get_all_products(
+    mediator: Annotated[Mediator, Depends(get_mediator)],
+    filters: GetProductsFilters = Depends(),
+) -> SGetProductsQueryResponse:
+    """Get products of the catalog.
+
+    Repeat `categories` or `tags` to filter by several values; `*_match=all`
+    keeps products carrying every value and `any` those carrying at least one.
+    """
+    try:
+        page = await mediator.handle_query(
+            GetProductsQuery(filters=filters.to_infrastructure_filters())
+        )
+    except ApplicationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+
+    return SGetProductsQueryResponse(
+        count=page.count,
+        count_mode=page.count_mode,
+        has_more=page.has_more,
+        limit=filters.limit,
+        offset=filters.offset,
+        next_cursor=page.next_cursor,
+        items=[SGetProduct.from_entity(product) for product in page.items],
+    )
+
+
+@product_router.get(
+    "/search/",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {"model": SSearchProductsResponse},
+        status.HTTP_400_BAD_REQUEST: {"model": SErrorMessage},
+    },
+)
+async def search_products(
+    mediator: Annotated[Mediator, Depends(get_mediator)],
+    filters: SearchProductsFilters = Depends(),
+) -> SSearchProductsResponse:
+    """Search product titles and descriptions, best matches first.
+
+    `q` takes web search syntax: quoted phrases, `or` and `-excluded` words.
+    Pass `next_cursor` from the previous response as `cursor` for the next page.
+    """
+    try:
+        page = await mediator.handle_query(
+            SearchProductsQuery(filters=filters.to_infrastructure_filters())
+        )
+    except ApplicationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+
+    return SSearchProductsResponse(
+        has_more=page.has_more,
+        next_cursor=page.next_cursor,
+        items=[SGetProduct.from_entity(product) for product in page.items],
+    )
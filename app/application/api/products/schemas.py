@@ -0,0 +1,55 @@
+from datetime import datetime
+from decimal import Decimal
+
+from pydantic import BaseModel
+
+from application.api.schemas import SBaseQueryResponse
+from domain.entities.products import ProductEntity
+
+
+class SGetProduct(BaseModel):
+    oid: str
+    title: str
+    description: str
+    price: Decimal
+    quantity: int
+    vendor: str
+    images: list[str]
+    categories: list[str]
+    tags: list[str]
+    warranty_period: str | None
+    storage_instructions: list[str]
+    created_at: datetime
+    updated_at: datetime
+
+    @classmethod
+    def from_entity(cls, product: ProductEntity) -> "SGetProduct":
+        return cls(
+            oid=product.oid,
+            title=product.title.as_generic_type(),
+            description=product.description.as_generic_type(),
+            price=Decimal(product.price.as_generic_type()),
+            quantity=product.quantity.as_generic_type(),
+            vendor=product.vendor.as_generic_type(),
+            images=[image.as_generic_type() for image in product.images],
+            categories=[category.as_generic_type() for category in product.categories],
+            tags=[tag.as_generic_type() for tag in product.tags],
+            warranty_period=product.warranty_period.as_generic_type()
+            if product.warranty_period
+            else None,
+            storage_instructions=[
+                instruction.as_generic_type()
+                for instruction in product.storage_instructions
+            ],
+            created_at=product.created_at,
+            updated_at=product.updated_at,
+        )
+
+
+class SGetProductsQueryResponse(SBaseQueryResponse[list[SGetProduct]]): ...
+
+
+class SSearchProductsResponse(BaseModel):
+    has_more: bool
+    next_cursor: str | None
+    items: list[SGetProduct]
@@ -1,6 +1,8 @@
 from typing import Generic, TypeVar
 from pydantic import BaseModel
 
+from infrastructure.repositories.common.filters.base import CountMode
+
 
 class SErrorMessage(BaseModel):
     error: str
@@ -10,7 +12,10 @@ IL = TypeVar("IL")
 
 
 class SBaseQueryResponse(BaseModel, Generic[IL]):
-    count: int
+    count: int | None
+    count_mode: CountMode = CountMode.EXACT
+    has_more: bool = False
     limit: int
     offset: int
+    next_cursor: str | None = None
     items: IL
@@ -0,0 +1,101 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Depends, Query, status
+from pydantic import BaseModel
+
+from application.api.dependencies import get_mediator
+from infrastructure.repositories.common.database import query_observer
+from infrastructure.repositories.common.query_observer import QueryStatsOrder
+from logic.mediator.base import Mediator
+
+
+stats_router = APIRouter()
+
+
+class SQueryCacheStats(BaseModel):
+    is_enabled: bool
+    entries: int = 0
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    refresh_failures: int = 0
+
+
+@stats_router.get("/query-cache/", status_code=status.HTTP_200_OK)
+async def get_query_cache_stats(
+    mediator: Annotated[Mediator, Depends(get_mediator)],
+) -> SQueryCacheStats:
+    """Counters of the query result cache of this process."""
+    query_cache = mediator.query_cache
+    if query_cache is None:
+        return SQueryCacheStats(is_enabled=False)
+
+    return SQueryCacheStats(
+        is_enabled=True, entries=len(query_cache), **query_cache.stats.as_dict()
+    )
+
+
+class SSingleFlightStats(BaseModel):
+    is_enabled: bool
+    in_flight: int = 0
+    flights: int = 0
+    collapsed: int = 0
+    timeouts: int = 0
+    abandoned: int = 0
+
+
+@stats_router.get("/single-flight/", status_code=status.HTTP_200_OK)
+async def get_single_flight_stats(
+    mediator: Annotated[Mediator, Depends(get_mediator)],
+) -> SSingleFlightStats:
+    """How many identical concurrent queries this process ran only once."""
+    single_flight = mediator.single_flight
+    if single_flight is None:
+        return SSingleFlightStats(is_enabled=False)
+
+    return SSingleFlightStats(
+        is_enabled=True,
+        in_flight=len(single_flight),
+        **single_flight.stats.as_dict(),
+    )
+
+
+class SQueryStats(BaseModel):
+    fingerprint: str
+    statement: str
+    calls: int
+    slow_calls: int
+    total_seconds: float
+    mean_seconds: float
+    max_seconds: float
+    plan: str | None = None
+
+
+class SQueryStatsOut(BaseModel):
+    slow_threshold_seconds: float
+    fingerprints: int
+    items: list[SQueryStats]
+
+
+@stats_router.get("/queries/", status_code=status.HTTP_200_OK)
+async def get_query_stats(
+    limit: Annotated[int, Query(ge=1, le=500)] = 20,
+    order_by: QueryStatsOrder = QueryStatsOrder.TOTAL,
+) -> SQueryStatsOut:
+    """The most expensive statement fingerprints seen by this process."""
+    return SQueryStatsOut(
+        slow_threshold_seconds=query_observer.slow_threshold,
+        fingerprints=len(query_observer.stats),
+        items=[
+            SQueryStats(**stats.as_dict())
+            for stats in query_observer.top(limit, order_by)
+        ],
+    )
+
+
+@stats_router.delete("/queries/", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_query_stats() -> None:
+    query_observer.reset()
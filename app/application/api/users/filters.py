@@ -1,6 +1,10 @@
 from dataclasses import dataclass
+from typing import Annotated
+
+from fastapi import Query
 
 from application.api.common.filters.base import BaseGetAllFilters
+from infrastructure.repositories.common.filters.base import CountMode
 from infrastructure.repositories.users.filters.users import (
     GetUsersFilters as GetUsersInfrastructureFilters,
 )
@@ -8,11 +12,17 @@ from infrastructure.repositories.users.filters.users import (
 
 @dataclass
 class GetUsersFilters(BaseGetAllFilters):
-    limit: int = 10
+    limit: Annotated[int, Query(ge=1, le=100)] = 10
     offset: int = 0
+    cursor: str | None = None
     show_deleted: bool = False
+    count_mode: CountMode = CountMode.EXACT
 
     def to_infrastructure_filters(self):
         return GetUsersInfrastructureFilters(
-            limit=self.limit, offset=self.offset, show_deleted=self.show_deleted
+            limit=self.limit,
+            offset=self.offset,
+            cursor=self.cursor,
+            show_deleted=self.show_deleted,
+            count_mode=self.count_mode,
         )
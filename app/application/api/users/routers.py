@@ -1,28 +1,42 @@
 from typing import Annotated
-from punq import Container
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
 
+from application.api.dependencies import get_mediator
 from application.api.schemas import SErrorMessage
 from application.api.users.filters import GetUsersFilters
 from application.api.users.schemas import (
     SChangePassword,
     SChangeUsername,
+    SCheckUsernamesIn,
+    SCheckUsernamesOut,
     SCreateUserIn,
     SCreateUserOut,
     SGetUser,
+    SGetUsersByIdsIn,
+    SGetUsersByIdsOut,
     SGetUsersQueryResponse,
+    SLoginIn,
+    SLoginOut,
+    SUsernameAvailability,
 )
 from domain.exceptions.base import ApplicationException
 from logic.commands.users import (
+    AuthenticateUserCommand,
     ChangePasswordCommand,
     ChangeUsernameCommand,
     CreateUserCommand,
     DeleteUserCommand,
     RestoreUserCommand,
 )
-from logic.init import init_container
 from logic.mediator.base import Mediator
-from logic.queries.users import GetUserByIdQuery, GetUserByUsernameQuery, GetUsersQuery
+from logic.queries.users import (
+    CheckUsernameAvailabilityQuery,
+    CheckUsernamesAvailabilityQuery,
+    GetUserByIdQuery,
+    GetUserByUsernameQuery,
+    GetUsersByIdsQuery,
+    GetUsersQuery,
+)
 
 
 user_router = APIRouter()
@@ -38,11 +52,9 @@ user_router = APIRouter()
 )
 async def create_user(
     user_in: SCreateUserIn,
-    container: Annotated[Container, Depends(init_container)],
+    mediator: Annotated[Mediator, Depends(get_mediator)],
 ) -> SCreateUserOut:
     """Create new user."""
-    mediator: Mediator = container.resolve(Mediator)
-
     try:
         user, *_ = await mediator.handle_command(
             CreateUserCommand(
@@ -57,6 +69,32 @@ async def create_user(
     return SCreateUserOut.from_entity(user)
 
 
+@user_router.post(
+    "/login/",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {"model": SLoginOut},
+        status.HTTP_400_BAD_REQUEST: {"model": SErrorMessage},
+    },
+)
+async def login(
+    login_in: SLoginIn,
+    mediator: Annotated[Mediator, Depends(get_mediator)],
+) -> SLoginOut:
+    """Check user credentials."""
+    try:
+        user, *_ = await mediator.handle_command(
+            AuthenticateUserCommand(
+                username=login_in.username,
+                password=login_in.password,
+            )
+        )
+    except ApplicationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+
+    return SLoginOut.from_entity(user)
+
+
 @user_router.get(
     "/",
     status_code=status.HTTP_200_OK,
@@ -66,24 +104,110 @@ async def create_user(
     },
 )
 async def get_all_users(
-    container: Annotated[Container, Depends(init_container)],
+    mediator: Annotated[Mediator, Depends(get_mediator)],
     filters: GetUsersFilters = Depends(),
 ) -> SGetUsersQueryResponse:
-    """Get all users from specified group."""
-    mediator: Mediator = container.resolve(Mediator)
+    """Get all users from specified group.
 
+    Pass `next_cursor` from the previous response as `cursor` to page by keyset
+    instead of `offset`. `count_mode` trades count accuracy for latency: `window`
+    counts in the page query, `estimated` asks the planner and `none` only reports
+    `has_more`.
+    """
     try:
-        users, count = await mediator.handle_query(
+        page = await mediator.handle_query(
             GetUsersQuery(filters=filters.to_infrastructure_filters())
         )
     except ApplicationException as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
 
     return SGetUsersQueryResponse(
-        count=count,
+        count=page.count,
+        count_mode=page.count_mode,
+        has_more=page.has_more,
         limit=filters.limit,
         offset=filters.offset,
-        items=[SGetUser.from_entity(user) for user in users],
+        next_cursor=page.next_cursor,
+        items=[SGetUser.from_entity(user) for user in page.items],
+    )
+
+
+@user_router.get(
+    "/availability/",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {"model": SUsernameAvailability},
+        status.HTTP_400_BAD_REQUEST: {"model": SErrorMessage},
+    },
+)
+async def check_username_availability(
+    mediator: Annotated[Mediator, Depends(get_mediator)],
+    username: str = Query(...),
+) -> SUsernameAvailability:
+    """Check whether a username can still be taken."""
+    try:
+        is_available = await mediator.handle_query(
+            CheckUsernameAvailabilityQuery(username=username)
+        )
+    except ApplicationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+
+    return SUsernameAvailability(username=username, is_available=is_available)
+
+
+@user_router.post(
+    "/availability/",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {"model": SCheckUsernamesOut},
+        status.HTTP_400_BAD_REQUEST: {"model": SErrorMessage},
+    },
+)
+async def check_usernames_availability(
+    usernames_in: SCheckUsernamesIn,
+    mediator: Annotated[Mediator, Depends(get_mediator)],
+) -> SCheckUsernamesOut:
+    """Check several usernames at once, invalid ones are reported as taken."""
+    try:
+        availability = await mediator.handle_query(
+            CheckUsernamesAvailabilityQuery(usernames=tuple(usernames_in.usernames))
+        )
+    except ApplicationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+
+    return SCheckUsernamesOut(
+        items=[
+            SUsernameAvailability(username=username, is_available=is_available)
+            for username, is_available in availability.items()
+        ]
+    )
+
+
+@user_router.post(
+    "/batch/",
+    status_code=status.HTTP_200_OK,
+    responses={
+        status.HTTP_200_OK: {"model": SGetUsersByIdsOut},
+        status.HTTP_400_BAD_REQUEST: {"model": SErrorMessage},
+    },
+)
+async def get_users_by_ids(
+    users_in: SGetUsersByIdsIn,
+    mediator: Annotated[Mediator, Depends(get_mediator)],
+) -> SGetUsersByIdsOut:
+    """Get several users in one call, unknown oids are listed as missing."""
+    try:
+        users = await mediator.handle_query(
+            GetUsersByIdsQuery(user_oids=tuple(users_in.user_oids))
+        )
+    except ApplicationException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=e.message)
+
+    return SGetUsersByIdsOut(
+        items=[SGetUser.from_entity(user) for user in users.values()],
+        missing_oids=[
+            oid for oid in dict.fromkeys(users_in.user_oids) if oid not in users
+        ],
     )
 
 
@@ -97,10 +221,9 @@ async def get_all_users(
 )
 async def get_user_by_id(
     user_oid: str,
-    container: Annotated[Container, Depends(init_container)],
+    mediator: Annotated[Mediator, Depends(get_mediator)],
 ):
     """Get user by id."""
-    mediator: Mediator = container.resolve(Mediator)
     try:
         user = await mediator.handle_query(GetUserByIdQuery(user_oid=user_oid))
     except ApplicationException as e:
@@ -119,10 +242,9 @@ async def get_user_by_id(
 )
 async def get_user_by_username(
     username: str,
-    container: Annotated[Container, Depends(init_container)],
+    mediator: Annotated[Mediator, Depends(get_mediator)],
 ):
     """Get user by username."""
-    mediator: Mediator = container.resolve(Mediator)
     try:
         user = await mediator.handle_query(GetUserByUsernameQuery(username=username))
     except ApplicationException as e:
@@ -141,10 +263,8 @@ async def get_user_by_username(
 async def change_username(
     user_oid: str,
     user_in: SChangeUsername,
-    container: Annotated[Container, Depends(init_container)],
+    mediator: Annotated[Mediator, Depends(get_mediator)],
 ):
-    mediator: Mediator = container.resolve(Mediator)
-
     try:
         await mediator.handle_command(
             ChangeUsernameCommand(
@@ -166,10 +286,8 @@ async def change_username(
 async def change_password(
     user_oid: str,
     user_in: SChangePassword,
-    container: Annotated[Container, Depends(init_container)],
+    mediator: Annotated[Mediator, Depends(get_mediator)],
 ):
-    mediator: Mediator = container.resolve(Mediator)
-
     try:
         await mediator.handle_command(
             ChangePasswordCommand(
@@ -191,10 +309,8 @@ async def change_password(
 )
 async def restore_user(
     user_oid: str,
-    container: Annotated[Container, Depends(init_container)],
+    mediator: Annotated[Mediator, Depends(get_mediator)],
 ):
-    mediator: Mediator = container.resolve(Mediator)
-
     try:
         await mediator.handle_command(RestoreUserCommand(user_oid=user_oid))
     except ApplicationException as e:
@@ -210,11 +326,9 @@ async def restore_user(
 )
 async def delete_user(
     user_oid: str,
-    container: Annotated[Container, Depends(init_container)],
+    mediator: Annotated[Mediator, Depends(get_mediator)],
 ) -> None:
     """Delete user."""
-    mediator: Mediator = container.resolve(Mediator)
-
     try:
         await mediator.handle_command(DeleteUserCommand(user_oid=user_oid))
     except ApplicationException as e:
@@ -73,6 +73,15 @@ class SGetUser(BaseModel):
         )
 
 
+class SGetUsersByIdsIn(BaseModel):
+    user_oids: list[str] = Field(..., min_length=1, max_length=100)
+
+
+class SGetUsersByIdsOut(BaseModel):
+    items: list[SGetUser]
+    missing_oids: list[str]
+
+
 class SChangeUsername(BaseModel):
     new_username: str
 
@@ -83,3 +92,16 @@ class SChangePassword(BaseModel):
 
 
 class SGetUsersQueryResponse(SBaseQueryResponse[list[SGetUser]]): ...
+
+
+class SUsernameAvailability(BaseModel):
+    username: str
+    is_available: bool
+
+
+class SCheckUsernamesIn(BaseModel):
+    usernames: list[str] = Field(..., min_length=1, max_length=100)
+
+
+class SCheckUsernamesOut(BaseModel):
+    items: list[SUsernameAvailability]
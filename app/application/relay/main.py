@@ -0,0 +1,71 @@
+"""Outbox relay: publishes committed events to the broker.
+
+    python -m application.relay.main
+
+Serves its delivery metrics on `/metrics` at OUTBOX_RELAY_METRICS_PORT.
+Any number of relays may run side by side, all with the same
+OUTBOX_KEY_PARTITIONS; each key partition is relayed by one at a time.
+"""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+
+import uvicorn
+from fastapi import FastAPI
+
+from application.api.metrics import metrics_router
+from infrastructure.message_brokers.base import IMessageBroker
+from infrastructure.message_brokers.outbox_relay import OutboxRelay
+from logic.init import init_container
+from settings.settings import Settings
+
+
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    container = init_container()
+    relay: OutboxRelay = container.resolve(OutboxRelay)
+    message_broker: IMessageBroker = container.resolve(IMessageBroker)
+
+    stopping = asyncio.Event()
+    await message_broker.start()
+    relay_task = asyncio.create_task(relay.run(stopping))
+    logger.info("Outbox relay started")
+
+    yield
+
+    stopping.set()
+    try:
+        await relay_task
+    finally:
+        await message_broker.stop()
+        logger.info("Outbox relay stopped")
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(
+        title="Outbox relay",
+        lifespan=lifespan,
+        docs_url=None,
+        redoc_url=None,
+        openapi_url=None,
+    )
+    app.include_router(metrics_router)
+
+    return app
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    settings: Settings = init_container().resolve(Settings)
+    # Uvicorn handles SIGINT and SIGTERM and runs the lifespan down.
+    uvicorn.run(
+        create_app(),
+        host="0.0.0.0",
+        port=settings.OUTBOX_RELAY_METRICS_PORT,
+        log_level="warning",
+    )
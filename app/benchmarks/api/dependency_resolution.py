@@ -0,0 +1,112 @@
+"""Per-request cost of getting hold of the mediator.
+
+Compares building it through the container on every request, as the routers
+used to, with resolving the singleton and with the `get_mediator` dependency,
+first as bare calls and then through FastAPI on an in-process transport:
+
+    python -m benchmarks.api.dependency_resolution --calls 2000 --requests 2000
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Annotated
+
+from fastapi import Depends, FastAPI, Request
+from httpx import ASGITransport, AsyncClient
+from punq import Container
+
+from application.api.dependencies import get_mediator
+from benchmarks.common import format_table
+from logic.init import init_container
+from logic.mediator.base import Mediator
+
+
+def create_app(build_mediator: Callable[[], Mediator]) -> FastAPI:
+    app = FastAPI()
+    app.state.mediator = init_container().resolve(Mediator)
+
+    @app.get("/container/")
+    async def from_container(
+        container: Annotated[Container, Depends(init_container)],
+    ) -> None:
+        build_mediator()
+
+    @app.get("/singleton/")
+    async def from_singleton(
+        container: Annotated[Container, Depends(init_container)],
+    ) -> None:
+        container.resolve(Mediator)
+
+    @app.get("/state/")
+    async def from_state(mediator: Annotated[Mediator, Depends(get_mediator)]) -> None:
+        pass
+
+    return app
+
+
+async def measure_calls(
+    name: str, resolve: Callable[[], Awaitable[object]], calls: int
+) -> list:
+    started_at = time.perf_counter()
+    for _ in range(calls):
+        await resolve()
+    elapsed = time.perf_counter() - started_at
+
+    return [name, f"{elapsed / calls * 1_000_000:.1f}"]
+
+
+async def measure_requests(name: str, client: AsyncClient, path: str, requests: int):
+    await client.get(path)
+
+    started_at = time.perf_counter()
+    for _ in range(requests):
+        await client.get(path)
+    elapsed = time.perf_counter() - started_at
+
+    return [name, f"{elapsed / requests * 1_000_000:.1f}"]
+
+
+async def main(calls: int, requests: int) -> None:
+    container = init_container()
+    # The factory the container used to run for every `resolve(Mediator)`.
+    build_mediator = container.registrations[Mediator][0].builder
+    request = Request({"type": "http", "app": create_app(build_mediator)})
+
+    async def build() -> Mediator:
+        return build_mediator()
+
+    async def resolve_singleton() -> Mediator:
+        return container.resolve(Mediator)
+
+    rows = [
+        await measure_calls("build through container", build, calls),
+        await measure_calls("resolve singleton", resolve_singleton, calls),
+        await measure_calls("get_mediator", lambda: get_mediator(request), calls),
+    ]
+    print(format_table(["resolution", "us/call"], rows))
+    print()
+
+    transport = ASGITransport(app=create_app(build_mediator))
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        rows = [
+            await measure_requests(
+                "Depends(init_container) + build", client, "/container/", requests
+            ),
+            await measure_requests(
+                "Depends(init_container) + singleton", client, "/singleton/", requests
+            ),
+            await measure_requests(
+                "Depends(get_mediator)", client, "/state/", requests
+            ),
+        ]
+    print(format_table(["dependency", "us/request"], rows))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=2000)
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.calls, arguments.requests))
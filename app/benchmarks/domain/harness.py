@@ -0,0 +1,231 @@
+"""Wall time and allocations per call of small synchronous operations.
+
+Times are the best of `repeat` rounds, with the garbage collector off as in
+`timeit`, and the median of that over several processes. They are also stored
+relative to a fixed pure-Python workload, so a baseline recorded on one
+machine stays comparable on a faster or slower one.
+
+Allocations come from `tracemalloc`, in a pass of their own since tracing
+slows every allocation down. Results of the calls are kept alive, so blocks
+and bytes per call are what a call leaves behind: the objects it builds.
+Temporaries freed before the call returns only show up in the peak.
+"""
+
+import gc
+import time
+import tracemalloc
+from collections.abc import Callable, Collection, Coroutine, Sequence
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import get_context
+from statistics import median
+from typing import Any
+
+from benchmarks.common import format_table
+
+
+@dataclass(frozen=True)
+class MicroBenchmark:
+    name: str
+    call: Callable[[], Any]
+
+
+def run_sync(coroutine: Coroutine) -> Any:
+    """Result of a coroutine that never suspends, without an event loop.
+
+    `async` domain methods such as `UserEntity.create` await nothing, so
+    driving them directly keeps loop overhead out of the measurement.
+    """
+    try:
+        coroutine.send(None)
+    except StopIteration as stop:
+        return stop.value
+
+    coroutine.close()
+    raise RuntimeError(f"{coroutine.__qualname__} suspended; it needs an event loop")
+
+
+def calibration_workload() -> dict[str, Any]:
+    values = [str(number) for number in range(16)]
+    return {"values": values, "joined": "-".join(values)}
+
+
+def measure_time(call: Callable[[], Any], number: int, repeat: int) -> float:
+    """Best nanoseconds per call over `repeat` rounds of `number` calls."""
+    calls = range(number)
+    best = float("inf")
+
+    is_gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            started_at = time.perf_counter_ns()
+            for _ in calls:
+                call()
+            best = min(best, time.perf_counter_ns() - started_at)
+    finally:
+        if is_gc_enabled:
+            gc.enable()
+
+    return best / number
+
+
+def measure_allocations(call: Callable[[], Any], number: int) -> dict[str, float]:
+    """Blocks and bytes a call leaves allocated, and its peak in bytes."""
+    # Sized up front, so storing results allocates nothing.
+    results: list[Any] = [None] * number
+    # Lazily built caches, such as compiled regular expressions, are not
+    # part of the steady state.
+    call()
+
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        for position in range(number):
+            results[position] = call()
+        after = tracemalloc.take_snapshot()
+
+        tracemalloc.reset_peak()
+        current, _ = tracemalloc.get_traced_memory()
+        result = call()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # Snapshots allocate too; only count what the calls did.
+    ignored = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    differences = after.filter_traces(ignored).compare_to(
+        before.filter_traces(ignored), "filename"
+    )
+    del results, result
+
+    return {
+        "blocks": sum(difference.count_diff for difference in differences) / number,
+        "bytes": sum(difference.size_diff for difference in differences) / number,
+        "peak_bytes": peak - current,
+    }
+
+
+def measure_times(
+    get_benchmarks: Callable[[], Sequence[MicroBenchmark]],
+    names: Collection[str],
+    number: int,
+    repeat: int,
+) -> dict[str, float]:
+    """Best nanoseconds per call of the named benchmarks and the calibration."""
+    calls = {"calibration": calibration_workload}
+    calls.update(
+        (benchmark.name, benchmark.call)
+        for benchmark in get_benchmarks()
+        if benchmark.name in names
+    )
+
+    # Rounds go over every operation in turn, so a busy moment of the machine
+    # slows one round of each instead of all rounds of a few.
+    times = dict.fromkeys(calls, float("inf"))
+    for _ in range(repeat):
+        for name, call in calls.items():
+            times[name] = min(times[name], measure_time(call, number, repeat=1))
+
+    return times
+
+
+def run_benchmarks(
+    get_benchmarks: Callable[[], Sequence[MicroBenchmark]],
+    names: Collection[str],
+    number: int,
+    repeat: int,
+    processes: int,
+) -> dict[str, Any]:
+    """Times from `processes` fresh interpreters, one after another.
+
+    Hash seeds and memory layout differ between interpreters and can move a
+    sub-microsecond operation by half in either direction for the life of a
+    process, so each time is the median over processes rather than the best
+    of one. `get_benchmarks` must be importable by name to reach them.
+    """
+    with ProcessPoolExecutor(
+        max_workers=1, mp_context=get_context("spawn"), max_tasks_per_child=1
+    ) as executor:
+        futures = [
+            executor.submit(measure_times, get_benchmarks, names, number, repeat)
+            for _ in range(processes)
+        ]
+        runs = [future.result() for future in futures]
+
+    operations = {}
+    for benchmark in get_benchmarks():
+        if benchmark.name not in names:
+            continue
+
+        operations[benchmark.name] = {
+            "ns": median(run[benchmark.name] for run in runs),
+            "relative_time": median(
+                run[benchmark.name] / run["calibration"] for run in runs
+            ),
+            **measure_allocations(benchmark.call, number),
+        }
+
+    calibration_ns = median(run["calibration"] for run in runs)
+    return {"calibration_ns": calibration_ns, "operations": operations}
+
+
+def format_results(results: dict[str, Any]) -> str:
+    rows = [
+        [
+            name,
+            f"{result['ns']:.0f}",
+            f"{result['relative_time']:.2f}",
+            f"{result['blocks']:.1f}",
+            f"{result['bytes']:.0f}",
+            result["peak_bytes"],
+        ]
+        for name, result in results["operations"].items()
+    ]
+    return format_table(
+        ["operation", "ns/op", "x calibration", "blocks/op", "bytes/op", "peak B/op"],
+        rows,
+    )
+
+
+def compare_with_baseline(
+    results: dict[str, Any],
+    baseline: dict[str, Any],
+    time_tolerance: float,
+    allocation_tolerance: float,
+    compare_allocations: bool = True,
+) -> list[str]:
+    """Operations slower or allocating more than in the baseline.
+
+    Time is compared relative to the calibration workload and may grow by
+    `time_tolerance` (0.25 is 25%). Blocks and bytes may grow by
+    `allocation_tolerance`, plus half a block and 32 bytes of slack for the
+    fractional counts free lists leave. Allocations differ between Python
+    versions, so callers skip them across versions.
+    """
+    regressions = []
+    for name, before in baseline["operations"].items():
+        after = results["operations"].get(name)
+        if after is None:
+            continue
+
+        if after["relative_time"] > before["relative_time"] * (1 + time_tolerance):
+            regressions.append(
+                f"{name}: {before['relative_time']:.2f} -> "
+                f"{after['relative_time']:.2f} x calibration "
+                f"({before['ns']:.0f} -> {after['ns']:.0f} ns)"
+            )
+
+        if not compare_allocations:
+            continue
+
+        if after["blocks"] > before["blocks"] * (1 + allocation_tolerance) + 0.5:
+            regressions.append(
+                f"{name}: {before['blocks']:.1f} -> {after['blocks']:.1f} blocks"
+            )
+        if after["bytes"] > before["bytes"] * (1 + allocation_tolerance) + 32:
+            regressions.append(
+                f"{name}: {before['bytes']:.0f} -> {after['bytes']:.0f} bytes"
+            )
+
+    return regressions
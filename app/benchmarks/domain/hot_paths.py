@@ -0,0 +1,296 @@
+"""Time and allocations of the domain code every request runs.
+
+Covers value object validation, entity creation, event pulling and
+serialization, and the user converters. Needs no database or broker:
+
+    python -m benchmarks.domain.hot_paths
+    python -m benchmarks.domain.hot_paths --filter Product --number 500
+
+Exits with 1 when an operation regressed against `baseline.json` next to
+this file by more than the tolerances. After an intended change, record a
+new baseline with `--update-baseline` and commit it; with `--filter` only
+the matching operations in it are replaced.
+"""
+
+import argparse
+import platform
+import sys
+from datetime import UTC, datetime
+from functools import partial
+from pathlib import Path
+from typing import Any
+from uuid import uuid4
+
+from benchmarks.domain.harness import (
+    MicroBenchmark,
+    compare_with_baseline,
+    format_results,
+    run_benchmarks,
+    run_sync,
+)
+from benchmarks.load.harness import load_results, save_results
+from domain.entities.products import ProductEntity
+from domain.entities.users import UserEntity
+from domain.values.products import (
+    ProductCategory,
+    ProductDescription,
+    ProductImage,
+    ProductPrice,
+    ProductQuantity,
+    ProductStorageInstructions,
+    ProductTag,
+    ProductTitle,
+    ProductVendor,
+    ProductWarrantyPeriod,
+)
+from domain.values.users import Password, Phone, Username
+from infrastructure.message_brokers.converters import convert_event_to_broker_message
+from infrastructure.repositories.users.converters import (
+    convert_user_entity_to_changes,
+    convert_user_entity_to_model,
+    convert_user_entity_to_values,
+    convert_user_model_to_entity,
+    convert_user_record_to_entity,
+)
+
+
+BASELINE = Path(__file__).with_name("baseline.json")
+
+# Typical request values, valid for every value object.
+VALUE_SAMPLES = [
+    (Username, "user_name_1"),
+    (Phone, "+7 (999) 123-45-67"),
+    (Password, "correct-horse-battery"),
+    (ProductTitle, "Mechanical keyboard"),
+    (ProductDescription, "Tenkeyless keyboard with hot-swappable switches."),
+    (ProductPrice, "129.99"),
+    (ProductQuantity, 25),
+    (ProductVendor, "Keychron"),
+    (ProductImage, "https://cdn.example.com/images/keyboard.png"),
+    (ProductCategory, "Peripherals"),
+    (ProductTag, "keyboard"),
+    (ProductWarrantyPeriod, "2 years"),
+    (ProductStorageInstructions, "Keep dry, away from direct sunlight."),
+]
+
+
+def create_user() -> UserEntity:
+    return run_sync(
+        UserEntity.create(
+            username=Username("user_name_1"),
+            password=Password(uuid4().hex * 2, is_hashed=True),
+            phone=Phone("+79991234567"),
+        )
+    )
+
+
+def get_value_benchmarks() -> list[MicroBenchmark]:
+    return [
+        MicroBenchmark(f"{value_type.__name__}()", partial(value_type, value))
+        for value_type, value in VALUE_SAMPLES
+    ]
+
+
+def get_entity_benchmarks() -> list[MicroBenchmark]:
+    username = Username("user_name_1")
+    password = Password(uuid4().hex * 2, is_hashed=True)
+    phone = Phone("+79991234567")
+
+    product_values = {
+        "title": ProductTitle("Mechanical keyboard"),
+        "description": ProductDescription("Tenkeyless keyboard, hot-swappable."),
+        "price": ProductPrice("129.99"),
+        "quantity": ProductQuantity(25),
+        "vendor": ProductVendor("Keychron"),
+        "images": [ProductImage("https://cdn.example.com/images/keyboard.png")],
+        "categories": [ProductCategory("Peripherals")],
+        "tags": [ProductTag("keyboard"), ProductTag("mechanical")],
+        "warranty_period": ProductWarrantyPeriod("2 years"),
+        "storage_instructions": [ProductStorageInstructions("Keep dry.")],
+    }
+
+    user = create_user()
+    event = user.pull_events()[0]
+
+    def pull_events() -> list:
+        user.register_event(event)
+        return user.pull_events()
+
+    return [
+        MicroBenchmark(
+            "UserEntity.create",
+            lambda: run_sync(UserEntity.create(username, password, phone)),
+        ),
+        MicroBenchmark(
+            "ProductEntity.create",
+            lambda: run_sync(ProductEntity.create(**product_values)),
+        ),
+        MicroBenchmark("register_event + pull_events", pull_events),
+    ]
+
+
+def get_converter_benchmarks() -> list[MicroBenchmark]:
+    user = create_user()
+    user_created = user.pull_events()[0]
+    product_created = run_sync(
+        ProductEntity.create(
+            title=ProductTitle("Mechanical keyboard"),
+            description=ProductDescription("Tenkeyless keyboard, hot-swappable."),
+            price=ProductPrice("129.99"),
+            quantity=ProductQuantity(25),
+            vendor=ProductVendor("Keychron"),
+            images=[ProductImage("https://cdn.example.com/images/keyboard.png")],
+            tags=[ProductTag("keyboard"), ProductTag("mechanical")],
+        )
+    ).pull_events()[0]
+
+    changed_user = create_user()
+    changed_user.mark_dirty("username", "password")
+
+    model = convert_user_entity_to_model(user)
+    record = {
+        "oid": user.oid,
+        "phone": user.phone.value,
+        "username": user.username.value,
+        "password": user.password.value,
+        "created_at": datetime.now(UTC),
+        "deleted_at": None,
+        "is_deleted": False,
+        "is_verified": False,
+    }
+
+    return [
+        MicroBenchmark(
+            f"convert_event_to_broker_message({type(user_created).__name__})",
+            lambda: convert_event_to_broker_message(user_created),
+        ),
+        MicroBenchmark(
+            f"convert_event_to_broker_message({type(product_created).__name__})",
+            lambda: convert_event_to_broker_message(product_created),
+        ),
+        MicroBenchmark(
+            "convert_user_entity_to_model", lambda: convert_user_entity_to_model(user)
+        ),
+        MicroBenchmark(
+            "convert_user_entity_to_values",
+            lambda: convert_user_entity_to_values(user),
+        ),
+        MicroBenchmark(
+            "convert_user_entity_to_changes",
+            lambda: convert_user_entity_to_changes(changed_user),
+        ),
+        MicroBenchmark(
+            "convert_user_model_to_entity", lambda: convert_user_model_to_entity(model)
+        ),
+        MicroBenchmark(
+            "convert_user_record_to_entity",
+            lambda: convert_user_record_to_entity(record),
+        ),
+    ]
+
+
+def get_benchmarks() -> list[MicroBenchmark]:
+    return [
+        *get_value_benchmarks(),
+        *get_entity_benchmarks(),
+        *get_converter_benchmarks(),
+    ]
+
+
+def merge_into_baseline(
+    baseline: dict[str, Any], results: dict[str, Any]
+) -> dict[str, Any]:
+    """Baseline with the operations of a filtered run replaced and the rest kept.
+
+    Times are compared relative to the calibration, so operations measured
+    in different runs stay comparable with each other.
+    """
+    return {
+        **results,
+        "operations": {**baseline["operations"], **results["operations"]},
+    }
+
+
+def main(arguments: argparse.Namespace) -> int:
+    names = [
+        benchmark.name
+        for benchmark in get_benchmarks()
+        if arguments.filter is None or arguments.filter in benchmark.name
+    ]
+    results = run_benchmarks(
+        get_benchmarks,
+        names,
+        arguments.number,
+        arguments.repeat,
+        arguments.processes,
+    )
+    results["meta"] = {
+        "python": platform.python_version(),
+        "number": arguments.number,
+        "repeat": arguments.repeat,
+        "processes": arguments.processes,
+        "finished_at": datetime.now(UTC).isoformat(),
+    }
+    print(format_results(results))
+    print(f"calibration: {results['calibration_ns']:.0f} ns/op")
+
+    if arguments.output:
+        save_results(arguments.output, results)
+
+    if arguments.update_baseline:
+        if arguments.filter is not None and arguments.baseline.exists():
+            results = merge_into_baseline(load_results(arguments.baseline), results)
+        save_results(arguments.baseline, results)
+        print(f"Recorded the baseline in {arguments.baseline}")
+        return 0
+
+    if not arguments.baseline.exists():
+        print(f"No baseline at {arguments.baseline}; record one with --update-baseline")
+        return 0
+
+    baseline = load_results(arguments.baseline)
+    for name in sorted(results["operations"].keys() - baseline["operations"].keys()):
+        print(f"NOT IN BASELINE {name}; record it with --update-baseline")
+    if arguments.filter is None:
+        for name in sorted(
+            baseline["operations"].keys() - results["operations"].keys()
+        ):
+            print(f"NOT MEASURED {name} is in the baseline but no longer runs")
+    compare_allocations = baseline["meta"]["python"] == results["meta"]["python"]
+    if not compare_allocations:
+        print(
+            f"Baseline was recorded on Python {baseline['meta']['python']}; "
+            "comparing times only"
+        )
+
+    regressions = compare_with_baseline(
+        results,
+        baseline,
+        arguments.time_tolerance,
+        arguments.allocation_tolerance,
+        compare_allocations=compare_allocations,
+    )
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    if regressions:
+        return 1
+
+    print(
+        f"No regressions beyond {arguments.time_tolerance:.0%} in time and "
+        f"{arguments.allocation_tolerance:.0%} in allocations"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filter", help="Only operations whose name contains it")
+    parser.add_argument("--number", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--processes", type=int, default=5)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--time-tolerance", type=float, default=0.25)
+    parser.add_argument("--allocation-tolerance", type=float, default=0.05)
+    sys.exit(main(parser.parse_args()))
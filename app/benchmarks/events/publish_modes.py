@@ -0,0 +1,76 @@
+"""Time spent in `Mediator.publish` as handlers are added, per publish mode.
+
+Every handler waits `--latency` ms per batch, standing in for a broker or
+cache round trip; deferred is measured inside a collecting scope, as a
+request would see it:
+
+    python -m benchmarks.events.publish_modes --handlers 1 2 4 8 --latency 5
+"""
+
+import argparse
+import asyncio
+import time
+from dataclasses import dataclass
+
+from benchmarks.common import format_table
+from domain.events.users import UserCreatedEvent
+from logic.events.base import EventHandler
+from logic.mediator.base import Mediator, PublishMode
+from logic.mediator.deferred import collect_deferred_publications
+
+
+@dataclass
+class SleepingEventHandler(EventHandler[UserCreatedEvent, None]):
+    latency: float = 0.0
+
+    async def handle(self, event: UserCreatedEvent) -> None:
+        await self.handle_batch([event])
+
+    async def handle_batch(self, events: list[UserCreatedEvent]) -> list[None]:
+        await asyncio.sleep(self.latency)
+        return [None] * len(events)
+
+
+async def measure(
+    mode: PublishMode, handlers: int, latency: float, repeat: int
+) -> float:
+    mediator = Mediator(publish_mode=mode)
+    mediator.register_event(
+        UserCreatedEvent,
+        [
+            # The broker is never reached, the sleep stands in for it.
+            SleepingEventHandler(message_broker=None, latency=latency)
+            for _ in range(handlers)
+        ],
+    )
+    events = [UserCreatedEvent(username="benchmark", user_oid="oid", phone="phone")]
+
+    elapsed = 0.0
+    for _ in range(repeat):
+        async with collect_deferred_publications():
+            started_at = time.perf_counter()
+            await mediator.publish(events)
+            elapsed += time.perf_counter() - started_at
+
+    return elapsed / repeat * 1000
+
+
+async def main(handlers: list[int], latency: float, repeat: int) -> None:
+    rows = []
+    for amount in handlers:
+        row = [amount]
+        for mode in PublishMode:
+            row.append(f"{await measure(mode, amount, latency / 1000, repeat):.2f}")
+        rows.append(row)
+
+    headers = ["handlers", *(f"{mode.value} ms" for mode in PublishMode)]
+    print(format_table(headers, rows))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--handlers", type=int, nargs="+", default=[1, 2, 4, 8])
+    parser.add_argument("--latency", type=float, default=5.0)
+    parser.add_argument("--repeat", type=int, default=20)
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.handlers, arguments.latency, arguments.repeat))
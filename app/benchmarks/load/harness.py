@@ -0,0 +1,262 @@
+"""Load generation, latency percentiles and baseline comparison.
+
+Scenarios hand the harness weighted operations; each one performs a single
+request and returns its status code, or None when it had nothing to act on
+and sent no request. Skipped operations are counted apart from requests.
+"""
+
+import asyncio
+import json
+import math
+import random
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from benchmarks.common import format_table
+
+
+PERCENTILES = {"p50": 50, "p95": 95, "p99": 99, "p99.9": 99.9}
+# Compared against the baseline; p99.9 of a short run is mostly noise.
+COMPARED_LATENCIES = ("p50", "p95", "p99")
+
+
+@dataclass(frozen=True)
+class Operation:
+    name: str
+    weight: int
+    call: Callable[[], Awaitable[int | None]]
+    expected_statuses: frozenset[int]
+
+
+@dataclass
+class EndpointRecord:
+    latencies: list[float] = field(default_factory=list)
+    errors: int = 0
+    skipped: int = 0
+    statuses: dict[int, int] = field(default_factory=dict)
+
+
+@dataclass
+class LoadRecorder:
+    records: dict[str, EndpointRecord] = field(default_factory=dict)
+
+    def record(self, name: str, latency: float, status: int | None, is_error: bool):
+        record = self.records.setdefault(name, EndpointRecord())
+        record.latencies.append(latency)
+        # Transport failures have no status; they count as errors only.
+        if status is not None:
+            record.statuses[status] = record.statuses.get(status, 0) + 1
+        if is_error:
+            record.errors += 1
+
+    def skip(self, name: str) -> None:
+        self.records.setdefault(name, EndpointRecord()).skipped += 1
+
+
+def percentile(sorted_values: Sequence[float], percent: float) -> float:
+    """Nearest-rank percentile of already sorted values."""
+    if not sorted_values:
+        return 0.0
+
+    rank = math.ceil(percent / 100 * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def summarize_latencies(latencies: list[float], elapsed: float) -> dict[str, Any]:
+    latencies = sorted(latencies)
+    summary = {
+        "requests": len(latencies),
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+    }
+    for name, percent in PERCENTILES.items():
+        summary[f"{name}_ms"] = percentile(latencies, percent) * 1000
+    summary["max_ms"] = (latencies[-1] if latencies else 0.0) * 1000
+
+    return summary
+
+
+def summarize(recorder: LoadRecorder, elapsed: float) -> dict[str, Any]:
+    endpoints = {}
+    for name, record in sorted(recorder.records.items()):
+        endpoints[name] = {
+            **summarize_latencies(record.latencies, elapsed),
+            "errors": record.errors,
+            "skipped": record.skipped,
+            "statuses": {
+                str(status): count for status, count in record.statuses.items()
+            },
+        }
+
+    all_latencies = [
+        latency for record in recorder.records.values() for latency in record.latencies
+    ]
+    total = {
+        **summarize_latencies(all_latencies, elapsed),
+        "errors": sum(record.errors for record in recorder.records.values()),
+        "skipped": sum(record.skipped for record in recorder.records.values()),
+    }
+    return {"elapsed": elapsed, "total": total, "endpoints": endpoints}
+
+
+def pick_operation(operations: Sequence[Operation]) -> Operation:
+    return random.choices(operations, weights=[op.weight for op in operations])[0]
+
+
+async def perform(
+    operation: Operation, recorder: LoadRecorder, scheduled_at: float | None = None
+) -> None:
+    # At a fixed rate latency counts from when the request was due, so a
+    # stalled server is not hidden by requests that were never sent.
+    started_at = time.perf_counter() if scheduled_at is None else scheduled_at
+    try:
+        status = await operation.call()
+    except Exception:
+        recorder.record(operation.name, time.perf_counter() - started_at, None, True)
+        return
+
+    if status is None:
+        recorder.skip(operation.name)
+        # Lets the other workers run when nothing was awaited.
+        await asyncio.sleep(0)
+        return
+
+    recorder.record(
+        operation.name,
+        time.perf_counter() - started_at,
+        status,
+        status not in operation.expected_statuses,
+    )
+
+
+async def run_at_concurrency(
+    operations: Sequence[Operation], concurrency: int, duration: float
+) -> dict[str, Any]:
+    """Closed model: `concurrency` workers each send the next request when done."""
+    recorder = LoadRecorder()
+    started_at = time.perf_counter()
+    deadline = started_at + duration
+
+    async def work() -> None:
+        while time.perf_counter() < deadline:
+            await perform(pick_operation(operations), recorder)
+
+    async with asyncio.TaskGroup() as task_group:
+        for _ in range(concurrency):
+            task_group.create_task(work())
+
+    return summarize(recorder, time.perf_counter() - started_at)
+
+
+async def run_at_rate(
+    operations: Sequence[Operation],
+    rate: float,
+    duration: float,
+    max_in_flight: int = 1000,
+) -> dict[str, Any]:
+    """Open model: requests arrive every 1/rate seconds whether or not the
+    previous ones are done. Arrivals beyond `max_in_flight` are dropped and
+    counted, which marks the point the target stopped keeping up."""
+    recorder = LoadRecorder()
+    interval = 1 / rate
+    dropped = 0
+    in_flight: set[asyncio.Task] = set()
+
+    started_at = time.perf_counter()
+    for arrival in range(int(rate * duration)):
+        scheduled_at = started_at + arrival * interval
+        delay = scheduled_at - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        if len(in_flight) >= max_in_flight:
+            dropped += 1
+            continue
+
+        task = asyncio.create_task(
+            perform(pick_operation(operations), recorder, scheduled_at)
+        )
+        in_flight.add(task)
+        task.add_done_callback(in_flight.discard)
+
+    if in_flight:
+        await asyncio.wait(in_flight)
+
+    summary = summarize(recorder, time.perf_counter() - started_at)
+    summary["total"]["dropped"] = dropped
+    return summary
+
+
+def format_summary(summary: dict[str, Any]) -> str:
+    rows = [
+        [
+            name,
+            result["requests"],
+            result["errors"],
+            result["skipped"],
+            f"{result['throughput']:.1f}",
+            *(f"{result[f'{percentile}_ms']:.2f}" for percentile in PERCENTILES),
+            f"{result['max_ms']:.2f}",
+        ]
+        for name, result in [*summary["endpoints"].items(), ("total", summary["total"])]
+    ]
+    return format_table(
+        ["endpoint", "requests", "errors", "skipped", "req/s", *PERCENTILES, "max ms"],
+        rows,
+    )
+
+
+def save_results(path: Path, results: dict[str, Any]) -> None:
+    path.write_text(json.dumps(results, indent=2, sort_keys=True))
+
+
+def load_results(path: Path) -> dict[str, Any]:
+    return json.loads(path.read_text())
+
+
+def compare_with_baseline(
+    results: dict[str, Any],
+    baseline: dict[str, Any],
+    tolerance: float,
+    compare_throughput: bool = True,
+) -> list[str]:
+    """Endpoints slower, less productive or less reliable than the baseline.
+
+    Latencies may grow, throughput drop and the error rate grow by
+    `tolerance` (0.2 is 20%); error rates under 0.1% are ignored. At a fixed
+    arrival rate throughput only follows the rate, so it is not compared.
+    """
+    regressions = []
+    current_endpoints = {**results["endpoints"], "total": results["total"]}
+    baseline_endpoints = {**baseline["endpoints"], "total": baseline["total"]}
+
+    for name, before in baseline_endpoints.items():
+        after = current_endpoints.get(name)
+        if after is None or not before["requests"] or not after["requests"]:
+            continue
+
+        for latency in COMPARED_LATENCIES:
+            key = f"{latency}_ms"
+            if after[key] > before[key] * (1 + tolerance):
+                regressions.append(
+                    f"{name}: {latency} {before[key]:.2f} -> {after[key]:.2f} ms"
+                )
+
+        if compare_throughput and after["throughput"] < before["throughput"] * (
+            1 - tolerance
+        ):
+            regressions.append(
+                f"{name}: throughput {before['throughput']:.1f} -> "
+                f"{after['throughput']:.1f} req/s"
+            )
+
+        error_rate_before = before["errors"] / before["requests"]
+        error_rate_after = after["errors"] / after["requests"]
+        if error_rate_after > max(error_rate_before * (1 + tolerance), 0.001):
+            regressions.append(
+                f"{name}: error rate {error_rate_before:.2%} -> {error_rate_after:.2%}"
+            )
+
+    return regressions
@@ -0,0 +1,397 @@
+"""Load test of every `/users` endpoint with latency percentiles per endpoint.
+
+Runs the app in process, with the repository picked by `--repository`, or
+against a running server with `--url`. In process the client shares the
+event loop with the app, so absolute numbers are pessimistic; compare runs
+made the same way:
+
+    python -m benchmarks.load.users --repository memory --concurrency 32
+    python -m benchmarks.load.users --repository sqlalchemy --rate 200 \\
+        --duration 30 --output results.json --baseline baseline.json
+
+Exits with 1 when `--baseline` is given and any endpoint regressed by more
+than `--tolerance`, and with 2 when the baseline was recorded with other
+settings.
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import string
+import sys
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from pathlib import Path
+from uuid import uuid4
+
+from httpx import ASGITransport, AsyncClient
+
+from benchmarks.load.harness import (
+    Operation,
+    compare_with_baseline,
+    format_summary,
+    load_results,
+    run_at_concurrency,
+    run_at_rate,
+    save_results,
+)
+
+
+# Relative weights of the operations, named after the route functions.
+# `login` and `change_password` run scrypt, so they are kept rare.
+MIXES = {
+    "read-heavy": {
+        "create_user": 2,
+        "login": 2,
+        "get_all_users": 10,
+        "get_user_by_id": 40,
+        "get_user_by_username": 15,
+        "get_users_by_ids": 8,
+        "check_username_availability": 10,
+        "check_usernames_availability": 2,
+        "change_username": 4,
+        "change_password": 1,
+        "delete_user": 2,
+        "restore_user": 2,
+    },
+    "write-heavy": {
+        "create_user": 20,
+        "login": 5,
+        "get_all_users": 5,
+        "get_user_by_id": 15,
+        "get_user_by_username": 5,
+        "get_users_by_ids": 5,
+        "check_username_availability": 5,
+        "check_usernames_availability": 1,
+        "change_username": 20,
+        "change_password": 5,
+        "delete_user": 10,
+        "restore_user": 10,
+    },
+}
+
+
+# Runs are only compared with a baseline recorded the same way.
+COMPARABLE_SETTINGS = ("target", "mix", "mode", "rate", "concurrency", "duration")
+
+CREATED = frozenset({201})
+SUCCEEDED = frozenset({200, 204})
+
+
+@dataclass
+class LoadUser:
+    oid: str
+    username: str
+    password: str
+
+
+@dataclass
+class UserPool:
+    """Users the load test created, split by deletion state.
+
+    An operation on a user takes it out of the pool until it is done, so two
+    concurrent requests never fight over one user and only server faults
+    show up as errors. When there is no user to take, the operation is
+    skipped rather than replaced by another request.
+    """
+
+    active: list[LoadUser] = field(default_factory=list)
+    deleted: list[LoadUser] = field(default_factory=list)
+
+    @staticmethod
+    def take(users: list[LoadUser]) -> LoadUser | None:
+        if not users:
+            return None
+
+        # Swap with the last one, so taking stays O(1).
+        position = random.randrange(len(users))
+        users[position], users[-1] = users[-1], users[position]
+        return users.pop()
+
+    def sample_active(self, amount: int) -> list[LoadUser]:
+        return random.sample(self.active, min(amount, len(self.active)))
+
+
+@dataclass
+class UserScenario:
+    client: AsyncClient
+    pool: UserPool = field(default_factory=UserPool)
+    # Keep usernames and phones of parallel runs apart.
+    run_tag: str = field(
+        default_factory=lambda: "".join(random.choices(string.ascii_lowercase, k=4))
+    )
+    phone_prefix: int = field(default_factory=lambda: random.randrange(10_000))
+    _counter: int = 0
+
+    def get_operations(self, mix: dict[str, int]) -> list[Operation]:
+        return [
+            Operation(
+                name=name,
+                weight=weight,
+                call=getattr(self, name),
+                expected_statuses=CREATED if name == "create_user" else SUCCEEDED,
+            )
+            for name, weight in mix.items()
+            if weight
+        ]
+
+    async def seed(self, users: int, concurrency: int = 16) -> None:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def create() -> None:
+            async with semaphore:
+                await self.create_user()
+
+        await asyncio.gather(*(create() for _ in range(users)))
+
+    def _next_identity(self) -> tuple[str, str]:
+        self._counter += 1
+        # Usernames allow 3 to 15 characters.
+        username = f"lt{self.run_tag}{self._counter:x}"
+        phone = f"+7{self.phone_prefix:04d}{self._counter:06d}"
+        return username, phone
+
+    async def create_user(self) -> int:
+        username, phone = self._next_identity()
+        password = uuid4().hex[:12]
+        response = await self.client.post(
+            "/users/",
+            json={"phone": phone, "username": username, "password": password},
+        )
+        if response.status_code == 201:
+            self.pool.active.append(
+                LoadUser(response.json()["oid"], username, password)
+            )
+
+        return response.status_code
+
+    async def login(self) -> int | None:
+        user = self.pool.take(self.pool.active)
+        if user is None:
+            return None
+
+        try:
+            response = await self.client.post(
+                "/users/login/",
+                json={"username": user.username, "password": user.password},
+            )
+        finally:
+            self.pool.active.append(user)
+
+        return response.status_code
+
+    async def get_all_users(self) -> int:
+        response = await self.client.get(
+            "/users/", params={"limit": 20, "count_mode": "estimated"}
+        )
+        return response.status_code
+
+    async def get_user_by_id(self) -> int | None:
+        user = self.pool.take(self.pool.active)
+        if user is None:
+            return None
+
+        try:
+            response = await self.client.get(f"/users/{user.oid}/")
+        finally:
+            self.pool.active.append(user)
+
+        return response.status_code
+
+    async def get_user_by_username(self) -> int | None:
+        user = self.pool.take(self.pool.active)
+        if user is None:
+            return None
+
+        try:
+            response = await self.client.get(f"/users/@{user.username}/")
+        finally:
+            self.pool.active.append(user)
+
+        return response.status_code
+
+    async def get_users_by_ids(self) -> int | None:
+        users = self.pool.sample_active(20)
+        if not users:
+            return None
+
+        response = await self.client.post(
+            "/users/batch/", json={"user_oids": [user.oid for user in users]}
+        )
+        return response.status_code
+
+    async def check_username_availability(self) -> int:
+        # Half of the checks are for taken usernames, half for free ones.
+        existing = self.pool.sample_active(1)
+        if existing and random.random() < 0.5:
+            username = existing[0].username
+        else:
+            username, _ = self._next_identity()
+        response = await self.client.get(
+            "/users/availability/", params={"username": username}
+        )
+        return response.status_code
+
+    async def check_usernames_availability(self) -> int:
+        usernames = [self._next_identity()[0] for _ in range(10)]
+        usernames.extend(user.username for user in self.pool.sample_active(10))
+        response = await self.client.post(
+            "/users/availability/", json={"usernames": usernames}
+        )
+        return response.status_code
+
+    async def change_username(self) -> int | None:
+        user = self.pool.take(self.pool.active)
+        if user is None:
+            return None
+
+        new_username, _ = self._next_identity()
+        try:
+            response = await self.client.patch(
+                f"/users/{user.oid}/username/", json={"new_username": new_username}
+            )
+            if response.status_code == 204:
+                user.username = new_username
+        finally:
+            self.pool.active.append(user)
+
+        return response.status_code
+
+    async def change_password(self) -> int | None:
+        user = self.pool.take(self.pool.active)
+        if user is None:
+            return None
+
+        new_password = uuid4().hex[:12]
+        try:
+            response = await self.client.patch(
+                f"/users/{user.oid}/password/",
+                json={"old_password": user.password, "new_password": new_password},
+            )
+            if response.status_code == 204:
+                user.password = new_password
+        finally:
+            self.pool.active.append(user)
+
+        return response.status_code
+
+    async def delete_user(self) -> int | None:
+        user = self.pool.take(self.pool.active)
+        if user is None:
+            return None
+
+        is_deleted = False
+        try:
+            response = await self.client.delete(f"/users/{user.oid}/")
+            is_deleted = response.status_code == 204
+        finally:
+            (self.pool.deleted if is_deleted else self.pool.active).append(user)
+
+        return response.status_code
+
+    async def restore_user(self) -> int | None:
+        user = self.pool.take(self.pool.deleted)
+        if user is None:
+            return None
+
+        is_restored = False
+        try:
+            response = await self.client.patch(f"/users/{user.oid}/restore/")
+            is_restored = response.status_code == 204
+        finally:
+            (self.pool.active if is_restored else self.pool.deleted).append(user)
+
+        return response.status_code
+
+
+async def open_client(stack: AsyncExitStack, url: str | None, repository: str):
+    if url is not None:
+        return await stack.enter_async_context(AsyncClient(base_url=url, timeout=30))
+
+    # Settings are read on import, so the repository is chosen before it.
+    os.environ["USERS_REPOSITORY"] = repository
+    from application.api.main import create_app
+
+    app = create_app()
+    await stack.enter_async_context(app.router.lifespan_context(app))
+    transport = ASGITransport(app=app)
+    return await stack.enter_async_context(
+        AsyncClient(transport=transport, base_url="http://load", timeout=30)
+    )
+
+
+async def main(arguments: argparse.Namespace) -> int:
+    async with AsyncExitStack() as stack:
+        client = await open_client(stack, arguments.url, arguments.repository)
+        scenario = UserScenario(client)
+        await scenario.seed(arguments.seed_users)
+        operations = scenario.get_operations(MIXES[arguments.mix])
+
+        if arguments.rate:
+            summary = await run_at_rate(operations, arguments.rate, arguments.duration)
+        else:
+            summary = await run_at_concurrency(
+                operations, arguments.concurrency, arguments.duration
+            )
+
+    summary["meta"] = {
+        "target": arguments.url or f"in-process/{arguments.repository}",
+        "mix": arguments.mix,
+        "mode": "rate" if arguments.rate else "concurrency",
+        "rate": arguments.rate,
+        "concurrency": None if arguments.rate else arguments.concurrency,
+        "duration": arguments.duration,
+        "finished_at": datetime.now(UTC).isoformat(),
+    }
+    print(format_summary(summary))
+    if "dropped" in summary["total"]:
+        print(f"dropped arrivals: {summary['total']['dropped']}")
+
+    if arguments.output:
+        save_results(arguments.output, summary)
+
+    if arguments.baseline:
+        baseline = load_results(arguments.baseline)
+        differences = {
+            key: (baseline["meta"].get(key), value)
+            for key, value in summary["meta"].items()
+            if key in COMPARABLE_SETTINGS and baseline["meta"].get(key) != value
+        }
+        if differences:
+            print(f"Baseline was recorded with other settings: {differences}")
+            return 2
+
+        regressions = compare_with_baseline(
+            summary,
+            baseline,
+            arguments.tolerance,
+            compare_throughput=arguments.rate is None,
+        )
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {arguments.tolerance:.0%} of the baseline")
+
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="Base URL of a running server")
+    parser.add_argument(
+        "--repository", choices=["memory", "sqlalchemy", "asyncpg"], default="memory"
+    )
+    parser.add_argument("--mix", choices=sorted(MIXES), default="read-heavy")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument(
+        "--rate", type=float, help="Requests per second; replaces --concurrency"
+    )
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--seed-users", type=int, default=200)
+    parser.add_argument("--output", type=Path)
+    parser.add_argument("--baseline", type=Path)
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    sys.exit(asyncio.run(main(parser.parse_args())))
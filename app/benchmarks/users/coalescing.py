@@ -0,0 +1,74 @@
+"""Concurrent `get_by_oid` callers with and without lookup coalescing.
+
+Needs the database from settings with migrations applied; every round fires
+`--callers` lookups at once, about a fifth of them for the same users:
+
+    python -m benchmarks.users.coalescing --rounds 50 --callers 1 16 128
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import StatementCounter, format_table
+from infrastructure.repositories.common.database import async_engine
+from infrastructure.repositories.users.base import IUserRepository
+from infrastructure.repositories.users.coalescing import CoalescingUserRepository
+from infrastructure.repositories.users.filters.users import GetUsersFilters
+from infrastructure.repositories.users.sqlalchemy import SqlAlchemyUserRepository
+from infrastructure.unit_of_work.sqlalchemy import SqlAlchemyUnitOfWork
+
+
+async def measure(
+    name: str, repository: IUserRepository, oids: list[str], rounds: int, callers: int
+) -> list:
+    # The first fifth of the callers ask for only half as many distinct users.
+    repeated = max(callers // 10, 1)
+    round_oids = [
+        oids[number % repeated if number < callers // 5 else number % len(oids)]
+        for number in range(callers)
+    ]
+
+    with StatementCounter(async_engine) as counter:
+        started_at = time.perf_counter()
+        for _ in range(rounds):
+            await asyncio.gather(*(repository.get_by_oid(oid) for oid in round_oids))
+        elapsed = time.perf_counter() - started_at
+
+    return [
+        name,
+        callers,
+        f"{counter.count / rounds:.1f}",
+        f"{elapsed / rounds * 1000:.2f}",
+    ]
+
+
+async def main(rounds: int, callers: list[int]) -> None:
+    async_engine.echo = False
+    repository = SqlAlchemyUserRepository()
+    coalescing_repository = CoalescingUserRepository(
+        user_repository=repository, unit_of_work=SqlAlchemyUnitOfWork()
+    )
+
+    page = await repository.get_all(GetUsersFilters(limit=max(callers)))
+    oids = [user.oid for user in page.items]
+    if not oids:
+        raise SystemExit("No users to look up, create some first")
+
+    rows = []
+    for amount in callers:
+        rows.append(await measure("direct", repository, oids, rounds, amount))
+        rows.append(
+            await measure("coalesced", coalescing_repository, oids, rounds, amount)
+        )
+
+    print(format_table(["lookups", "callers", "statements/round", "ms/round"], rows))
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--callers", type=int, nargs="+", default=[1, 16, 128])
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.rounds, arguments.callers))
@@ -0,0 +1,75 @@
+"""A burst of identical profile reads, with and without single-flight.
+
+Needs the database from settings with migrations applied; every round sends
+`--burst` concurrent `GetUserByUsernameQuery` for one popular user:
+
+    python -m benchmarks.users.hot_key --rounds 50 --burst 1 16 128
+"""
+
+import argparse
+import asyncio
+import time
+
+from benchmarks.common import StatementCounter, format_table
+from infrastructure.repositories.common.database import async_engine
+from infrastructure.repositories.users.filters.users import GetUsersFilters
+from infrastructure.repositories.users.sqlalchemy import SqlAlchemyUserRepository
+from logic.mediator.base import Mediator
+from logic.queries.single_flight import SingleFlight
+from logic.queries.users import GetUserByUsernameQuery, GetUserByUsernameQueryHandler
+
+
+async def measure(
+    name: str, mediator: Mediator, username: str, rounds: int, burst: int
+) -> list:
+    query = GetUserByUsernameQuery(username=username)
+
+    with StatementCounter(async_engine) as counter:
+        started_at = time.perf_counter()
+        for _ in range(rounds):
+            await asyncio.gather(*(mediator.handle_query(query) for _ in range(burst)))
+        elapsed = time.perf_counter() - started_at
+
+    return [
+        name,
+        burst,
+        f"{counter.count / rounds:.1f}",
+        f"{elapsed / rounds * 1000:.2f}",
+    ]
+
+
+async def main(rounds: int, bursts: list[int]) -> None:
+    async_engine.echo = False
+    repository = SqlAlchemyUserRepository()
+    page = await repository.get_all(GetUsersFilters(limit=1))
+    if not page.items:
+        raise SystemExit("No users to look up, create some first")
+    username = page.items[0].username.as_generic_type()
+
+    single_flight = SingleFlight()
+    mediators = [
+        ("direct", Mediator()),
+        ("single-flight", Mediator(single_flight=single_flight)),
+    ]
+    for _, mediator in mediators:
+        mediator.register_query(
+            GetUserByUsernameQuery,
+            GetUserByUsernameQueryHandler(user_repository=repository),
+        )
+
+    rows = [
+        await measure(name, mediator, username, rounds, burst)
+        for burst in bursts
+        for name, mediator in mediators
+    ]
+    print(format_table(["reads", "burst", "statements/round", "ms/round"], rows))
+    print(f"collapsed: {single_flight.stats.collapsed}")
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--burst", type=int, nargs="+", default=[1, 16, 128])
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.rounds, arguments.burst))
@@ -0,0 +1,89 @@
+"""Per-row cost of turning user rows into entities: validated vs trusted.
+
+Runs without a database on detached models:
+
+    python -m benchmarks.users.hydration --rows 100 --repeat 200
+"""
+
+import argparse
+import time
+from collections.abc import Callable
+from datetime import datetime
+from uuid import uuid4
+
+from benchmarks.common import format_table
+from domain.entities.users import UserEntity
+from domain.values.users import Password, Phone, Username
+from infrastructure.models.users import UserModel
+from infrastructure.repositories.users.converters import convert_user_model_to_entity
+
+
+def validated_convert(user: UserModel) -> UserEntity:
+    """The converter before trusted hydration: every value object validates."""
+    return UserEntity(
+        oid=user.oid,
+        phone=Phone(value=user.phone),
+        username=Username(value=user.username),
+        password=Password(value=user.password, is_hashed=True),
+        created_at=user.created_at,
+        deleted_at=user.deleted_at,
+        is_deleted=user.is_deleted,
+        is_verified=user.is_verified,
+    )
+
+
+def create_models(amount: int) -> list[UserModel]:
+    models = []
+    for number in range(amount):
+        models.append(
+            UserModel(
+                oid=str(uuid4()),
+                username=f"user_{number}",
+                phone=f"+7{number:010d}",
+                password=uuid4().hex * 2,
+                created_at=datetime.now(),
+                is_verified=False,
+                is_deleted=False,
+                deleted_at=None,
+            )
+        )
+
+    return models
+
+
+def measure(
+    name: str,
+    convert: Callable[[UserModel], UserEntity],
+    models: list[UserModel],
+    repeat: int,
+) -> list:
+    started_at = time.perf_counter()
+    for _ in range(repeat):
+        for model in models:
+            convert(model)
+    elapsed = time.perf_counter() - started_at
+
+    rows = len(models) * repeat
+    return [
+        name,
+        f"{elapsed / rows * 1_000_000:.2f}",
+        f"{elapsed / repeat * 1000:.3f}",
+    ]
+
+
+def main(rows: int, repeat: int) -> None:
+    models = create_models(rows)
+
+    results = [
+        measure("validated", validated_convert, models, repeat),
+        measure("trusted", convert_user_model_to_entity, models, repeat),
+    ]
+    print(format_table(["hydration", "us/row", f"ms/{rows}-row page"], results))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=200)
+    arguments = parser.parse_args()
+    main(arguments.rows, arguments.repeat)
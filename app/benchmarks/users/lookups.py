@@ -0,0 +1,87 @@
+"""Single-user lookups: ORM repository vs raw asyncpg, by concurrent callers.
+
+Needs the database from settings with migrations applied; lookups go by oid
+and by username over users that already exist:
+
+    python -m benchmarks.users.lookups --lookups 2000 --concurrency 1 16 128
+"""
+
+import argparse
+import asyncio
+import itertools
+import time
+
+from benchmarks.common import format_table
+from infrastructure.repositories.common.database import async_engine
+from infrastructure.repositories.users.asyncpg import AsyncpgUserRepository
+from infrastructure.repositories.users.base import IUserRepository
+from infrastructure.repositories.users.filters.users import GetUsersFilters
+from infrastructure.repositories.users.sqlalchemy import SqlAlchemyUserRepository
+
+
+async def measure(
+    name: str,
+    repository: IUserRepository,
+    keys: list[tuple[str, str]],
+    lookups: int,
+    concurrency: int,
+) -> list:
+    # Each key is looked up twice, by oid and by username.
+    pending_keys = itertools.islice(itertools.cycle(keys), max(lookups // 2, 1))
+    latencies: list[float] = []
+
+    async def call() -> None:
+        # Callers share one iterator, so the lookups split between them.
+        for oid, username in pending_keys:
+            started_at = time.perf_counter()
+            await repository.get_by_oid(oid)
+            await repository.get_by_username(username)
+            latencies.append((time.perf_counter() - started_at) / 2)
+
+    started_at = time.perf_counter()
+    async with asyncio.TaskGroup() as task_group:
+        for _ in range(concurrency):
+            task_group.create_task(call())
+    elapsed = time.perf_counter() - started_at
+
+    latencies.sort()
+    return [
+        name,
+        concurrency,
+        f"{len(latencies) * 2 / elapsed:.0f}",
+        f"{latencies[len(latencies) // 2] * 1000:.3f}",
+        f"{latencies[int(len(latencies) * 0.99)] * 1000:.3f}",
+    ]
+
+
+async def main(lookups: int, concurrency: list[int]) -> None:
+    async_engine.echo = False
+    repositories = [
+        ("sqlalchemy", SqlAlchemyUserRepository()),
+        ("asyncpg", AsyncpgUserRepository()),
+    ]
+
+    page = await repositories[0][1].get_all(GetUsersFilters(limit=100))
+    keys = [(user.oid, user.username.as_generic_type()) for user in page.items]
+    if not keys:
+        raise SystemExit("No users to look up, create some first")
+
+    rows = []
+    for callers in concurrency:
+        for name, repository in repositories:
+            # Warm the pool and the statement caches before timing.
+            await measure(name, repository, keys, callers * 4, callers)
+            rows.append(await measure(name, repository, keys, lookups, callers))
+
+    print(
+        format_table(["repository", "callers", "lookups/s", "p50 ms", "p99 ms"], rows)
+    )
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 16, 128])
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.lookups, arguments.concurrency))
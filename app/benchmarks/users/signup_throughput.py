@@ -0,0 +1,123 @@
+"""Signups per second and event loop stalls while passwords are hashed.
+
+Runs the create user handler against the in-memory repository, so only the
+hashing differs between rows:
+
+    python -m benchmarks.users.signup_throughput --signups 200 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import hashlib
+import time
+from uuid import uuid4
+
+from benchmarks.common import format_table
+from infrastructure.hashers.base import IPasswordHasher
+from infrastructure.hashers.scrypt import ScryptPasswordHasher
+from infrastructure.repositories.users.memory import InMemoryUserRepository
+from logic.commands.users import CreateUserCommand, CreateUserCommandHandler
+from logic.mediator.base import Mediator
+
+
+class Sha256PasswordHasher(ScryptPasswordHasher):
+    """The bare digest `Password` used to compute in `__post_init__`."""
+
+    async def hash(self, password: str) -> str:
+        return hashlib.sha256(password.encode("utf-8")).hexdigest()
+
+
+class InlineScryptPasswordHasher(ScryptPasswordHasher):
+    """scrypt called straight from the coroutine, blocking the loop."""
+
+    async def _derive(
+        self, password: str, salt: bytes, n: int, r: int, p: int, key_size: int
+    ) -> bytes:
+        return hashlib.scrypt(
+            password.encode("utf-8"),
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            maxmem=256 * n * r * p,
+            dklen=key_size,
+        )
+
+
+async def tick(interval: float, ticks: list[float]) -> None:
+    """Note every wake up of a sleeper; late ones are what requests feel."""
+    while True:
+        ticks.append(time.perf_counter())
+        await asyncio.sleep(interval)
+
+
+async def measure(
+    name: str, password_hasher: IPasswordHasher, signups: int, concurrency: int
+) -> list:
+    handler = CreateUserCommandHandler(
+        _mediator=Mediator(),
+        user_repository=InMemoryUserRepository(),
+        password_hasher=password_hasher,
+    )
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def sign_up(number: int) -> None:
+        async with semaphore:
+            await handler.handle(
+                CreateUserCommand(
+                    username=f"s{uuid4().hex[:10]}",
+                    phone=f"+7{number:010d}",
+                    password="benchmark",
+                )
+            )
+
+    interval = 0.005
+    ticks: list[float] = []
+    ticker = asyncio.create_task(tick(interval, ticks))
+    await asyncio.sleep(0)
+
+    started_at = time.perf_counter()
+    await asyncio.gather(*(sign_up(number) for number in range(signups)))
+    finished_at = time.perf_counter()
+
+    ticker.cancel()
+    ticks.append(finished_at)
+    lags = sorted(
+        max(later - earlier - interval, 0) for earlier, later in zip(ticks, ticks[1:])
+    )
+
+    return [
+        name,
+        f"{signups / (finished_at - started_at):.1f}",
+        f"{lags[len(lags) // 2] * 1000:.1f}",
+        f"{lags[-1] * 1000:.1f}",
+    ]
+
+
+async def main(signups: int, concurrency: int, workers: int) -> None:
+    rows = [
+        await measure("sha256 inline", Sha256PasswordHasher(), signups, concurrency),
+        await measure(
+            "scrypt inline", InlineScryptPasswordHasher(), signups, concurrency
+        ),
+        await measure(
+            f"scrypt pool ({workers} workers)",
+            ScryptPasswordHasher(max_workers=workers, max_concurrency=workers * 2),
+            signups,
+            concurrency,
+        ),
+    ]
+    print(
+        format_table(
+            ["hasher", "signups/s", "p50 loop lag ms", "max loop lag ms"], rows
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--signups", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, default=4)
+    arguments = parser.parse_args()
+    asyncio.run(main(arguments.signups, arguments.concurrency, arguments.workers))
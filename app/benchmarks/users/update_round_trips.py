@@ -0,0 +1,118 @@
+"""Statements and latency per user write: change-tracked UPDATE vs session.merge.
+
+Needs the database from settings with migrations applied:
+
+    python -m benchmarks.users.update_round_trips --iterations 200
+"""
+
+import argparse
+import asyncio
+import time
+from datetime import datetime
+from uuid import uuid4
+
+from sqlalchemy import select
+
+from benchmarks.common import StatementCounter, format_table
+from domain.entities.users import UserEntity
+from domain.values.users import Password, Phone, Username
+from infrastructure.models.users import UserModel
+from infrastructure.repositories.common.database import async_engine, async_session
+from infrastructure.repositories.users.converters import (
+    convert_user_entity_to_model,
+    convert_user_model_to_entity,
+)
+from infrastructure.repositories.users.sqlalchemy import SqlAlchemyUserRepository
+
+
+async def legacy_update(user: UserEntity) -> UserEntity:
+    """The merge-based write the repository used before change tracking."""
+    async with async_session() as session:
+        user_model = await session.merge(convert_user_entity_to_model(user))
+        await session.commit()
+
+        return convert_user_model_to_entity(user_model)
+
+
+async def legacy_delete(oid: str) -> None:
+    async with async_session() as session:
+        result = await session.execute(select(UserModel).filter_by(oid=oid))
+        user = result.scalars().first()
+        user.is_deleted = True
+        user.deleted_at = datetime.now()
+        await session.commit()
+
+
+async def create_users(
+    repository: SqlAlchemyUserRepository, amount: int
+) -> list[UserEntity]:
+    users = []
+    for _ in range(amount):
+        suffix = uuid4().hex[:10]
+        user = await UserEntity.create(
+            username=Username(value=f"b{suffix}"),
+            phone=Phone(value=f"+7{int(suffix, 16) % 10**10:010d}"),
+            password=Password(value="benchmark"),
+        )
+        await repository.add(user)
+        users.append(user)
+
+    return users
+
+
+async def measure(name: str, operation, users: list[UserEntity]) -> list:
+    with StatementCounter(async_engine) as counter:
+        started_at = time.perf_counter()
+        for user in users:
+            await operation(user)
+        elapsed = time.perf_counter() - started_at
+
+    return [
+        name,
+        f"{counter.count / len(users):.2f}",
+        f"{elapsed / len(users) * 1000:.3f}",
+    ]
+
+
+async def rename(update, user: UserEntity) -> None:
+    await user.change_username(Username(value=f"r{uuid4().hex[:10]}"))
+    await update(user)
+
+
+async def main(iterations: int) -> None:
+    async_engine.echo = False
+    repository = SqlAlchemyUserRepository()
+
+    legacy_users = await create_users(repository, iterations)
+    tracked_users = await create_users(repository, iterations)
+
+    rows = [
+        await measure(
+            "rename: merge",
+            lambda user: rename(legacy_update, user),
+            legacy_users,
+        ),
+        await measure(
+            "rename: UPDATE ... RETURNING",
+            lambda user: rename(repository.update, user),
+            tracked_users,
+        ),
+        await measure(
+            "delete: SELECT + flush",
+            lambda user: legacy_delete(user.oid),
+            legacy_users,
+        ),
+        await measure(
+            "delete: UPDATE ... RETURNING",
+            lambda user: repository.delete(user.oid),
+            tracked_users,
+        ),
+    ]
+    print(format_table(["operation", "statements/op", "ms/op"], rows))
+    await async_engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=200)
+    asyncio.run(main(parser.parse_args().iterations))
@@ -24,6 +24,10 @@ class BaseEntity(ABC):
         default_factory=datetime.now,
         kw_only=True,
     )
+    _dirty_fields: set[str] = field(
+        default_factory=set,
+        kw_only=True,
+    )
 
     def __hash__(self) -> int:
         return hash(self.oid)
@@ -39,3 +43,13 @@ class BaseEntity(ABC):
         self._events.clear()
 
         return registered_events
+
+    def mark_dirty(self, *field_names: str) -> None:
+        self._dirty_fields.update(field_names)
+
+    @property
+    def dirty_fields(self) -> frozenset[str]:
+        return frozenset(self._dirty_fields)
+
+    def clear_dirty_fields(self) -> None:
+        self._dirty_fields.clear()
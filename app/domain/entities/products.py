@@ -37,17 +37,21 @@ class ProductEntity(BaseEntity):
     description: ProductDescription
     price: ProductPrice
     quantity: ProductQuantity
+    vendor: ProductVendor
     images: list[ProductImage] = field(default_factory=list)
     categories: list[ProductCategory] = field(default_factory=list)
     tags: list[ProductTag] = field(default_factory=list)
     warranty_period: ProductWarrantyPeriod | None = field(default=None)
     storage_instructions: list[ProductStorageInstructions] = field(default_factory=list)
-    vendor: ProductVendor
 
     is_deleted: bool = field(default=False, kw_only=True)
 
-    created_at: datetime = field(default_factory=datetime.now(UTC), kw_only=True)
-    updated_at: datetime = field(default_factory=datetime.now(UTC), kw_only=True)
+    created_at: datetime = field(
+        default_factory=lambda: datetime.now(UTC), kw_only=True
+    )
+    updated_at: datetime = field(
+        default_factory=lambda: datetime.now(UTC), kw_only=True
+    )
     deleted_at: datetime | None = field(default=None, kw_only=True)
 
     @classmethod
@@ -79,7 +83,7 @@ class ProductEntity(BaseEntity):
         new_product.register_event(
             ProductCreatedEvent(
                 product_oid=new_product.oid,
-                title=new_product.title.as_generic_type(),
+                product_title=new_product.title.as_generic_type(),
                 vendor=new_product.vendor.as_generic_type(),
                 description=new_product.description.as_generic_type(),
                 price=new_product.price.as_generic_type(),
@@ -104,6 +108,7 @@ class ProductEntity(BaseEntity):
         self._validate_not_deleted()
         old_title = self.title
         self.title = new_title
+        self.mark_dirty("title")
 
         self.register_event(
             ProductChangedTitleEvent(
@@ -117,6 +122,7 @@ class ProductEntity(BaseEntity):
         self._validate_not_deleted()
         old_description = self.description
         self.description = new_description
+        self.mark_dirty("description")
 
         self.register_event(
             ProductChangedDescriptionEvent(
@@ -130,6 +136,7 @@ class ProductEntity(BaseEntity):
         self._validate_not_deleted()
         old_price = self.price
         self.price = new_price
+        self.mark_dirty("price")
 
         self.register_event(
             ProductChangedPriceEvent(
@@ -143,6 +150,7 @@ class ProductEntity(BaseEntity):
         self._validate_not_deleted()
         old_quantity = self.quantity
         self.quantity = new_quantity
+        self.mark_dirty("quantity")
 
         self.register_event(
             ProductChangedQuantityEvent(
@@ -156,6 +164,7 @@ class ProductEntity(BaseEntity):
         self._validate_not_deleted()
         old_vendor = self.vendor
         self.vendor = new_vendor
+        self.mark_dirty("vendor")
 
         self.register_event(
             ProductChangedVendorEvent(
@@ -169,6 +178,7 @@ class ProductEntity(BaseEntity):
         self._validate_not_deleted()
         old_images = self.images
         self.images = new_images
+        self.mark_dirty("images")
 
         self.register_event(
             ProductUpdatedImagesEvent(
@@ -182,6 +192,7 @@ class ProductEntity(BaseEntity):
         self._validate_not_deleted()
         old_categories = self.categories
         self.categories = new_categories
+        self.mark_dirty("categories")
 
         self.register_event(
             ProductUpdatedCategoriesEvent(
@@ -199,6 +210,7 @@ class ProductEntity(BaseEntity):
         self._validate_not_deleted()
         old_tags = self.tags
         self.tags = new_tags
+        self.mark_dirty("tags")
 
         self.register_event(
             ProductUpdatedTagsEvent(
@@ -214,6 +226,7 @@ class ProductEntity(BaseEntity):
         self._validate_not_deleted()
         old_warranty_period = self.warranty_period
         self.warranty_period = new_warranty_period
+        self.mark_dirty("warranty_period")
 
         self.register_event(
             ProductUpdatedWarrantyPeriodEvent(
@@ -233,6 +246,7 @@ class ProductEntity(BaseEntity):
         self._validate_not_deleted()
         old_storage_instructions = self.storage_instructions
         self.storage_instructions = new_storage_instructions
+        self.mark_dirty("storage_instructions")
 
         self.register_event(
             ProductUpdatedStorageInstructionsEvent(
@@ -250,16 +264,18 @@ class ProductEntity(BaseEntity):
 
     def delete(self) -> None:
         self._validate_not_deleted()
+        self.is_deleted = True
         self.deleted_at = datetime.now(UTC)
+        self.mark_dirty("is_deleted", "deleted_at")
 
         self.register_event(
             ProductDeletedEvent(
                 product_oid=self.oid,
-                title=self.title.as_generic_type(),
+                product_title=self.title.as_generic_type(),
                 vendor=self.vendor.as_generic_type(),
             )
         )
 
     def _validate_not_deleted(self) -> None:
-        if self.deleted_at is not None:
+        if self.is_deleted or self.deleted_at is not None:
             raise ProductAlreadyDeleted(self.oid)
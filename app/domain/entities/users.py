@@ -47,18 +47,20 @@ class UserEntity(BaseEntity):
         self._validate_not_deleted()
         old_username = self.username
         self.username = new_username
+        self.mark_dirty("username")
 
         self.register_event(
             UserChangedUsernameEvent(
                 user_oid=self.oid,
-                old_username=old_username,
-                new_username=new_username,
+                old_username=old_username.as_generic_type(),
+                new_username=new_username.as_generic_type(),
             )
         )
 
     async def change_password(self, new_password: Password) -> None:
         self._validate_not_deleted()
         self.password = new_password
+        self.mark_dirty("password")
 
         self.register_event(
             UserChangedPasswordEvent(
@@ -66,10 +68,16 @@ class UserEntity(BaseEntity):
             )
         )
 
+    async def rehash_password(self, password_hash: Password) -> None:
+        """Store the same password under a stronger hash; nothing to announce."""
+        self.password = password_hash
+        self.mark_dirty("password")
+
     async def restore(self) -> None:
         self._validate_deleted()
         self.is_deleted = False
         self.deleted_at = None
+        self.mark_dirty("is_deleted", "deleted_at")
 
         self.register_event(
             RestoreUserEvent(
@@ -83,6 +91,7 @@ class UserEntity(BaseEntity):
         self._validate_not_deleted()
         self.is_deleted = True
         self.deleted_at = datetime.now(UTC)
+        self.mark_dirty("is_deleted", "deleted_at")
 
         self.register_event(
             UserDeletedEvent(
@@ -9,10 +9,10 @@ class ProductCreatedEvent(BaseEvent):
     title: ClassVar[str] = "Product Created"
 
     product_oid: str
-    title: str
+    product_title: str
     vendor: str
     description: str
-    price: float
+    price: str
     quantity: int
     images: list[str]
     categories: list[str]
@@ -44,8 +44,8 @@ class ProductChangedPriceEvent(BaseEvent):
     title: ClassVar[str] = "Product Price Changed"
 
     product_oid: str
-    old_price: float
-    new_price: float
+    old_price: str
+    new_price: str
 
 
 @dataclass
@@ -116,5 +116,5 @@ class ProductDeletedEvent(BaseEvent):
     title: ClassVar[str] = "Product Deleted"
 
     product_oid: str
-    title: str
+    product_title: str
     vendor: str
@@ -50,6 +50,15 @@ class InvalidProductPriceLength(ApplicationException):
         return f"Product price length is invalid: {self.price_value}"
 
 
+@dataclass(eq=False)
+class InvalidProductPrice(ApplicationException):
+    price_value: str
+
+    @property
+    def message(self) -> str:
+        return f"Product price must be a non-negative number: {self.price_value}"
+
+
 @dataclass(eq=False)
 class EmptyProductQuantity(ApplicationException):
     @property
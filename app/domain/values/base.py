@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Generic, TypeVar
+from typing import Any, Generic, Self, TypeVar
 
 
 VT = TypeVar("VT", bound=Any)
@@ -13,6 +13,17 @@ class BaseValueObject(ABC, Generic[VT]):
     def __post_init__(self):
         self.validate()
 
+    @classmethod
+    def from_trusted(cls, value: VT, **attributes: Any) -> Self:
+        """Build from a value this class already accepted, e.g. a stored row.
+
+        Skips `__post_init__`, so neither validation nor normalization runs.
+        """
+        value_object = object.__new__(cls)
+        value_object.__dict__.update(attributes, value=value)
+
+        return value_object
+
     @abstractmethod
     def validate(self): ...
 
@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
 import re
 
 from domain.exceptions.products import (
@@ -15,6 +16,7 @@ from domain.exceptions.products import (
     InvalidProductCategoryLength,
     InvalidProductDescriptionLength,
     InvalidProductImage,
+    InvalidProductPrice,
     InvalidProductPriceLength,
     InvalidProductQuantity,
     InvalidProductTagLength,
@@ -73,13 +75,24 @@ class ProductPrice(BaseValueObject):
         if value_length not in range(1, 10):
             raise InvalidProductPriceLength(self.value)
 
+        try:
+            price = Decimal(self.value)
+        except InvalidOperation:
+            raise InvalidProductPrice(self.value)
+
+        if not price.is_finite() or price < 0:
+            raise InvalidProductPrice(self.value)
+
+    def as_generic_type(self) -> str:
+        return str(self.value)
+
 
 @dataclass
 class ProductQuantity(BaseValueObject):
     value: int
 
     def validate(self) -> None:
-        if not self.value:
+        if self.value is None:
             raise EmptyProductQuantity()
 
         if self.value < 0:
@@ -115,7 +128,7 @@ class ProductImage(BaseValueObject):
             raise EmptyProductImage()
 
         if not re.match(r"^https?://[\w\.-]+(/\S*)?$", self.value):
-            raise InvalidProductImage()
+            raise InvalidProductImage(self.value)
 
     def as_generic_type(self) -> str:
         return str(self.value)
@@ -168,6 +181,9 @@ class ProductWarrantyPeriod(BaseValueObject):
         if value_length not in range(3, 20):
             raise InvalidWarrantyPeriodLength(value_length)
 
+    def as_generic_type(self) -> str:
+        return str(self.value)
+
 
 @dataclass
 class ProductStorageInstructions(BaseValueObject):
@@ -181,3 +197,6 @@ class ProductStorageInstructions(BaseValueObject):
 
         if value_length not in range(3, 1000):
             raise InvalidStorageInstructionsLength(value_length)
+
+    def as_generic_type(self) -> str:
+        return str(self.value)
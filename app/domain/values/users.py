@@ -1,5 +1,4 @@
 from dataclasses import dataclass, field
-import hashlib
 import re
 
 from domain.exceptions.users import (
@@ -60,30 +59,22 @@ class Phone(BaseValueObject):
 
 @dataclass
 class Password(BaseValueObject):
+    """Plain password to validate, or with `is_hashed` the hash to store."""
+
     value: str
     is_hashed: bool = field(default=False, kw_only=True)
 
-    def __post_init__(self):
-        super().__post_init__()
-        if not self.is_hashed:
-            self.hash_password(self.value)
-
     def validate(self):
         if not self.value:
             raise EmptyPassword()
 
+        if self.is_hashed:
+            return
+
         value_length = len(self.value)
 
         if value_length not in range(3, 100):
             raise InvalidPasswordLength(value_length)
 
-    def hash_password(self, password: str) -> None:
-        self.is_hashed = True
-        self.value = hashlib.sha256(password.encode("utf-8")).hexdigest()
-
-    def check_password(self, plain_password: str) -> bool:
-        hashed_input = hashlib.sha256(plain_password.encode("utf-8")).hexdigest()
-        return hashed_input == self.value
-
     def as_generic_type(self):
         return str(self.value)
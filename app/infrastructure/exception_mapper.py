@@ -5,6 +5,13 @@ from typing import Any, ParamSpec, TypeVar
 from sqlalchemy.exc import SQLAlchemyError
 
 from infrastructure.exceptions.base import RepositoryException
+from infrastructure.metrics.base import Timer
+from infrastructure.metrics.registry import (
+    REPOSITORY_CALL_DURATION,
+    REPOSITORY_CALL_ERRORS,
+)
+from infrastructure.tracing.base import SpanKind
+from infrastructure.tracing.tracer import tracer
 
 Param = ParamSpec("Param")
 ReturnType = TypeVar("ReturnType")
@@ -14,12 +21,19 @@ Func = Callable[Param, ReturnType]
 def exception_mapper(
     func: Callable[Param, Coroutine[Any, Any, ReturnType]],
 ) -> Callable[Param, Coroutine[Any, Any, ReturnType]]:
+    repository, _, method = func.__qualname__.rpartition(".")
+    span_name = func.__qualname__
+
     @wraps(func)
     async def wrapped(*args: Param.args, **kwargs: Param.kwargs) -> ReturnType:
-        try:
-            return await func(*args, **kwargs)
-        except SQLAlchemyError as err:
-            raise err
-            raise RepositoryException from err
+        with (
+            Timer(REPOSITORY_CALL_DURATION, REPOSITORY_CALL_ERRORS, repository, method),
+            tracer.start_span(span_name, kind=SpanKind.CLIENT),
+        ):
+            try:
+                return await func(*args, **kwargs)
+            except SQLAlchemyError as err:
+                raise err
+                raise RepositoryException from err
 
     return wrapped
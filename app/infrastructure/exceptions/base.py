@@ -15,3 +15,22 @@ class RepositoryException(InfrastructureException):
     @property
     def message(self) -> str:
         return "Repository exeption has occurred"
+
+
+@dataclass(eq=False)
+class InvalidCursorException(InfrastructureException):
+    cursor: str
+
+    @property
+    def message(self) -> str:
+        return f"The provided pagination cursor is invalid: {self.cursor}"
+
+
+@dataclass(eq=False)
+class UniqueFieldViolationException(RepositoryException):
+    field_name: str
+    value: str
+
+    @property
+    def message(self) -> str:
+        return f"Value {self.value} of the unique field {self.field_name} is taken"
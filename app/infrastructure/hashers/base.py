@@ -0,0 +1,14 @@
+from abc import ABC, abstractmethod
+
+
+class IPasswordHasher(ABC):
+    @abstractmethod
+    async def hash(self, password: str) -> str:
+        """Hash string carrying the algorithm and parameters it was made with."""
+
+    @abstractmethod
+    async def verify(self, password: str, password_hash: str) -> bool: ...
+
+    @abstractmethod
+    def needs_rehash(self, password_hash: str) -> bool:
+        """Whether the hash was made by another algorithm or with other parameters."""
@@ -0,0 +1,116 @@
+import asyncio
+import hashlib
+import hmac
+import os
+from base64 import b64decode, b64encode
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import partial
+
+from infrastructure.hashers.base import IPasswordHasher
+
+
+SCRYPT_ALGORITHM = "scrypt"
+SHA256_HEX_LENGTH = 64
+
+
+@dataclass
+class ScryptPasswordHasher(IPasswordHasher):
+    """scrypt hashes computed off the event loop.
+
+    `hashlib.scrypt` releases the GIL, so a small thread pool runs hashes in
+    parallel while the loop keeps serving requests. The semaphore bounds how
+    many requests wait on the pool at once. Hashes look like
+    `scrypt$n=16384,r=8,p=1$<salt>$<key>`; bare SHA-256 hex digests written
+    before are still accepted and reported by `needs_rehash`.
+    """
+
+    n: int = 2**14
+    r: int = 8
+    p: int = 1
+    salt_size: int = 16
+    key_size: int = 64
+    max_workers: int = 4
+    max_concurrency: int = 8
+
+    _executor: ThreadPoolExecutor = field(init=False, repr=False)
+    _semaphore: asyncio.Semaphore = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers, thread_name_prefix="password-hasher"
+        )
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+    @property
+    def parameters(self) -> str:
+        return f"n={self.n},r={self.r},p={self.p}"
+
+    async def hash(self, password: str) -> str:
+        salt = os.urandom(self.salt_size)
+        key = await self._derive(password, salt, self.n, self.r, self.p, self.key_size)
+
+        return "$".join(
+            (
+                SCRYPT_ALGORITHM,
+                self.parameters,
+                b64encode(salt).decode(),
+                b64encode(key).decode(),
+            )
+        )
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        if self._is_sha256(password_hash):
+            password_digest = hashlib.sha256(password.encode("utf-8")).hexdigest()
+            return hmac.compare_digest(password_digest, password_hash)
+
+        try:
+            algorithm, parameters, salt, key = password_hash.split("$")
+            n, r, p = (int(value.split("=")[1]) for value in parameters.split(","))
+            salt, key = b64decode(salt), b64decode(key)
+        except (ValueError, IndexError):
+            return False
+
+        if algorithm != SCRYPT_ALGORITHM:
+            return False
+
+        # A stored hash may carry parameters scrypt rejects, such as an `n`
+        # that is not a power of two; it matches no password.
+        try:
+            password_key = await self._derive(password, salt, n, r, p, len(key))
+        except (ValueError, OverflowError):
+            return False
+
+        return hmac.compare_digest(password_key, key)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        algorithm, _, rest = password_hash.partition("$")
+        parameters, _, _ = rest.partition("$")
+
+        return algorithm != SCRYPT_ALGORITHM or parameters != self.parameters
+
+    async def _derive(
+        self, password: str, salt: bytes, n: int, r: int, p: int, key_size: int
+    ) -> bytes:
+        derive = partial(
+            hashlib.scrypt,
+            password.encode("utf-8"),
+            salt=salt,
+            n=n,
+            r=r,
+            p=p,
+            # scrypt needs 128 * n * r bytes; leave room above OpenSSL's default.
+            maxmem=256 * n * r * p,
+            dklen=key_size,
+        )
+
+        async with self._semaphore:
+            return await asyncio.get_running_loop().run_in_executor(
+                self._executor, derive
+            )
+
+    @staticmethod
+    def _is_sha256(password_hash: str) -> bool:
+        return len(password_hash) == SHA256_HEX_LENGTH and all(
+            character in "0123456789abcdef" for character in password_hash
+        )
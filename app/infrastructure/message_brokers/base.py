@@ -1,7 +1,16 @@
 from abc import ABC, abstractmethod
+from collections.abc import Iterable
 from dataclasses import dataclass
 
 
+@dataclass(frozen=True)
+class BrokerMessage:
+    topic: str
+    value: bytes
+    key: bytes | None = None
+    headers: tuple[tuple[str, bytes], ...] = ()
+
+
 @dataclass
 class IMessageBroker(ABC):
     @abstractmethod
@@ -13,6 +22,10 @@ class IMessageBroker(ABC):
     @abstractmethod
     async def send_message(self, key: str, topic: str, value: bytes): ...
 
+    @abstractmethod
+    async def deliver_messages(self, messages: Iterable[BrokerMessage]) -> None:
+        """Send messages and wait until the broker acknowledged every one of them."""
+
     @abstractmethod
     async def start_consuming(self, topic: str): ...
 
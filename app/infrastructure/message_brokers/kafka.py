@@ -1,20 +1,132 @@
-from dataclasses import dataclass
+import asyncio
+import time
+from collections.abc import Iterable
+from contextlib import ExitStack
+from dataclasses import dataclass, replace
+from functools import partial
 from typing import AsyncIterator
 
 import orjson
 
-from infrastructure.message_brokers.base import IMessageBroker
+from infrastructure.message_brokers.base import BrokerMessage, IMessageBroker
+from infrastructure.metrics.registry import (
+    BROKER_DELIVERY_DURATION,
+    BROKER_DELIVERY_ERRORS,
+)
+from infrastructure.tracing.base import (
+    NOOP_SPAN_SCOPE,
+    NoOpSpanScope,
+    SpanContext,
+    SpanKind,
+    SpanScope,
+)
+from infrastructure.tracing.tracer import (
+    TRACEPARENT_HEADER,
+    TraceHeaders,
+    get_trace_headers,
+    tracer,
+)
 from aiokafka import AIOKafkaConsumer, AIOKafkaProducer
 
 
+def add_trace_headers(
+    message: BrokerMessage, trace_headers: TraceHeaders
+) -> BrokerMessage:
+    """Messages from the outbox already carry the trace they were raised in."""
+    if not trace_headers or any(
+        name == TRACEPARENT_HEADER for name, _ in message.headers
+    ):
+        return message
+
+    return replace(message, headers=message.headers + trace_headers)
+
+
+def get_message_trace(message: BrokerMessage) -> SpanContext | None:
+    for name, value in message.headers:
+        if name == TRACEPARENT_HEADER:
+            return SpanContext.from_traceparent(value.decode("latin-1"))
+
+    return None
+
+
 @dataclass
 class KafkaMessageBroker(IMessageBroker):
+    """Delivers batches through a producer that compresses what it batches.
+
+    Delivery latency and failures go to the metrics registry. A message that
+    carries the trace it was raised in, as outbox messages do, gets a
+    producer span in that trace, from the send until the broker has it.
+    """
+
     producer: AIOKafkaProducer
     consumer: AIOKafkaConsumer
 
     async def send_message(self, key: bytes, topic: str, value: bytes):
         await self.producer.send(topic=topic, key=key, value=value)
 
+    async def deliver_messages(self, messages: Iterable[BrokerMessage]) -> None:
+        with (
+            tracer.start_span("kafka deliver", kind=SpanKind.PRODUCER) as span,
+            ExitStack() as message_spans,
+        ):
+            sent_at = time.perf_counter()
+            trace_headers = get_trace_headers()
+            deliveries = []
+
+            # Every send joins a producer batch; the batches go out together.
+            # Sends stay in one loop, in order, so messages of a key do too.
+            for message in messages:
+                message = add_trace_headers(message, trace_headers)
+                message_spans.enter_context(self._trace_delivery(message))
+                delivery = await self._send(message)
+                delivery.add_done_callback(
+                    partial(self._record_delivery, message, sent_at)
+                )
+                deliveries.append(delivery)
+
+            if span is not None:
+                span.set_attribute("messaging.batch.message_count", len(deliveries))
+            await asyncio.gather(*deliveries)
+
+    @staticmethod
+    def _trace_delivery(message: BrokerMessage) -> SpanScope | NoOpSpanScope:
+        parent = get_message_trace(message)
+        if parent is None:
+            return NOOP_SPAN_SCOPE
+
+        return tracer.start_trace(
+            f"{message.topic} publish",
+            parent=parent,
+            kind=SpanKind.PRODUCER,
+            attributes={
+                "messaging.system": "kafka",
+                "messaging.destination.name": message.topic,
+            },
+        )
+
+    async def _send(self, message: BrokerMessage) -> asyncio.Future:
+        return await self.producer.send(
+            topic=message.topic,
+            key=message.key,
+            value=message.value,
+            headers=list(message.headers) or None,
+        )
+
+    @staticmethod
+    def _record_delivery(
+        message: BrokerMessage, sent_at: float, delivery: asyncio.Future
+    ) -> None:
+        if delivery.cancelled():
+            BROKER_DELIVERY_ERRORS.inc(message.topic, "CancelledError")
+            return
+
+        error = delivery.exception()
+        if error is not None:
+            BROKER_DELIVERY_ERRORS.inc(message.topic, error.__class__.__name__)
+            return
+
+        BROKER_DELIVERY_DURATION.observe(time.perf_counter() - sent_at, message.topic)
+
     async def start_consuming(self, topic: str) -> AsyncIterator[dict]:
         self.consumer.subscribe(topics=[topic])
 
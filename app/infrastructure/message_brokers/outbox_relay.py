@@ -0,0 +1,92 @@
+import asyncio
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+
+from infrastructure.message_brokers.base import IMessageBroker
+from infrastructure.metrics.base import Timer
+from infrastructure.metrics.registry import (
+    OUTBOX_RELAY_BATCH_DURATION,
+    OUTBOX_RELAY_BATCH_ERRORS,
+    OUTBOX_RELAYED_MESSAGES,
+)
+from infrastructure.repositories.outbox.base import IOutboxRepository
+from infrastructure.unit_of_work.base import IUnitOfWork
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class OutboxRelay:
+    """Moves outbox rows to the broker, at least once and oldest first.
+
+    A batch is claimed, delivered and marked sent in one transaction, so a
+    failed delivery rolls the claim back and the rows are retried. Relays
+    running in parallel skip each other's messages; those of one key stay
+    with one relay until they are sent, so they reach the broker in order.
+    """
+
+    outbox_repository: IOutboxRepository
+    message_broker: IMessageBroker
+    unit_of_work: IUnitOfWork
+    batch_size: int = 1000
+    idle_interval: float = 1.0
+    retry_interval: float = 5.0
+    retention: timedelta = timedelta(days=1)
+    purge_interval: float = 3600.0
+
+    _purged_at: float = field(default=float("-inf"), init=False, repr=False)
+
+    async def relay_batch(self) -> int:
+        with Timer(OUTBOX_RELAY_BATCH_DURATION, OUTBOX_RELAY_BATCH_ERRORS):
+            async with self.unit_of_work.begin():
+                claimed = await self.outbox_repository.claim_unsent(self.batch_size)
+                if not claimed:
+                    return 0
+
+                await self.message_broker.deliver_messages(
+                    outbox_message.message for outbox_message in claimed
+                )
+                await self.outbox_repository.mark_sent(
+                    outbox_message.id for outbox_message in claimed
+                )
+
+        OUTBOX_RELAYED_MESSAGES.inc(amount=len(claimed))
+        return len(claimed)
+
+    async def purge(self) -> int:
+        async with self.unit_of_work.begin():
+            return await self.outbox_repository.purge_sent(
+                datetime.now(UTC) - self.retention
+            )
+
+    async def run(self, stopping: asyncio.Event) -> None:
+        while not stopping.is_set():
+            try:
+                relayed = await self.relay_batch()
+            except Exception:
+                logger.exception("Could not relay an outbox batch")
+                relayed, interval = 0, self.retry_interval
+            else:
+                interval = self.idle_interval
+
+            # A full batch means more rows are probably waiting.
+            if relayed == self.batch_size:
+                continue
+
+            if relayed == 0 and self._is_purge_due():
+                self._purged_at = time.monotonic()
+                try:
+                    await self.purge()
+                except Exception:
+                    logger.exception("Could not purge sent outbox messages")
+
+            try:
+                await asyncio.wait_for(stopping.wait(), timeout=interval)
+            except TimeoutError:
+                pass
+
+    def _is_purge_due(self) -> bool:
+        return time.monotonic() - self._purged_at > self.purge_interval
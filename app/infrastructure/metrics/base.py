@@ -0,0 +1,206 @@
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass, field
+from time import perf_counter
+from types import TracebackType
+
+
+Labels = tuple[str, ...]
+
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+
+def escape_label_value(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def format_labels(names: Iterable[str], values: Iterable[str]) -> str:
+    pairs = ",".join(
+        f'{name}="{escape_label_value(value)}"' for name, value in zip(names, values)
+    )
+    return f"{{{pairs}}}" if pairs else ""
+
+
+def format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+@dataclass(eq=False)
+class Metric(ABC):
+    name: str
+    help: str
+    label_names: Labels = ()
+
+    type: str = field(default="untyped", init=False)
+
+    def render(self) -> Iterator[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.type}"
+        yield from self._render_samples()
+
+    @abstractmethod
+    def _render_samples(self) -> Iterator[str]: ...
+
+
+@dataclass(eq=False)
+class Counter(Metric):
+    type: str = field(default="counter", init=False)
+    _values: dict[Labels, float] = field(default_factory=dict, init=False)
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def get(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def _render_samples(self) -> Iterator[str]:
+        for labels, value in self._values.items():
+            yield (
+                f"{self.name}{format_labels(self.label_names, labels)} "
+                f"{format_value(value)}"
+            )
+
+
+@dataclass(eq=False)
+class HistogramChild:
+    """Observations of one label set; buckets are kept non-cumulative."""
+
+    upper_bounds: tuple[float, ...]
+    bucket_counts: list[int] = field(init=False)
+    count: int = field(default=0, init=False)
+    sum: float = field(default=0.0, init=False)
+
+    def __post_init__(self) -> None:
+        # The extra slot is the +Inf bucket.
+        self.bucket_counts = [0] * (len(self.upper_bounds) + 1)
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect_left(self.upper_bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+@dataclass(eq=False)
+class Histogram(Metric):
+    buckets: tuple[float, ...] = DEFAULT_BUCKETS
+
+    type: str = field(default="histogram", init=False)
+    _children: dict[Labels, HistogramChild] = field(default_factory=dict, init=False)
+
+    def labels(self, *labels: str) -> HistogramChild:
+        child = self._children.get(labels)
+        if child is None:
+            child = self._children[labels] = HistogramChild(self.buckets)
+
+        return child
+
+    def observe(self, value: float, *labels: str) -> None:
+        self.labels(*labels).observe(value)
+
+    def _render_samples(self) -> Iterator[str]:
+        bucket_label_names = (*self.label_names, "le")
+        upper_bounds = (*self.buckets, float("inf"))
+
+        for labels, child in self._children.items():
+            cumulative = 0
+            for upper_bound, bucket_count in zip(upper_bounds, child.bucket_counts):
+                cumulative += bucket_count
+                bucket_labels = format_labels(
+                    bucket_label_names, (*labels, format_value(upper_bound))
+                )
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+
+            formatted_labels = format_labels(self.label_names, labels)
+            yield f"{self.name}_sum{formatted_labels} {format_value(child.sum)}"
+            yield f"{self.name}_count{formatted_labels} {child.count}"
+
+
+@dataclass(eq=False)
+class Gauge(Metric):
+    """Read when scraped, so it costs nothing between scrapes."""
+
+    read: Callable[[], float] = lambda: 0
+
+    type: str = field(default="gauge", init=False)
+
+    def _render_samples(self) -> Iterator[str]:
+        yield f"{self.name} {format_value(self.read())}"
+
+
+@dataclass(eq=False)
+class MetricsRegistry:
+    _metrics: dict[str, Metric] = field(default_factory=dict, init=False)
+
+    def register(self, metric: Metric) -> Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, label_names: Labels = ()) -> Counter:
+        return self.register(Counter(name, help, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        label_names: Labels = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self.register(Histogram(name, help, label_names, buckets))
+
+    def gauge(self, name: str, help: str, read: Callable[[], float]) -> Gauge:
+        return self.register(Gauge(name, help, read=read))
+
+    def get(self, name: str) -> Metric | None:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = [line for metric in self._metrics.values() for line in metric.render()]
+        return "\n".join(lines) + "\n"
+
+
+class Timer:
+    """Observe how long a block takes and count the exceptions leaving it.
+
+    Cancellation is timed but not counted as an error.
+    """
+
+    __slots__ = ("_duration", "_errors", "_labels", "_started_at")
+
+    def __init__(self, duration: Histogram, errors: Counter, *labels: str) -> None:
+        self._duration = duration
+        self._errors = errors
+        self._labels = labels
+
+    def __enter__(self) -> "Timer":
+        self._started_at = perf_counter()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self._duration.observe(perf_counter() - self._started_at, *self._labels)
+        if exc_type is not None and issubclass(exc_type, Exception):
+            self._errors.inc(*self._labels, exc_type.__name__)
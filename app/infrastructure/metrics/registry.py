@@ -0,0 +1,58 @@
+from infrastructure.metrics.base import MetricsRegistry
+
+
+# One registry per process; with several workers every one is scraped apart.
+metrics_registry = MetricsRegistry()
+
+# Call counts are the `_count` series of the duration histograms.
+REPOSITORY_CALL_DURATION = metrics_registry.histogram(
+    "repository_call_duration_seconds",
+    "Time spent in a repository method, row conversion included.",
+    ("repository", "method"),
+)
+REPOSITORY_CALL_ERRORS = metrics_registry.counter(
+    "repository_call_errors_total",
+    "Repository method calls that raised, by exception type.",
+    ("repository", "method", "error"),
+)
+
+MEDIATOR_HANDLE_DURATION = metrics_registry.histogram(
+    "mediator_handle_duration_seconds",
+    "Time spent handling a command, a query or an event batch.",
+    ("kind", "name"),
+)
+MEDIATOR_HANDLE_ERRORS = metrics_registry.counter(
+    "mediator_handle_errors_total",
+    "Commands, queries and event batches whose handling raised.",
+    ("kind", "name", "error"),
+)
+
+BROKER_DELIVERY_DURATION = metrics_registry.histogram(
+    "broker_delivery_duration_seconds",
+    "Time from handing a message to the producer until the broker acknowledged it.",
+    ("topic",),
+)
+BROKER_DELIVERY_ERRORS = metrics_registry.counter(
+    "broker_delivery_errors_total",
+    "Messages the broker did not acknowledge, by exception type.",
+    ("topic", "error"),
+)
+
+OUTBOX_RELAY_BATCH_DURATION = metrics_registry.histogram(
+    "outbox_relay_batch_duration_seconds",
+    "Time to claim, deliver and mark sent one outbox batch; empty polls included.",
+)
+OUTBOX_RELAY_BATCH_ERRORS = metrics_registry.counter(
+    "outbox_relay_batch_errors_total",
+    "Outbox batches rolled back to be retried, by exception type.",
+    ("error",),
+)
+OUTBOX_RELAYED_MESSAGES = metrics_registry.counter(
+    "outbox_relayed_messages_total",
+    "Outbox messages delivered and marked sent.",
+)
+
+DB_POOL_WAIT = metrics_registry.histogram(
+    "db_pool_wait_seconds",
+    "Time to get a connection from the pool, opening a new one included.",
+)
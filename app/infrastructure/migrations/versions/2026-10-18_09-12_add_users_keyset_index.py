@@ -0,0 +1,36 @@
+"""Add users (created_at, oid) index for keyset pagination
+
+Revision ID: 5c0e2f7d91a4
+Revises: b23faa010f97
+Create Date: 2026-10-18 09:12:41.308114
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '5c0e2f7d91a4'
+down_revision = 'b23faa010f97'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Built concurrently so the users table stays writable during the deploy.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_users_created_at_oid',
+            'users',
+            ['created_at', 'oid'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_users_created_at_oid',
+            table_name='users',
+            postgresql_concurrently=True,
+        )
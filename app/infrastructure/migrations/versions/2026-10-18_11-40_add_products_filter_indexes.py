@@ -0,0 +1,90 @@
+"""Store product price as numeric and index product filters
+
+Revision ID: 8e41b7c2d3f6
+Revises: 5c0e2f7d91a4
+Create Date: 2026-10-18 11:40:17.524803
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8e41b7c2d3f6'
+down_revision = '5c0e2f7d91a4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Price ranges have to compare numbers, not strings.
+    op.alter_column(
+        'products',
+        'price',
+        existing_type=sa.String(),
+        type_=sa.Numeric(12, 2),
+        existing_nullable=False,
+        postgresql_using='price::numeric(12, 2)',
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_products_categories',
+            'products',
+            ['categories'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_products_tags',
+            'products',
+            ['tags'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_products_vendor',
+            'products',
+            ['vendor'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_products_price',
+            'products',
+            ['price'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            'ix_products_created_at_oid',
+            'products',
+            ['created_at', 'oid'],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for index_name in (
+            'ix_products_created_at_oid',
+            'ix_products_price',
+            'ix_products_vendor',
+            'ix_products_tags',
+            'ix_products_categories',
+        ):
+            op.drop_index(
+                index_name, table_name='products', postgresql_concurrently=True
+            )
+
+    op.alter_column(
+        'products',
+        'price',
+        existing_type=sa.Numeric(12, 2),
+        type_=sa.String(),
+        existing_nullable=False,
+        postgresql_using='price::text',
+    )
@@ -0,0 +1,54 @@
+"""Add weighted products.search_vector with a GIN index
+
+Revision ID: 3f9a6d0b7e12
+Revises: 8e41b7c2d3f6
+Create Date: 2026-10-18 14:05:52.190377
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9a6d0b7e12'
+down_revision = '8e41b7c2d3f6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        'products',
+        sa.Column(
+            'search_vector',
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('english', title), 'A') || "
+                "setweight(to_tsvector('english', description), 'B')",
+                persisted=True,
+            ),
+            nullable=True,
+        ),
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_products_search_vector',
+            'products',
+            ['search_vector'],
+            unique=False,
+            postgresql_using='gin',
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_products_search_vector',
+            table_name='products',
+            postgresql_concurrently=True,
+        )
+
+    op.drop_column('products', 'search_vector')
@@ -0,0 +1,34 @@
+"""Add outbox_messages
+
+Revision ID: a71c4e95b0d8
+Revises: 3f9a6d0b7e12
+Create Date: 2026-10-18 16:20:09.441862
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a71c4e95b0d8'
+down_revision = '3f9a6d0b7e12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('outbox_messages',
+    sa.Column('id', sa.BigInteger(), sa.Identity(always=False), nullable=False),
+    sa.Column('topic', sa.String(), nullable=False),
+    sa.Column('key', sa.LargeBinary(), nullable=True),
+    sa.Column('value', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('sent_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_outbox_messages_unsent', 'outbox_messages', ['id'], unique=False, postgresql_where=sa.text('sent_at IS NULL'))
+
+
+def downgrade() -> None:
+    op.drop_index('ix_outbox_messages_unsent', table_name='outbox_messages', postgresql_where=sa.text('sent_at IS NULL'))
+    op.drop_table('outbox_messages')
@@ -0,0 +1,25 @@
+"""Add outbox_messages.headers
+
+Revision ID: 6d2b8f41c9e7
+Revises: a71c4e95b0d8
+Create Date: 2026-10-18 20:30:52.118407
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '6d2b8f41c9e7'
+down_revision = 'a71c4e95b0d8'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('outbox_messages', sa.Column('headers', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'{}'::jsonb"), nullable=False))
+
+
+def downgrade() -> None:
+    op.drop_column('outbox_messages', 'headers')
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from sqlalchemy import TIMESTAMP, BigInteger, Identity, Index, LargeBinary, text
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy.sql import func
+
+from infrastructure.models.common.base import Base
+
+
+class OutboxMessageModel(Base):
+    __table_args__ = (
+        # Relays only ever look for unsent rows, oldest first.
+        Index(
+            "ix_outbox_messages_unsent",
+            "id",
+            postgresql_where=text("sent_at IS NULL"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, Identity(), primary_key=True)
+    topic: Mapped[str] = mapped_column(nullable=False)
+    key: Mapped[bytes | None] = mapped_column(LargeBinary, default=None)
+    value: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    # Text header values by name, such as the `traceparent` of the request.
+    headers: Mapped[dict[str, str]] = mapped_column(
+        JSONB, nullable=False, server_default=text("'{}'::jsonb")
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), server_default=func.now()
+    )
+    sent_at: Mapped[datetime | None] = mapped_column(
+        TIMESTAMP(timezone=True), default=None
+    )
@@ -1,19 +1,33 @@
 from datetime import datetime
+from decimal import Decimal
 from typing import Any, ClassVar
 
-from sqlalchemy import ARRAY, TIMESTAMP, String
+from sqlalchemy import TIMESTAMP, Computed, Index, Numeric, String
+from sqlalchemy.dialects.postgresql import ARRAY, TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
 from infrastructure.models.common.base import Base, BaseIDMixin
 
 
+PRODUCT_SEARCH_CONFIG = "english"
+
+
 class ProductModel(Base, BaseIDMixin):
     __mapper_args__: ClassVar[dict[Any, Any]] = {"eager_defaults": True}
+    __table_args__ = (
+        # `@>` and `&&` on the arrays are only indexable through GIN.
+        Index("ix_products_categories", "categories", postgresql_using="gin"),
+        Index("ix_products_tags", "tags", postgresql_using="gin"),
+        Index("ix_products_vendor", "vendor"),
+        Index("ix_products_price", "price"),
+        Index("ix_products_created_at_oid", "created_at", "oid"),
+        Index("ix_products_search_vector", "search_vector", postgresql_using="gin"),
+    )
 
     title: Mapped[str] = mapped_column(nullable=False)
     description: Mapped[str] = mapped_column(nullable=False)
-    price: Mapped[str] = mapped_column(nullable=False)
+    price: Mapped[Decimal] = mapped_column(Numeric(12, 2), nullable=False)
     quantity: Mapped[int] = mapped_column(nullable=False)
     vendor: Mapped[str] = mapped_column(nullable=False)
 
@@ -36,5 +50,16 @@ class ProductModel(Base, BaseIDMixin):
         TIMESTAMP(timezone=True), default=None
     )
 
+    # Title matches rank above description matches.
+    search_vector: Mapped[str] = mapped_column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{PRODUCT_SEARCH_CONFIG}', title), 'A') || "
+            f"setweight(to_tsvector('{PRODUCT_SEARCH_CONFIG}', description), 'B')",
+            persisted=True,
+        ),
+        deferred=True,
+    )
+
     def __str__(self):
         return self.title
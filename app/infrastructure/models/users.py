@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Any, ClassVar
 
-from sqlalchemy import TIMESTAMP, Null, text
+from sqlalchemy import TIMESTAMP, Index, Null, text
 from sqlalchemy.orm import Mapped, mapped_column
 from sqlalchemy.sql import func
 
@@ -10,6 +10,10 @@ from infrastructure.models.common.base import Base, BaseIDMixin
 
 class UserModel(Base, BaseIDMixin):
     __mapper_args__: ClassVar[dict[Any, Any]] = {"eager_defaults": True}
+    __table_args__ = (
+        # Keyset pagination walks users in (created_at, oid) order.
+        Index("ix_users_created_at_oid", "created_at", "oid"),
+    )
 
     username: Mapped[str] = mapped_column(nullable=False, unique=True)
     phone: Mapped[str] = mapped_column(nullable=False, unique=True)
@@ -0,0 +1,72 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Mapping, Sequence
+from dataclasses import dataclass, field
+from typing import Generic, TypeVar
+
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass
+class BatchLoader(Generic[K, V]):
+    """Merges the single-key loads of one event loop tick into batched loads.
+
+    Keys requested before the loop gets back to its scheduled callbacks share
+    one `load_many` call, and a key that is already queued or in flight is
+    not loaded again: its callers wait on the same future and get the same
+    object, so values must be treated as read-only.
+    """
+
+    load_many: Callable[[Sequence[K]], Awaitable[Mapping[K, V]]]
+    max_batch_size: int = 500
+    _queued: dict[K, asyncio.Future] = field(default_factory=dict, init=False)
+    _in_flight: dict[K, asyncio.Future] = field(default_factory=dict, init=False)
+    _tasks: set[asyncio.Task] = field(default_factory=set, init=False, repr=False)
+
+    async def load(self, key: K) -> V | None:
+        future = self._in_flight.get(key) or self._queued.get(key)
+        if future is None:
+            future = self._enqueue(key)
+
+        # One caller giving up must not cancel the load for the others.
+        return await asyncio.shield(future)
+
+    def _enqueue(self, key: K) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        if not self._queued:
+            loop.call_soon(self._dispatch)
+
+        future = self._queued[key] = loop.create_future()
+        return future
+
+    def _dispatch(self) -> None:
+        queued, self._queued = self._queued, {}
+        self._in_flight.update(queued)
+
+        keys = list(queued)
+        for start in range(0, len(keys), self.max_batch_size):
+            batch_keys = keys[start : start + self.max_batch_size]
+            batch = {key: queued[key] for key in batch_keys}
+            task = asyncio.create_task(self._load_batch(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _load_batch(self, batch: dict[K, asyncio.Future]) -> None:
+        try:
+            values = await self.load_many(list(batch))
+        except asyncio.CancelledError:
+            for future in batch.values():
+                future.cancel()
+            raise
+        except Exception as error:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(error)
+        else:
+            for key, future in batch.items():
+                if not future.done():
+                    future.set_result(values.get(key))
+        finally:
+            for key in batch:
+                self._in_flight.pop(key, None)
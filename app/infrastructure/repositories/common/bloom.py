@@ -0,0 +1,40 @@
+import math
+from dataclasses import dataclass, field
+from hashlib import blake2b
+
+
+@dataclass
+class BloomFilter:
+    """Set membership with false positives but no false negatives."""
+
+    capacity: int
+    error_rate: float = 0.01
+    size: int = field(init=False)
+    hash_count: int = field(init=False)
+    _bits: bytearray = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        capacity = max(self.capacity, 1)
+        self.size = max(
+            math.ceil(-capacity * math.log(self.error_rate) / math.log(2) ** 2), 8
+        )
+        self.hash_count = max(round(self.size / capacity * math.log(2)), 1)
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def add(self, item: str) -> None:
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, item: str) -> bool:
+        return all(
+            self._bits[position >> 3] & (1 << (position & 7))
+            for position in self._positions(item)
+        )
+
+    def _positions(self, item: str) -> list[int]:
+        # Double hashing: k positions derived from two 64-bit halves of one digest.
+        digest = blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+
+        return [(first + i * second) % self.size for i in range(self.hash_count)]
@@ -1,14 +1,36 @@
+from contextvars import ContextVar
+
 from sqlalchemy import MetaData
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 
+from infrastructure.metrics.registry import metrics_registry
 from infrastructure.repositories.common.db_convention import DB_NAMING_CONVENTION
+from infrastructure.repositories.common.pool import (
+    InstrumentedAsyncAdaptedQueuePool,
+    register_pool_metrics,
+)
+from infrastructure.repositories.common.query_observer import QueryObserver
 from settings.settings import settings
 
 
 metadata = MetaData(naming_convention=DB_NAMING_CONVENTION)
 
 
-async_engine = create_async_engine(settings.DB_URL, echo=True)
+async_engine = create_async_engine(
+    settings.DB_URL,
+    echo=settings.DB_ECHO,
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    poolclass=InstrumentedAsyncAdaptedQueuePool,
+)
+register_pool_metrics(metrics_registry, async_engine)
+query_observer = QueryObserver(
+    async_engine,
+    slow_threshold=settings.DB_SLOW_QUERY_SECONDS,
+    explain=settings.DB_SLOW_QUERY_EXPLAIN,
+    max_fingerprints=settings.DB_QUERY_STATS_MAX_FINGERPRINTS,
+)
+query_observer.install()
 test_async_engine = create_async_engine(settings.TEST_DB_URL)
 
 
@@ -21,3 +43,8 @@ test_session = async_sessionmaker(
     test_async_engine,
     expire_on_commit=False,
 )
+
+# Session of the unit of work running in the current task, if any.
+current_session: ContextVar[AsyncSession | None] = ContextVar(
+    "current_session", default=None
+)
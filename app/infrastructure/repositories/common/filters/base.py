@@ -1,8 +1,16 @@
 from abc import ABC
 from dataclasses import dataclass
+from enum import Enum
 
 
-@dataclass
+class CountMode(str, Enum):
+    EXACT = "exact"
+    WINDOW = "window"
+    ESTIMATED = "estimated"
+    NONE = "none"
+
+
+@dataclass(frozen=True)
 class BaseGetAllFilters(ABC):
     limit: int
     offset: int
@@ -0,0 +1,37 @@
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as BinasciiError
+from dataclasses import dataclass, field
+from typing import Any, Generic, TypeVar
+
+import orjson
+
+from infrastructure.exceptions.base import InvalidCursorException
+from infrastructure.repositories.common.filters.base import CountMode
+
+
+IT = TypeVar("IT")
+
+
+@dataclass
+class Page(Generic[IT]):
+    items: list[IT] = field(default_factory=list)
+    count: int | None = 0
+    count_mode: CountMode = CountMode.EXACT
+    has_more: bool = False
+    next_cursor: str | None = None
+
+
+def encode_cursor(*values: Any) -> str:
+    return urlsafe_b64encode(orjson.dumps(values)).decode()
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    try:
+        values = orjson.loads(urlsafe_b64decode(cursor.encode()))
+    except (BinasciiError, ValueError):
+        raise InvalidCursorException(cursor)
+
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursorException(cursor)
+
+    return values
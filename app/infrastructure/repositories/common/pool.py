@@ -0,0 +1,37 @@
+from time import perf_counter
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from infrastructure.metrics.base import MetricsRegistry
+from infrastructure.metrics.registry import DB_POOL_WAIT
+
+
+class InstrumentedAsyncAdaptedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long each checkout waited."""
+
+    def _do_get(self):
+        started_at = perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_WAIT.observe(perf_counter() - started_at)
+
+
+def register_pool_metrics(registry: MetricsRegistry, engine: AsyncEngine) -> None:
+    # Read through the engine, `dispose()` swaps the pool for a new one.
+    registry.gauge(
+        "db_pool_size",
+        "Connections the pool keeps open.",
+        lambda: engine.pool.size(),
+    )
+    registry.gauge(
+        "db_pool_checked_out_connections",
+        "Connections currently in use.",
+        lambda: engine.pool.checkedout(),
+    )
+    registry.gauge(
+        "db_pool_overflow_connections",
+        "Connections open beyond the pool size; negative while it fills up.",
+        lambda: engine.pool.overflow(),
+    )
@@ -0,0 +1,186 @@
+import asyncio
+import hashlib
+import logging
+import re
+from dataclasses import asdict, dataclass, field
+from enum import Enum
+from functools import lru_cache
+from heapq import nlargest
+from time import perf_counter
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+
+logger = logging.getLogger(__name__)
+
+STARTED_AT_KEY = "query_observer_started_at"
+EXPLAINABLE_PREFIXES = ("select", "with", "insert", "update", "delete")
+MAX_LOGGED_STATEMENT_LENGTH = 2000
+
+PARAMETERS = re.compile(r"\$\d+|%\(\w+\)s|%s")
+LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+PARAMETER_LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=4096)
+def fingerprint_statement(statement: str) -> tuple[str, str]:
+    """Normalized text of a statement and a short id for it.
+
+    Parameters and literals become `?` and value lists collapse to one, so
+    `IN ($1, $2)` and `IN ($1, $2, $3)` share a fingerprint.
+    """
+    normalized = WHITESPACE.sub(" ", statement).strip()
+    normalized = PARAMETERS.sub("?", normalized)
+    normalized = LITERALS.sub("?", normalized)
+    normalized = PARAMETER_LISTS.sub("(?)", normalized)
+
+    digest = hashlib.blake2b(normalized.encode("utf-8"), digest_size=8)
+    return digest.hexdigest(), normalized
+
+
+class QueryStatsOrder(str, Enum):
+    TOTAL = "total"
+    MEAN = "mean"
+    MAX = "max"
+    CALLS = "calls"
+
+
+@dataclass
+class QueryStats:
+    fingerprint: str
+    statement: str
+    calls: int = 0
+    slow_calls: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    plan: str | None = None
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.calls if self.calls else 0.0
+
+    def as_dict(self) -> dict:
+        return {**asdict(self), "mean_seconds": self.mean_seconds}
+
+
+ORDER_KEYS = {
+    QueryStatsOrder.TOTAL: lambda stats: stats.total_seconds,
+    QueryStatsOrder.MEAN: lambda stats: stats.mean_seconds,
+    QueryStatsOrder.MAX: lambda stats: stats.max_seconds,
+    QueryStatsOrder.CALLS: lambda stats: stats.calls,
+}
+
+
+@dataclass(eq=False)
+class QueryObserver:
+    """Times every statement the engine runs, grouped by fingerprint.
+
+    Statements slower than `slow_threshold` are logged. With `explain` on,
+    a slow statement that is the slowest seen for its fingerprint also gets
+    its plan logged, fetched with a plain `EXPLAIN` on another connection
+    so nothing runs twice. At most `max_fingerprints` are tracked; a new
+    one pushes out the cheapest by total time.
+    """
+
+    engine: AsyncEngine
+    slow_threshold: float = 0.2
+    explain: bool = False
+    max_fingerprints: int = 1000
+    stats: dict[str, QueryStats] = field(default_factory=dict, init=False)
+
+    _explain_tasks: set[asyncio.Task] = field(
+        default_factory=set, init=False, repr=False
+    )
+
+    def install(self) -> None:
+        sync_engine = self.engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._before_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_execute)
+
+    def remove(self) -> None:
+        sync_engine = self.engine.sync_engine
+        event.remove(sync_engine, "before_cursor_execute", self._before_execute)
+        event.remove(sync_engine, "after_cursor_execute", self._after_execute)
+
+    def top(
+        self, limit: int = 20, order_by: QueryStatsOrder = QueryStatsOrder.TOTAL
+    ) -> list[QueryStats]:
+        return nlargest(limit, self.stats.values(), key=ORDER_KEYS[order_by])
+
+    def reset(self) -> None:
+        self.stats.clear()
+
+    def _before_execute(
+        self, connection, cursor, statement, parameters, context, executemany
+    ) -> None:
+        # Overwritten on the next statement if this one fails.
+        connection.info[STARTED_AT_KEY] = perf_counter()
+
+    def _after_execute(
+        self, connection, cursor, statement, parameters, context, executemany
+    ) -> None:
+        duration = perf_counter() - connection.info.pop(STARTED_AT_KEY)
+        self.observe(statement, duration, None if executemany else parameters)
+
+    def observe(self, statement: str, duration: float, parameters=None) -> None:
+        fingerprint, normalized = fingerprint_statement(statement)
+
+        stats = self.stats.get(fingerprint)
+        if stats is None:
+            stats = self._track(fingerprint, normalized)
+
+        is_slowest = duration > stats.max_seconds
+        stats.calls += 1
+        stats.total_seconds += duration
+        stats.max_seconds = max(stats.max_seconds, duration)
+
+        if duration < self.slow_threshold:
+            return
+
+        stats.slow_calls += 1
+        logger.warning(
+            "Slow query %.1f ms [%s]: %s",
+            duration * 1000,
+            fingerprint,
+            statement[:MAX_LOGGED_STATEMENT_LENGTH],
+        )
+
+        if self.explain and is_slowest and parameters is not None:
+            self._explain_later(stats, statement, parameters)
+
+    def _track(self, fingerprint: str, normalized: str) -> QueryStats:
+        if len(self.stats) >= self.max_fingerprints:
+            cheapest = min(self.stats.values(), key=ORDER_KEYS[QueryStatsOrder.TOTAL])
+            del self.stats[cheapest.fingerprint]
+
+        stats = self.stats[fingerprint] = QueryStats(fingerprint, normalized)
+        return stats
+
+    def _explain_later(self, stats: QueryStats, statement: str, parameters) -> None:
+        if not statement.lstrip().lower().startswith(EXPLAINABLE_PREFIXES):
+            return
+
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+
+        task = loop.create_task(self._explain(stats, statement, parameters))
+        self._explain_tasks.add(task)
+        task.add_done_callback(self._explain_tasks.discard)
+
+    async def _explain(self, stats: QueryStats, statement: str, parameters) -> None:
+        try:
+            async with self.engine.connect() as connection:
+                result = await connection.exec_driver_sql(
+                    f"EXPLAIN {statement}", parameters
+                )
+                plan = "\n".join(row[0] for row in result)
+        except Exception:
+            logger.exception("Could not explain slow query [%s]", stats.fingerprint)
+            return
+
+        stats.plan = plan
+        logger.warning("Plan of slow query [%s]:\n%s", stats.fingerprint, plan)
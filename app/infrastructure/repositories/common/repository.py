@@ -1,9 +1,16 @@
 from abc import ABC
-from typing import Callable
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Callable
 
+import orjson
+from sqlalchemy import Select, text
 from sqlalchemy.ext.asyncio import AsyncSession
 from infrastructure.models.common.base import Base
-from infrastructure.repositories.common.database import async_session, test_session
+from infrastructure.repositories.common.database import (
+    async_session,
+    current_session,
+    test_session,
+)
 from settings.settings import Settings
 
 
@@ -16,9 +23,51 @@ class ISqlalchemyRepository(ABC):
         if test_mode:
             self._session_factory = test_session
 
-    def get_session(self) -> AsyncSession:
-        return self._session_factory()
+    @asynccontextmanager
+    async def get_session(self) -> AsyncIterator[AsyncSession]:
+        """Join the current unit of work or run in a transaction of its own."""
+        session = current_session.get()
+        if session is not None:
+            yield session
+            return
+
+        async with self._session_factory() as session, session.begin():
+            yield session
 
     @property
     def model_fields(self):
         return self._model.__table__.columns
+
+    async def _estimate_table_rows(self, session: AsyncSession) -> int | None:
+        """Planner row estimate for the whole table, None if never analyzed."""
+        result = await session.execute(
+            text(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = CAST(:table_name AS regclass)"
+            ),
+            {"table_name": self._model.__tablename__},
+        )
+        estimate = result.scalar()
+
+        return estimate if estimate is not None and estimate >= 0 else None
+
+    async def _estimate_query_rows(
+        self, session: AsyncSession, query: Select
+    ) -> int | None:
+        """Planner row estimate for a filtered query taken from EXPLAIN."""
+        compiled_query = query.compile(
+            dialect=session.get_bind().dialect,
+            compile_kwargs={"literal_binds": True},
+        )
+        connection = await session.connection()
+        result = await connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {compiled_query}"
+        )
+        plan = result.scalar()
+        if isinstance(plan, str):
+            plan = orjson.loads(plan)
+
+        try:
+            return int(plan[0]["Plan"]["Plan Rows"])
+        except (IndexError, KeyError, TypeError):
+            return None
@@ -0,0 +1,35 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+
+from infrastructure.unit_of_work.base import IUnitOfWork
+
+
+@dataclass
+class DatabaseWarmUp:
+    """Opens pooled connections ahead of traffic and primes their statements.
+
+    asyncpg prepares statements per connection, so every connection runs each
+    primer once. All of them are held until the last one is primed, otherwise
+    the pool would hand the same few connections back out.
+    """
+
+    unit_of_work: IUnitOfWork
+    primers: Sequence[Callable[[], Awaitable[None]]]
+    connections: int
+
+    async def run(self) -> None:
+        if self.connections <= 0:
+            return
+
+        primed = asyncio.Barrier(self.connections)
+        async with asyncio.TaskGroup() as task_group:
+            for _ in range(self.connections):
+                task_group.create_task(self._warm_up_connection(primed))
+
+    async def _warm_up_connection(self, primed: asyncio.Barrier) -> None:
+        async with self.unit_of_work.begin():
+            for prime in self.primers:
+                await prime()
+
+            await primed.wait()
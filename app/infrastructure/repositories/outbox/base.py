@@ -0,0 +1,32 @@
+from abc import ABC, abstractmethod
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+
+from infrastructure.message_brokers.base import BrokerMessage
+
+
+@dataclass(frozen=True)
+class OutboxMessage:
+    id: int
+    message: BrokerMessage
+
+
+class IOutboxRepository(ABC):
+    @abstractmethod
+    async def add_messages(self, messages: Iterable[BrokerMessage]) -> None:
+        """Store messages in the unit of work of the change they announce."""
+
+    @abstractmethod
+    async def claim_unsent(self, limit: int) -> list[OutboxMessage]:
+        """Oldest unsent messages no other relay holds, locked for this unit of work.
+
+        Messages of one key are only ever held by one relay at a time, so
+        relays running side by side keep them in order.
+        """
+
+    @abstractmethod
+    async def mark_sent(self, ids: Iterable[int]) -> None: ...
+
+    @abstractmethod
+    async def purge_sent(self, sent_before: datetime) -> int: ...
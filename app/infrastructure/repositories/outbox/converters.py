@@ -0,0 +1,6 @@
+def convert_headers_to_json(headers: tuple[tuple[str, bytes], ...]) -> dict[str, str]:
+    return {name: value.decode("utf-8") for name, value in headers}
+
+
+def convert_json_to_headers(headers: dict[str, str]) -> tuple[tuple[str, bytes], ...]:
+    return tuple((name, value.encode("utf-8")) for name, value in headers.items())
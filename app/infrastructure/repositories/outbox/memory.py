@@ -0,0 +1,41 @@
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from itertools import count
+
+from infrastructure.message_brokers.base import BrokerMessage
+from infrastructure.repositories.outbox.base import IOutboxRepository, OutboxMessage
+
+
+@dataclass
+class InMemoryOutboxRepository(IOutboxRepository):
+    _unsent: dict[int, BrokerMessage] = field(default_factory=dict, kw_only=True)
+    _sent_at: dict[int, datetime] = field(default_factory=dict, kw_only=True)
+    _ids: count = field(default_factory=lambda: count(1), kw_only=True)
+
+    async def add_messages(self, messages: Iterable[BrokerMessage]) -> None:
+        for message in messages:
+            self._unsent[next(self._ids)] = message
+
+    async def claim_unsent(self, limit: int) -> list[OutboxMessage]:
+        return [
+            OutboxMessage(id=message_id, message=message)
+            for message_id, message in list(self._unsent.items())[:limit]
+        ]
+
+    async def mark_sent(self, ids: Iterable[int]) -> None:
+        sent_at = datetime.now(UTC)
+        for message_id in ids:
+            if self._unsent.pop(message_id, None) is not None:
+                self._sent_at[message_id] = sent_at
+
+    async def purge_sent(self, sent_before: datetime) -> int:
+        purged = [
+            message_id
+            for message_id, sent_at in self._sent_at.items()
+            if sent_at < sent_before
+        ]
+        for message_id in purged:
+            del self._sent_at[message_id]
+
+        return len(purged)
@@ -0,0 +1,152 @@
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import (
+    BigInteger,
+    Integer,
+    any_,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+
+from infrastructure.exception_mapper import exception_mapper
+from infrastructure.message_brokers.base import BrokerMessage
+from infrastructure.models.outbox import OutboxMessageModel
+from infrastructure.repositories.common.repository import ISqlalchemyRepository
+from infrastructure.repositories.outbox.base import IOutboxRepository, OutboxMessage
+from infrastructure.repositories.outbox.converters import (
+    convert_headers_to_json,
+    convert_json_to_headers,
+)
+
+
+# First key of the advisory locks relays hold on key partitions.
+OUTBOX_PARTITION_LOCK_SPACE = 0x6F757462
+
+
+@dataclass(frozen=True)
+class SqlAlchemyOutboxRepository(IOutboxRepository, ISqlalchemyRepository):
+    """Outbox rows, with message keys hashed into `key_partitions` partitions.
+
+    Every relay must use the same number of partitions, or two of them may
+    hold the messages of one key at once. A claim takes up to
+    `partitions_per_claim` of them, so about `key_partitions` divided by it
+    relays can work at once.
+    """
+
+    key_partitions: int = 16
+    partitions_per_claim: int = 4
+    _model: type[OutboxMessageModel] = OutboxMessageModel
+
+    @exception_mapper
+    async def add_messages(self, messages: Iterable[BrokerMessage]) -> None:
+        values = [
+            {
+                "topic": message.topic,
+                "key": message.key,
+                "value": message.value,
+                "headers": convert_headers_to_json(message.headers),
+            }
+            for message in messages
+        ]
+        if not values:
+            return
+
+        async with self.get_session() as session:
+            await session.execute(insert(self._model), values)
+
+    @exception_mapper
+    async def claim_unsent(self, limit: int) -> list[OutboxMessage]:
+        # A relay first locks a few key partitions with unsent messages, held
+        # until its transaction ends, and then claims rows of those only, so
+        # messages of one key never leave two relays at once and the other
+        # partitions stay free for other relays. FOR UPDATE rechecks rows a
+        # relay sent between the snapshot and the lock.
+        key = func.coalesce(func.encode(self._model.key, "hex"), "")
+        key_hash = cast(func.hashtext(key), BigInteger)
+        partition = cast(func.abs(key_hash) % self.key_partitions, Integer)
+
+        pending = (
+            select(partition.label("partition"))
+            .where(self._model.sent_at.is_(None))
+            .order_by(self._model.id)
+            .limit(limit)
+            .subquery()
+        )
+        # Random order spreads relays over the partitions. Materialized, so the
+        # lock is not pushed below the sort and is only tried on partitions
+        # until enough are locked.
+        candidates = (
+            select(pending.c.partition)
+            .group_by(pending.c.partition)
+            .order_by(func.random())
+            .cte("candidates")
+            .prefix_with("MATERIALIZED")
+        )
+        async with self.get_session() as session:
+            locked = await session.scalars(
+                select(candidates.c.partition)
+                .where(
+                    func.pg_try_advisory_xact_lock(
+                        OUTBOX_PARTITION_LOCK_SPACE, candidates.c.partition
+                    )
+                )
+                .limit(self.partitions_per_claim)
+            )
+            partitions = list(locked)
+            if not partitions:
+                return []
+
+            result = await session.execute(
+                select(
+                    self._model.id,
+                    self._model.topic,
+                    self._model.key,
+                    self._model.value,
+                    self._model.headers,
+                )
+                .where(
+                    self._model.sent_at.is_(None),
+                    partition == any_(literal(partitions, ARRAY(Integer))),
+                )
+                .order_by(self._model.id)
+                .limit(limit)
+                .with_for_update()
+            )
+
+            return [
+                OutboxMessage(
+                    id=row.id,
+                    message=BrokerMessage(
+                        topic=row.topic,
+                        key=row.key,
+                        value=row.value,
+                        headers=convert_json_to_headers(row.headers),
+                    ),
+                )
+                for row in result
+            ]
+
+    @exception_mapper
+    async def mark_sent(self, ids: Iterable[int]) -> None:
+        async with self.get_session() as session:
+            await session.execute(
+                update(self._model)
+                .where(self._model.id == any_(literal(list(ids), ARRAY(BigInteger))))
+                .values(sent_at=func.now())
+            )
+
+    @exception_mapper
+    async def purge_sent(self, sent_before: datetime) -> int:
+        async with self.get_session() as session:
+            result = await session.execute(
+                delete(self._model).where(self._model.sent_at < sent_before)
+            )
+            return result.rowcount
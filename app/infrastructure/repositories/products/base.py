@@ -1,8 +1,11 @@
 from abc import ABC, abstractmethod
-from typing import Iterable
 
 from domain.entities.products import ProductEntity
-from infrastructure.repositories.products.filters.products import GetProductsFilters
+from infrastructure.repositories.common.pagination import Page
+from infrastructure.repositories.products.filters.products import (
+    GetProductsFilters,
+    SearchProductsFilters,
+)
 
 
 class IProductRepository(ABC):
@@ -16,12 +19,16 @@ class IProductRepository(ABC):
     async def get_by_title(self, title: str) -> ProductEntity | None: ...
 
     @abstractmethod
-    async def get_all(
-        self, filters: GetProductsFilters
-    ) -> tuple[Iterable[ProductEntity], int]: ...
+    async def get_all(self, filters: GetProductsFilters) -> Page[ProductEntity]: ...
+
+    @abstractmethod
+    async def search(self, filters: SearchProductsFilters) -> Page[ProductEntity]: ...
 
     @abstractmethod
     async def update(self, product: ProductEntity) -> ProductEntity: ...
 
     @abstractmethod
     async def delete(self, oid: str) -> ProductEntity | None: ...
+
+    async def warm_up(self) -> None:
+        """Run the hot read queries once so the current connection prepares them."""
@@ -0,0 +1,160 @@
+from collections.abc import Callable
+from datetime import datetime
+from decimal import Decimal
+from typing import Any
+
+from domain.entities.products import ProductEntity
+from domain.values.products import (
+    ProductCategory,
+    ProductDescription,
+    ProductImage,
+    ProductPrice,
+    ProductQuantity,
+    ProductStorageInstructions,
+    ProductTag,
+    ProductTitle,
+    ProductVendor,
+    ProductWarrantyPeriod,
+)
+from infrastructure.exceptions.base import InvalidCursorException
+from infrastructure.models.products import ProductModel
+from infrastructure.repositories.common.filters.base import CountMode
+from infrastructure.repositories.common.pagination import (
+    Page,
+    decode_cursor,
+    encode_cursor,
+)
+
+
+PRODUCT_COLUMN_GETTERS: dict[str, Callable[[ProductEntity], Any]] = {
+    "title": lambda product: product.title.as_generic_type(),
+    "description": lambda product: product.description.as_generic_type(),
+    "price": lambda product: Decimal(product.price.as_generic_type()),
+    "quantity": lambda product: product.quantity.as_generic_type(),
+    "vendor": lambda product: product.vendor.as_generic_type(),
+    "images": lambda product: [image.as_generic_type() for image in product.images],
+    "categories": lambda product: [
+        category.as_generic_type() for category in product.categories
+    ],
+    "tags": lambda product: [tag.as_generic_type() for tag in product.tags],
+    "warranty_period": lambda product: product.warranty_period.as_generic_type()
+    if product.warranty_period
+    else None,
+    "storage_instructions": lambda product: [
+        instruction.as_generic_type() for instruction in product.storage_instructions
+    ],
+    "is_deleted": lambda product: product.is_deleted,
+    "deleted_at": lambda product: product.deleted_at,
+}
+
+
+def convert_product_entity_to_values(product: ProductEntity) -> dict[str, Any]:
+    values = {
+        field_name: get_column_value(product)
+        for field_name, get_column_value in PRODUCT_COLUMN_GETTERS.items()
+    }
+    values.update(
+        oid=product.oid,
+        created_at=product.created_at,
+        updated_at=product.updated_at,
+    )
+
+    return values
+
+
+def convert_product_entity_to_changes(product: ProductEntity) -> dict[str, Any]:
+    """Column values of the fields changed since the product was loaded."""
+    return {
+        field_name: PRODUCT_COLUMN_GETTERS[field_name](product)
+        for field_name in product.dirty_fields
+    }
+
+
+def convert_product_model_to_entity(product: ProductModel) -> ProductEntity:
+    # Rows were validated on write, so the value objects skip it on read.
+    return ProductEntity(
+        oid=product.oid,
+        title=ProductTitle.from_trusted(product.title),
+        description=ProductDescription.from_trusted(product.description),
+        price=ProductPrice.from_trusted(str(product.price)),
+        quantity=ProductQuantity.from_trusted(product.quantity),
+        vendor=ProductVendor.from_trusted(product.vendor),
+        images=[ProductImage.from_trusted(image) for image in product.images],
+        categories=[
+            ProductCategory.from_trusted(category) for category in product.categories
+        ],
+        tags=[ProductTag.from_trusted(tag) for tag in product.tags],
+        warranty_period=ProductWarrantyPeriod.from_trusted(product.warranty_period)
+        if product.warranty_period
+        else None,
+        storage_instructions=[
+            ProductStorageInstructions.from_trusted(instruction)
+            for instruction in product.storage_instructions
+        ],
+        is_deleted=product.is_deleted,
+        created_at=product.created_at,
+        updated_at=product.updated_at,
+        deleted_at=product.deleted_at,
+    )
+
+
+def convert_product_entity_to_cursor(product: ProductEntity) -> str:
+    return encode_cursor(product.created_at.isoformat(), product.oid)
+
+
+def convert_cursor_to_product_keyset(cursor: str) -> tuple[datetime, str]:
+    created_at, oid = decode_cursor(cursor, size=2)
+
+    try:
+        return datetime.fromisoformat(created_at), str(oid)
+    except (TypeError, ValueError):
+        raise InvalidCursorException(cursor)
+
+
+def convert_products_to_page(
+    products: list[ProductEntity], count: int, limit: int
+) -> Page[ProductEntity]:
+    """Trim the look-ahead row fetched past `limit` into a next page cursor."""
+    next_cursor = None
+    has_more = len(products) > limit
+    if has_more:
+        products = products[:limit]
+        # A zero limit leaves no row to continue after.
+        if products:
+            next_cursor = convert_product_entity_to_cursor(products[-1])
+
+    return Page(
+        items=products,
+        count=count,
+        has_more=has_more,
+        next_cursor=next_cursor,
+    )
+
+
+def convert_cursor_to_search_keyset(cursor: str) -> tuple[float, str]:
+    rank, oid = decode_cursor(cursor, size=2)
+
+    if not isinstance(rank, int | float) or not isinstance(oid, str):
+        raise InvalidCursorException(cursor)
+
+    return float(rank), oid
+
+
+def convert_search_results_to_page(
+    results: list[tuple[ProductModel, float]], limit: int
+) -> Page[ProductEntity]:
+    """Ranked look-ahead rows to a page; the cursor carries the last (rank, oid)."""
+    next_cursor = None
+    has_more = len(results) > limit
+    if has_more:
+        results = results[:limit]
+        last_product, last_rank = results[-1]
+        next_cursor = encode_cursor(last_rank, last_product.oid)
+
+    return Page(
+        items=[convert_product_model_to_entity(product) for product, _ in results],
+        count=None,
+        count_mode=CountMode.NONE,
+        has_more=has_more,
+        next_cursor=next_cursor,
+    )
@@ -1,9 +1,32 @@
 from dataclasses import dataclass
+from decimal import Decimal
+from enum import Enum
 
 from infrastructure.repositories.common.filters.base import BaseGetAllFilters
 
 
-@dataclass
+class ArrayMatch(str, Enum):
+    ALL = "all"
+    ANY = "any"
+
+
+@dataclass(frozen=True)
 class GetProductsFilters(BaseGetAllFilters):
     limit: int = 10
     offset: int = 0
+    cursor: str | None = None
+    show_deleted: bool = False
+    categories: tuple[str, ...] = ()
+    categories_match: ArrayMatch = ArrayMatch.ALL
+    tags: tuple[str, ...] = ()
+    tags_match: ArrayMatch = ArrayMatch.ALL
+    vendor: str | None = None
+    min_price: Decimal | None = None
+    max_price: Decimal | None = None
+
+
+@dataclass(frozen=True)
+class SearchProductsFilters:
+    query: str
+    limit: int = 10
+    cursor: str | None = None
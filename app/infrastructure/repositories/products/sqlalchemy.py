@@ -0,0 +1,234 @@
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+from sqlalchemy import (
+    Float,
+    Select,
+    String,
+    Update,
+    func,
+    literal,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, insert
+
+from domain.entities.products import ProductEntity
+from infrastructure.exception_mapper import exception_mapper
+from infrastructure.exceptions.base import UniqueFieldViolationException
+from infrastructure.models.products import PRODUCT_SEARCH_CONFIG, ProductModel
+from infrastructure.repositories.common.pagination import Page
+from infrastructure.repositories.common.repository import ISqlalchemyRepository
+from infrastructure.repositories.products.base import IProductRepository
+from infrastructure.repositories.products.converters import (
+    convert_cursor_to_product_keyset,
+    convert_cursor_to_search_keyset,
+    convert_product_entity_to_changes,
+    convert_product_entity_to_values,
+    convert_product_model_to_entity,
+    convert_products_to_page,
+    convert_search_results_to_page,
+)
+from infrastructure.repositories.products.filters.products import (
+    ArrayMatch,
+    GetProductsFilters,
+    SearchProductsFilters,
+)
+
+
+@dataclass(frozen=True)
+class SqlAlchemyProductRepository(IProductRepository, ISqlalchemyRepository):
+    _model: type[ProductModel] = ProductModel
+
+    @exception_mapper
+    async def add(self, product: ProductEntity) -> None:
+        async with self.get_session() as session:
+            result = await session.execute(
+                insert(self._model)
+                .values(**convert_product_entity_to_values(product))
+                .on_conflict_do_nothing()
+                .returning(self._model.oid)
+            )
+
+            if result.scalar() is None:
+                raise UniqueFieldViolationException(field_name="oid", value=product.oid)
+
+        product.clear_dirty_fields()
+
+    @exception_mapper
+    async def get_by_oid(self, oid: str) -> ProductEntity | None:
+        async with self.get_session() as session:
+            result = await session.execute(select(self._model).filter_by(oid=oid))
+            product = result.scalars().first()
+
+            if product:
+                return convert_product_model_to_entity(product)
+
+    @exception_mapper
+    async def get_by_title(self, title: str) -> ProductEntity | None:
+        async with self.get_session() as session:
+            result = await session.execute(select(self._model).filter_by(title=title))
+            product = result.scalars().first()
+
+            if product:
+                return convert_product_model_to_entity(product)
+
+    @exception_mapper
+    async def get_all(self, filters: GetProductsFilters) -> Page[ProductEntity]:
+        async with self.get_session() as session:
+            get_products_result = await session.execute(
+                self._build_get_products_query(filters)
+            )
+            products = [
+                convert_product_model_to_entity(product)
+                for product in get_products_result.scalars().all()
+            ]
+            count_result = await session.execute(
+                self._build_count_products_query(filters)
+            )
+
+            return convert_products_to_page(
+                products, count_result.scalar(), limit=filters.limit
+            )
+
+    def _build_get_products_query(self, filters: GetProductsFilters) -> Select:
+        query = self._apply_filters(select(self._model), filters)
+        # One extra row tells whether there is a next page without counting.
+        query = query.order_by(self._model.created_at, self._model.oid).limit(
+            filters.limit + 1
+        )
+
+        if filters.cursor is None:
+            return query.offset(filters.offset)
+
+        created_at, oid = convert_cursor_to_product_keyset(filters.cursor)
+        return query.where(
+            tuple_(self._model.created_at, self._model.oid)
+            > tuple_(
+                literal(created_at, self._model.created_at.type),
+                literal(oid, self._model.oid.type),
+            )
+        )
+
+    def _build_count_products_query(self, filters: GetProductsFilters) -> Select:
+        query = select(func.count()).select_from(self._model)
+        query = self._apply_filters(query, filters)
+
+        return query
+
+    def _apply_filters(self, query: Select, filters: GetProductsFilters) -> Select:
+        if not filters.show_deleted:
+            query = query.where(self._model.is_deleted.is_(False))
+
+        if filters.categories:
+            query = query.where(
+                self._build_array_match(
+                    self._model.categories,
+                    filters.categories,
+                    filters.categories_match,
+                )
+            )
+        if filters.tags:
+            query = query.where(
+                self._build_array_match(
+                    self._model.tags, filters.tags, filters.tags_match
+                )
+            )
+
+        if filters.vendor is not None:
+            query = query.where(self._model.vendor == filters.vendor)
+        if filters.min_price is not None:
+            query = query.where(self._model.price >= filters.min_price)
+        if filters.max_price is not None:
+            query = query.where(self._model.price <= filters.max_price)
+
+        return query
+
+    @staticmethod
+    def _build_array_match(column, values: tuple[str, ...], match: ArrayMatch):
+        """`@>` for every value or `&&` for any of them, both served by GIN."""
+        values = literal(list(values), ARRAY(String))
+
+        if match == ArrayMatch.ANY:
+            return column.overlap(values)
+
+        return column.contains(values)
+
+    @exception_mapper
+    async def search(self, filters: SearchProductsFilters) -> Page[ProductEntity]:
+        async with self.get_session() as session:
+            result = await session.execute(self._build_search_products_query(filters))
+
+            return convert_search_results_to_page(
+                [tuple(row) for row in result.all()], limit=filters.limit
+            )
+
+    def _build_search_products_query(self, filters: SearchProductsFilters) -> Select:
+        ts_query = func.websearch_to_tsquery(PRODUCT_SEARCH_CONFIG, filters.query)
+        rank = func.ts_rank(self._model.search_vector, ts_query).cast(Float)
+
+        query = (
+            select(self._model, rank.label("rank"))
+            .where(
+                self._model.search_vector.bool_op("@@")(ts_query),
+                self._model.is_deleted.is_(False),
+            )
+            .order_by(rank.desc(), self._model.oid.desc())
+            .limit(filters.limit + 1)
+        )
+
+        if filters.cursor is None:
+            return query
+
+        last_rank, last_oid = convert_cursor_to_search_keyset(filters.cursor)
+        return query.where(
+            tuple_(rank, self._model.oid)
+            < tuple_(literal(last_rank, Float), literal(last_oid, String))
+        )
+
+    @exception_mapper
+    async def update(self, product: ProductEntity) -> ProductEntity:
+        changes = convert_product_entity_to_changes(product)
+        if not changes:
+            return product
+
+        async with self.get_session() as session:
+            result = await session.execute(
+                self._build_update_product_query(product.oid, changes)
+            )
+            product_model = result.scalars().first()
+
+        product.clear_dirty_fields()
+        if product_model:
+            return convert_product_model_to_entity(product_model)
+
+        return product
+
+    @exception_mapper
+    async def delete(self, oid: str) -> ProductEntity | None:
+        async with self.get_session() as session:
+            result = await session.execute(
+                self._build_update_product_query(
+                    oid, {"is_deleted": True, "deleted_at": datetime.now(UTC)}
+                )
+            )
+            product = result.scalars().first()
+
+            if product:
+                return convert_product_model_to_entity(product)
+
+    async def warm_up(self) -> None:
+        await self.get_by_oid("")
+        await self.get_by_title("")
+        await self.get_all(GetProductsFilters())
+
+    def _build_update_product_query(self, oid: str, changes: dict) -> Update:
+        """Single `UPDATE ... RETURNING` writing only the changed columns."""
+        return (
+            update(self._model)
+            .where(self._model.oid == oid)
+            .values(**changes)
+            .returning(self._model)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
@@ -0,0 +1,84 @@
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+from asyncpg import Connection
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from domain.entities.users import UserEntity
+from infrastructure.exception_mapper import exception_mapper
+from infrastructure.models.users import UserModel
+from infrastructure.repositories.common.database import async_engine, current_session
+from infrastructure.repositories.users.converters import convert_user_record_to_entity
+from infrastructure.repositories.users.sqlalchemy import SqlAlchemyUserRepository
+
+
+USERS_TABLE = UserModel.__tablename__
+USER_COLUMNS = ", ".join(column.name for column in UserModel.__table__.columns)
+
+GET_USER_BY_OID = f"SELECT {USER_COLUMNS} FROM {USERS_TABLE} WHERE oid = $1"
+GET_USERS_BY_OIDS = (
+    f"SELECT {USER_COLUMNS} FROM {USERS_TABLE} WHERE oid = ANY($1::varchar[])"
+)
+GET_USER_BY_USERNAME = f"SELECT {USER_COLUMNS} FROM {USERS_TABLE} WHERE username = $1"
+CHECK_USERNAME_EXISTS = (
+    f"SELECT EXISTS (SELECT 1 FROM {USERS_TABLE} WHERE username = $1)"
+)
+
+
+@dataclass(frozen=True)
+class AsyncpgUserRepository(SqlAlchemyUserRepository):
+    """Lookups by key straight on asyncpg, everything else through the ORM.
+
+    The statements are constant texts, so asyncpg's per-connection statement
+    cache prepares each one once under its own name and then only binds and
+    executes it. Connections come from the engine pool and join the current
+    unit of work like the ORM queries do.
+    """
+
+    _engine: AsyncEngine = async_engine
+
+    @asynccontextmanager
+    async def _get_driver_connection(self) -> AsyncIterator[Connection]:
+        session = current_session.get()
+        if session is not None:
+            yield await self._to_driver_connection(await session.connection())
+            return
+
+        # Outside a unit of work a pooled connection is enough: a session and
+        # its transaction would double the cost of a one-statement read.
+        async with self._engine.connect() as connection:
+            yield await self._to_driver_connection(connection)
+
+    @staticmethod
+    async def _to_driver_connection(connection: AsyncConnection) -> Connection:
+        raw_connection = await connection.get_raw_connection()
+        return raw_connection.driver_connection
+
+    @exception_mapper
+    async def get_by_oid(self, oid: str) -> UserEntity | None:
+        async with self._get_driver_connection() as connection:
+            user = await connection.fetchrow(GET_USER_BY_OID, oid)
+
+        if user is not None:
+            return convert_user_record_to_entity(user)
+
+    @exception_mapper
+    async def get_by_oids(self, oids: Iterable[str]) -> dict[str, UserEntity]:
+        async with self._get_driver_connection() as connection:
+            users = await connection.fetch(GET_USERS_BY_OIDS, list(oids))
+
+        return {user["oid"]: convert_user_record_to_entity(user) for user in users}
+
+    @exception_mapper
+    async def get_by_username(self, username: str) -> UserEntity | None:
+        async with self._get_driver_connection() as connection:
+            user = await connection.fetchrow(GET_USER_BY_USERNAME, username)
+
+        if user is not None:
+            return convert_user_record_to_entity(user)
+
+    @exception_mapper
+    async def check_username_exists(self, username: str) -> bool:
+        async with self._get_driver_connection() as connection:
+            return await connection.fetchval(CHECK_USERNAME_EXISTS, username)
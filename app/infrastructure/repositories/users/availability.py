@@ -0,0 +1,82 @@
+import asyncio
+import logging
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from infrastructure.repositories.common.bloom import BloomFilter
+from infrastructure.repositories.users.base import IUserRepository
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class UsernameAvailability:
+    """Answers "is this username taken?" without loading every username.
+
+    A per-process Bloom filter of taken usernames answers negatives in memory,
+    anything it reports as possibly taken is confirmed with an indexed lookup.
+    Between reloads the filter only sees usernames taken through this process,
+    so the unique constraint on `users.username` stays the final arbiter.
+    """
+
+    user_repository: IUserRepository
+    expected_usernames: int = 100_000
+    error_rate: float = 0.01
+    _filter: BloomFilter | None = field(default=None, init=False, repr=False)
+    _loading_filter: BloomFilter | None = field(default=None, init=False, repr=False)
+    _loaded_count: int = field(default=0, init=False)
+    _lock: asyncio.Lock = field(default_factory=asyncio.Lock, init=False, repr=False)
+
+    @property
+    def is_loaded(self) -> bool:
+        return self._filter is not None
+
+    async def load(self) -> None:
+        async with self._lock:
+            loading_filter = BloomFilter(
+                capacity=max(self.expected_usernames, 2 * self._loaded_count),
+                error_rate=self.error_rate,
+            )
+            # Usernames taken while the table is streamed land in both filters.
+            self._loading_filter = loading_filter
+            loaded_count = 0
+            try:
+                async for username in self.user_repository.iter_usernames():
+                    loading_filter.add(username)
+                    loaded_count += 1
+            finally:
+                self._loading_filter = None
+
+            self._filter = loading_filter
+            self._loaded_count = loaded_count
+
+    async def refresh_periodically(self, interval: float) -> None:
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.load()
+            except Exception:
+                logger.exception("Could not reload the username filter")
+
+    def add(self, username: str) -> None:
+        for bloom_filter in (self._filter, self._loading_filter):
+            if bloom_filter is not None:
+                bloom_filter.add(username)
+
+    async def is_taken(self, username: str) -> bool:
+        if self._filter is not None and username not in self._filter:
+            return False
+
+        return await self.user_repository.check_username_exists(username)
+
+    async def get_taken(self, usernames: Iterable[str]) -> set[str]:
+        candidates = [
+            username
+            for username in usernames
+            if self._filter is None or username in self._filter
+        ]
+        if not candidates:
+            return set()
+
+        return await self.user_repository.get_existing_usernames(candidates)
@@ -1,8 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import Iterable
+from collections.abc import AsyncIterator, Iterable
 
 from domain.entities.users import UserEntity
-from domain.values.users import Username
+from infrastructure.repositories.common.pagination import Page
 from infrastructure.repositories.users.filters.users import GetUsersFilters
 
 
@@ -13,11 +13,21 @@ class IUserRepository(ABC):
     @abstractmethod
     async def get_by_oid(self, oid: str) -> UserEntity | None: ...
 
+    @abstractmethod
+    async def get_by_oids(self, oids: Iterable[str]) -> dict[str, UserEntity]:
+        """Users found among `oids`, keyed by oid; unknown oids are left out."""
+
     @abstractmethod
     async def get_by_username(self, username: str) -> UserEntity | None: ...
 
     @abstractmethod
-    async def get_existing_usernames(self) -> list[Username]: ...
+    async def check_username_exists(self, username: str) -> bool: ...
+
+    @abstractmethod
+    async def get_existing_usernames(self, usernames: Iterable[str]) -> set[str]: ...
+
+    @abstractmethod
+    def iter_usernames(self, batch_size: int = 10_000) -> AsyncIterator[str]: ...
 
     @abstractmethod
     async def check_user_exists_by_phone_and_username(
@@ -25,9 +35,7 @@ class IUserRepository(ABC):
     ) -> bool: ...
 
     @abstractmethod
-    async def get_all(
-        self, filters: GetUsersFilters
-    ) -> tuple[Iterable[UserEntity], int]: ...
+    async def get_all(self, filters: GetUsersFilters) -> Page[UserEntity]: ...
 
     @abstractmethod
     async def restore(self, user: UserEntity) -> None: ...
@@ -37,3 +45,6 @@ class IUserRepository(ABC):
 
     @abstractmethod
     async def delete(self, oid: str) -> UserEntity | None: ...
+
+    async def warm_up(self) -> None:
+        """Run the hot read queries once so the current connection prepares them."""
@@ -0,0 +1,76 @@
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
+
+from domain.entities.users import UserEntity
+from infrastructure.repositories.common.batch_loader import BatchLoader
+from infrastructure.repositories.common.pagination import Page
+from infrastructure.repositories.users.base import IUserRepository
+from infrastructure.repositories.users.filters.users import GetUsersFilters
+from infrastructure.unit_of_work.base import IUnitOfWork
+
+
+@dataclass
+class CoalescingUserRepository(IUserRepository):
+    """Serves concurrent `get_by_oid` calls with one `get_by_oids` query.
+
+    Only lookups made outside a unit of work are coalesced. Inside one the
+    read has to see the transaction's own writes and hand back an entity the
+    command can change, so it goes straight to the wrapped repository.
+    """
+
+    user_repository: IUserRepository
+    unit_of_work: IUnitOfWork
+    max_batch_size: int = 500
+    _loader: BatchLoader[str, UserEntity] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self._loader = BatchLoader(
+            load_many=self.user_repository.get_by_oids,
+            max_batch_size=self.max_batch_size,
+        )
+
+    async def get_by_oid(self, oid: str) -> UserEntity | None:
+        if self.unit_of_work.is_active:
+            return await self.user_repository.get_by_oid(oid)
+
+        return await self._loader.load(oid)
+
+    async def get_by_oids(self, oids: Iterable[str]) -> dict[str, UserEntity]:
+        return await self.user_repository.get_by_oids(oids)
+
+    async def add(self, user: UserEntity) -> None:
+        await self.user_repository.add(user)
+
+    async def get_by_username(self, username: str) -> UserEntity | None:
+        return await self.user_repository.get_by_username(username)
+
+    async def check_username_exists(self, username: str) -> bool:
+        return await self.user_repository.check_username_exists(username)
+
+    async def get_existing_usernames(self, usernames: Iterable[str]) -> set[str]:
+        return await self.user_repository.get_existing_usernames(usernames)
+
+    def iter_usernames(self, batch_size: int = 10_000) -> AsyncIterator[str]:
+        return self.user_repository.iter_usernames(batch_size)
+
+    async def check_user_exists_by_phone_and_username(
+        self, phone: str, username: str
+    ) -> bool:
+        return await self.user_repository.check_user_exists_by_phone_and_username(
+            phone, username
+        )
+
+    async def get_all(self, filters: GetUsersFilters) -> Page[UserEntity]:
+        return await self.user_repository.get_all(filters)
+
+    async def restore(self, user: UserEntity) -> None:
+        await self.user_repository.restore(user)
+
+    async def update(self, user: UserEntity) -> UserEntity:
+        return await self.user_repository.update(user)
+
+    async def delete(self, oid: str) -> UserEntity | None:
+        return await self.user_repository.delete(oid)
+
+    async def warm_up(self) -> None:
+        await self.user_repository.warm_up()
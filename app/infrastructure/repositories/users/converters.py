@@ -1,6 +1,17 @@
+from collections.abc import Callable, Mapping
+from datetime import datetime
+from typing import Any
+
 from domain.entities.users import UserEntity
 from domain.values.users import Password, Phone, Username
+from infrastructure.exceptions.base import InvalidCursorException
 from infrastructure.models.users import UserModel
+from infrastructure.repositories.common.filters.base import CountMode
+from infrastructure.repositories.common.pagination import (
+    Page,
+    decode_cursor,
+    encode_cursor,
+)
 
 
 def convert_user_entity_to_model(user: UserEntity) -> UserModel:
@@ -16,14 +27,102 @@ def convert_user_entity_to_model(user: UserEntity) -> UserModel:
     )
 
 
+def convert_datetime_to_naive(value: datetime | None) -> datetime | None:
+    """`users.deleted_at` is a timestamp without time zone, stored in local time."""
+    if value is None or value.tzinfo is None:
+        return value
+
+    return value.astimezone().replace(tzinfo=None)
+
+
+USER_COLUMN_GETTERS: dict[str, Callable[[UserEntity], Any]] = {
+    "phone": lambda user: user.phone.as_generic_type(),
+    "username": lambda user: user.username.as_generic_type(),
+    "password": lambda user: user.password.as_generic_type(),
+    "is_verified": lambda user: user.is_verified,
+    "is_deleted": lambda user: user.is_deleted,
+    "deleted_at": lambda user: convert_datetime_to_naive(user.deleted_at),
+}
+
+
+def convert_user_entity_to_values(user: UserEntity) -> dict[str, Any]:
+    values = {
+        field_name: get_column_value(user)
+        for field_name, get_column_value in USER_COLUMN_GETTERS.items()
+    }
+    values.update(oid=user.oid, created_at=user.created_at)
+
+    return values
+
+
+def convert_user_entity_to_changes(user: UserEntity) -> dict[str, Any]:
+    """Column values of the fields changed since the user was loaded."""
+    return {
+        field_name: USER_COLUMN_GETTERS[field_name](user)
+        for field_name in user.dirty_fields
+    }
+
+
 def convert_user_model_to_entity(user: UserModel) -> UserEntity:
+    # Rows were validated on write, so the value objects skip it on read.
     return UserEntity(
         oid=user.oid,
-        phone=Phone(value=user.phone),
-        username=Username(value=user.username),
-        password=Password(value=user.password, is_hashed=True),
+        phone=Phone.from_trusted(user.phone),
+        username=Username.from_trusted(user.username),
+        password=Password.from_trusted(user.password, is_hashed=True),
         created_at=user.created_at,
         deleted_at=user.deleted_at,
         is_deleted=user.is_deleted,
         is_verified=user.is_verified,
     )
+
+
+def convert_user_record_to_entity(user: Mapping[str, Any]) -> UserEntity:
+    """A raw driver row, e.g. an asyncpg `Record`, to an entity."""
+    return UserEntity(
+        oid=user["oid"],
+        phone=Phone.from_trusted(user["phone"]),
+        username=Username.from_trusted(user["username"]),
+        password=Password.from_trusted(user["password"], is_hashed=True),
+        created_at=user["created_at"],
+        deleted_at=user["deleted_at"],
+        is_deleted=user["is_deleted"],
+        is_verified=user["is_verified"],
+    )
+
+
+def convert_user_entity_to_cursor(user: UserEntity) -> str:
+    return encode_cursor(user.created_at.isoformat(), user.oid)
+
+
+def convert_cursor_to_user_keyset(cursor: str) -> tuple[datetime, str]:
+    created_at, oid = decode_cursor(cursor, size=2)
+
+    try:
+        return datetime.fromisoformat(created_at), str(oid)
+    except (TypeError, ValueError):
+        raise InvalidCursorException(cursor)
+
+
+def convert_users_to_page(
+    users: list[UserEntity],
+    count: int | None,
+    limit: int,
+    count_mode: CountMode = CountMode.EXACT,
+) -> Page[UserEntity]:
+    """Trim the look-ahead row fetched past `limit` into a next page cursor."""
+    next_cursor = None
+    has_more = len(users) > limit
+    if has_more:
+        users = users[:limit]
+        # A zero limit leaves no row to continue after.
+        if users:
+            next_cursor = convert_user_entity_to_cursor(users[-1])
+
+    return Page(
+        items=users,
+        count=count,
+        count_mode=count_mode,
+        has_more=has_more,
+        next_cursor=next_cursor,
+    )
@@ -1,10 +1,15 @@
 from dataclasses import dataclass
 
-from infrastructure.repositories.common.filters.base import BaseGetAllFilters
+from infrastructure.repositories.common.filters.base import (
+    BaseGetAllFilters,
+    CountMode,
+)
 
 
-@dataclass
+@dataclass(frozen=True)
 class GetUsersFilters(BaseGetAllFilters):
     limit: int = 10
     offset: int = 0
+    cursor: str | None = None
     show_deleted: bool = False
+    count_mode: CountMode = CountMode.EXACT
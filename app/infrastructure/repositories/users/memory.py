@@ -1,56 +1,189 @@
-from dataclasses import dataclass, field
-from typing import Iterable
+from bisect import bisect_left, bisect_right, insort
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field, replace
+from datetime import datetime
+
 from domain.entities.users import UserEntity
-from domain.values.users import Username
+from infrastructure.exceptions.base import UniqueFieldViolationException
+from infrastructure.repositories.common.filters.base import CountMode
+from infrastructure.repositories.common.pagination import Page
 from infrastructure.repositories.users.base import IUserRepository
+from infrastructure.repositories.users.converters import (
+    convert_cursor_to_user_keyset,
+    convert_users_to_page,
+)
 from infrastructure.repositories.users.filters.users import GetUsersFilters
 
 
+UserKey = tuple[datetime, str]
+
+
 @dataclass
 class InMemoryUserRepository(IUserRepository):
-    _saved_users: list[UserEntity] = field(default_factory=list, kw_only=True)
+    """Users kept in process memory with hash and ordered indexes.
+
+    Lookups by oid, username and phone are dict hits and listings bisect a
+    (created_at, oid) ordered index, so the repository can stand in for the
+    database in load tests. Entities are copied in and out, so like with a
+    database a change is only stored once `update` accepted it.
+    """
+
+    _users_by_oid: dict[str, UserEntity] = field(default_factory=dict, kw_only=True)
+    _oids_by_username: dict[str, str] = field(default_factory=dict, kw_only=True)
+    _oids_by_phone: dict[str, str] = field(default_factory=dict, kw_only=True)
+    # Username, phone and deletion state each oid is currently indexed under.
+    _indexed_values: dict[str, tuple[str, str, bool]] = field(
+        default_factory=dict, kw_only=True
+    )
+    _ordered_keys: list[UserKey] = field(default_factory=list, kw_only=True)
+    _ordered_active_keys: list[UserKey] = field(default_factory=list, kw_only=True)
 
     async def add(self, user: UserEntity) -> None:
-        self._saved_users.append(user)
+        username = user.username.as_generic_type()
+        phone = user.phone.as_generic_type()
+        self._validate_unique(user.oid, username, phone)
+
+        if user.oid in self._users_by_oid:
+            raise UniqueFieldViolationException(field_name="oid", value=user.oid)
+
+        self._users_by_oid[user.oid] = self._copy(user)
+        self._oids_by_username[username] = user.oid
+        self._oids_by_phone[phone] = user.oid
+        self._indexed_values[user.oid] = (username, phone, user.is_deleted)
+
+        insort(self._ordered_keys, self._get_key(user))
+        if not user.is_deleted:
+            insort(self._ordered_active_keys, self._get_key(user))
+
+        user.clear_dirty_fields()
 
     async def get_by_oid(self, oid: str) -> UserEntity | None:
-        for user in self._saved_users:
-            if user.oid == oid:
-                return user
+        user = self._users_by_oid.get(oid)
+        return self._copy(user) if user is not None else None
+
+    async def get_by_oids(self, oids: Iterable[str]) -> dict[str, UserEntity]:
+        return {
+            oid: self._copy(self._users_by_oid[oid])
+            for oid in oids
+            if oid in self._users_by_oid
+        }
 
     async def get_by_username(self, username: str) -> UserEntity | None:
-        for user in self._saved_users:
-            if user.username == username:
-                return user
+        oid = self._oids_by_username.get(username)
+        if oid is not None:
+            return self._copy(self._users_by_oid[oid])
+
+    async def check_username_exists(self, username: str) -> bool:
+        return username in self._oids_by_username
+
+    async def get_existing_usernames(self, usernames: Iterable[str]) -> set[str]:
+        return {
+            username for username in usernames if username in self._oids_by_username
+        }
 
-    async def get_existing_usernames(self) -> list[Username]:
-        return [user.username for user in self._saved_users]
+    async def iter_usernames(self, batch_size: int = 10_000) -> AsyncIterator[str]:
+        for username in list(self._oids_by_username):
+            yield username
 
     async def check_user_exists_by_phone_and_username(
         self, phone: str, username: str
     ) -> bool:
-        return any(
-            user.phone == phone or user.username == username
-            for user in self._saved_users
+        return phone in self._oids_by_phone or username in self._oids_by_username
+
+    async def get_all(self, filters: GetUsersFilters) -> Page[UserEntity]:
+        ordered_keys = (
+            self._ordered_keys if filters.show_deleted else self._ordered_active_keys
         )
 
-    async def get_all(
-        self, filters: GetUsersFilters
-    ) -> tuple[Iterable[UserEntity], int]:
-        total_count = len(self._saved_users)
-        limited_users = self._saved_users[
-            filters.offset : filters.offset + filters.limit
+        if filters.cursor is None:
+            start = filters.offset
+        else:
+            start = bisect_right(
+                ordered_keys, convert_cursor_to_user_keyset(filters.cursor)
+            )
+
+        limited_users = [
+            self._copy(self._users_by_oid[oid])
+            for _, oid in ordered_keys[start : start + filters.limit + 1]
         ]
-        return limited_users, total_count
+
+        if filters.count_mode == CountMode.NONE:
+            return convert_users_to_page(
+                limited_users, None, limit=filters.limit, count_mode=CountMode.NONE
+            )
+
+        return convert_users_to_page(
+            limited_users, len(ordered_keys), limit=filters.limit
+        )
 
     async def update(self, user: UserEntity) -> UserEntity:
-        for i, u in enumerate(self._saved_users):
-            if u.oid == user.oid:
-                self._saved_users[i] = user
-                return user
+        if user.oid not in self._users_by_oid:
+            return user
+
+        self._reindex(user)
+        user.clear_dirty_fields()
+
+        return user
+
+    async def restore(self, user: UserEntity) -> None:
+        if user.oid not in self._users_by_oid:
+            return
+
+        user.is_deleted = False
+        user.deleted_at = None
+        self._reindex(user)
+        user.clear_dirty_fields()
 
     async def delete(self, oid: str) -> UserEntity | None:
-        for user in self._saved_users:
-            if user.oid == oid:
-                self._saved_users.remove(user)
-                return user
+        stored_user = self._users_by_oid.get(oid)
+        if stored_user is None:
+            return None
+
+        user = replace(
+            self._copy(stored_user),
+            is_deleted=True,
+            deleted_at=stored_user.deleted_at or datetime.now(),
+        )
+        self._reindex(user)
+
+        return user
+
+    def _reindex(self, user: UserEntity) -> None:
+        """Store the new state of a user; nothing changes if it is not unique."""
+        old_username, old_phone, was_deleted = self._indexed_values[user.oid]
+        username = user.username.as_generic_type()
+        phone = user.phone.as_generic_type()
+        self._validate_unique(user.oid, username, phone)
+
+        if username != old_username:
+            del self._oids_by_username[old_username]
+            self._oids_by_username[username] = user.oid
+        if phone != old_phone:
+            del self._oids_by_phone[old_phone]
+            self._oids_by_phone[phone] = user.oid
+
+        if user.is_deleted and not was_deleted:
+            key = self._get_key(user)
+            position = bisect_left(self._ordered_active_keys, key)
+            if self._ordered_active_keys[position : position + 1] == [key]:
+                del self._ordered_active_keys[position]
+        elif was_deleted and not user.is_deleted:
+            insort(self._ordered_active_keys, self._get_key(user))
+
+        self._users_by_oid[user.oid] = self._copy(user)
+        self._indexed_values[user.oid] = (username, phone, user.is_deleted)
+
+    def _validate_unique(self, oid: str, username: str, phone: str) -> None:
+        if self._oids_by_phone.get(phone, oid) != oid:
+            raise UniqueFieldViolationException(field_name="phone", value=phone)
+        if self._oids_by_username.get(username, oid) != oid:
+            raise UniqueFieldViolationException(field_name="username", value=username)
+
+    @staticmethod
+    def _copy(user: UserEntity) -> UserEntity:
+        # Value objects are replaced rather than changed, so sharing them is safe.
+        return replace(user, _events=[], _dirty_fields=set())
+
+    @staticmethod
+    def _get_key(user: UserEntity) -> UserKey:
+        return user.created_at, user.oid
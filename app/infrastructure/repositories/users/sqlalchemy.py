@@ -1,19 +1,41 @@
+from collections.abc import AsyncIterator, Iterable
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Iterable
 
-from sqlalchemy import Select, func, or_, select
+from sqlalchemy import (
+    ARRAY,
+    Select,
+    String,
+    Update,
+    any_,
+    exists,
+    func,
+    literal,
+    or_,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 
 from domain.entities.users import UserEntity
 from infrastructure.exception_mapper import exception_mapper
+from infrastructure.exceptions.base import UniqueFieldViolationException
 from infrastructure.models.users import UserModel
+from infrastructure.repositories.common.filters.base import CountMode
+from infrastructure.repositories.common.pagination import Page
 from infrastructure.repositories.common.repository import ISqlalchemyRepository
 from infrastructure.repositories.users.base import (
     IUserRepository,
 )
 from infrastructure.repositories.users.converters import (
-    convert_user_entity_to_model,
+    convert_cursor_to_user_keyset,
+    convert_user_entity_to_changes,
+    convert_user_entity_to_values,
     convert_user_model_to_entity,
+    convert_users_to_page,
 )
 from infrastructure.repositories.users.filters.users import GetUsersFilters
 
@@ -24,10 +46,39 @@ class SqlAlchemyUserRepository(IUserRepository, ISqlalchemyRepository):
 
     @exception_mapper
     async def add(self, user: UserEntity) -> None:
-        user_model = convert_user_entity_to_model(user)
         async with self.get_session() as session:
-            session.add(user_model)
-            await session.commit()
+            result = await session.execute(
+                insert(self._model)
+                .values(**convert_user_entity_to_values(user))
+                .on_conflict_do_nothing()
+                .returning(self._model.oid)
+            )
+
+            if result.scalar() is None:
+                raise await self._find_unique_violation(session, user)
+
+        user.clear_dirty_fields()
+
+    async def _find_unique_violation(
+        self, session: AsyncSession, user: UserEntity
+    ) -> UniqueFieldViolationException:
+        """Tell which unique column made `ON CONFLICT DO NOTHING` skip the row."""
+        phone = user.phone.as_generic_type()
+        username = user.username.as_generic_type()
+
+        result = await session.execute(
+            select(self._model.phone == phone, self._model.username == username)
+            .where(or_(self._model.phone == phone, self._model.username == username))
+            .limit(1)
+        )
+        phone_taken, username_taken = result.first() or (False, False)
+
+        if phone_taken:
+            return UniqueFieldViolationException(field_name="phone", value=phone)
+        if username_taken:
+            return UniqueFieldViolationException(field_name="username", value=username)
+
+        return UniqueFieldViolationException(field_name="oid", value=user.oid)
 
     @exception_mapper
     async def get_by_oid(self, oid: str) -> UserEntity | None:
@@ -38,6 +89,19 @@ class SqlAlchemyUserRepository(IUserRepository, ISqlalchemyRepository):
             if user:
                 return convert_user_model_to_entity(user)
 
+    @exception_mapper
+    async def get_by_oids(self, oids: Iterable[str]) -> dict[str, UserEntity]:
+        async with self.get_session() as session:
+            result = await session.scalars(
+                select(self._model).where(
+                    self._model.oid == any_(literal(list(oids), ARRAY(String)))
+                )
+            )
+
+            return {
+                user.oid: convert_user_model_to_entity(user) for user in result.all()
+            }
+
     @exception_mapper
     async def get_by_username(self, username: str) -> UserEntity | None:
         async with self.get_session() as session:
@@ -50,27 +114,106 @@ class SqlAlchemyUserRepository(IUserRepository, ISqlalchemyRepository):
                 return convert_user_model_to_entity(user)
 
     @exception_mapper
-    async def get_all(
-        self, filters: GetUsersFilters
-    ) -> tuple[Iterable[UserEntity], int]:
+    async def get_all(self, filters: GetUsersFilters) -> Page[UserEntity]:
         async with self.get_session() as session:
-            get_users_query = self._build_get_users_query(filters)
-            count_users_query = self._build_count_users_query(filters)
+            if filters.count_mode == CountMode.WINDOW:
+                return await self._get_all_with_window_count(session, filters)
+
+            get_users_result = await session.execute(
+                self._build_get_users_query(filters)
+            )
+            users = [
+                convert_user_model_to_entity(user)
+                for user in get_users_result.scalars().all()
+            ]
+            count, count_mode = await self._count_users(session, filters)
+
+            return convert_users_to_page(
+                users, count, limit=filters.limit, count_mode=count_mode
+            )
+
+    async def _get_all_with_window_count(
+        self, session: AsyncSession, filters: GetUsersFilters
+    ) -> Page[UserEntity]:
+        rows = (
+            await session.execute(
+                self._build_get_users_with_window_count_query(filters)
+            )
+        ).all()
+        users = [convert_user_model_to_entity(user) for user, _ in rows]
+
+        if rows:
+            count = rows[0].total_count
+        elif filters.offset or filters.cursor:
+            # Past the last page the window has no row to report the total on.
+            count = await self._count_users_exactly(session, filters)
+        else:
+            count = 0
 
-            get_users_result = await session.execute(get_users_query)
-            count_result = await session.execute(count_users_query)
+        return convert_users_to_page(
+            users, count, limit=filters.limit, count_mode=CountMode.WINDOW
+        )
 
-            count = count_result.scalar()
-            users = get_users_result.scalars().all()
+    async def _count_users(
+        self, session: AsyncSession, filters: GetUsersFilters
+    ) -> tuple[int | None, CountMode]:
+        if filters.count_mode == CountMode.NONE:
+            return None, CountMode.NONE
+
+        if filters.count_mode == CountMode.ESTIMATED:
+            if filters.show_deleted:
+                estimate = await self._estimate_table_rows(session)
+            else:
+                estimate = await self._estimate_query_rows(
+                    session, self._apply_filters(select(self._model.oid), filters)
+                )
 
-            users = [convert_user_model_to_entity(user) for user in users]
-            return users, count
+            if estimate is not None:
+                return estimate, CountMode.ESTIMATED
+
+        return await self._count_users_exactly(session, filters), CountMode.EXACT
+
+    async def _count_users_exactly(
+        self, session: AsyncSession, filters: GetUsersFilters
+    ) -> int:
+        count_result = await session.execute(self._build_count_users_query(filters))
+        return count_result.scalar()
 
     def _build_get_users_query(self, filters: GetUsersFilters) -> Select:
-        query = select(self._model).limit(filters.limit).offset(filters.offset)
-        query = self._apply_filters(query, filters)
+        query = self._apply_filters(select(self._model), filters)
+        return self._apply_pagination(query, self._model, filters)
 
-        return query
+    def _build_get_users_with_window_count_query(
+        self, filters: GetUsersFilters
+    ) -> Select:
+        # The window runs before the keyset predicate so the total is not cut
+        # down to the rows left after the cursor.
+        counted_users = self._apply_filters(
+            select(self._model, func.count().over().label("total_count")), filters
+        ).subquery()
+        user = aliased(self._model, counted_users)
+
+        query = select(user, counted_users.c.total_count)
+        return self._apply_pagination(query, user, filters)
+
+    @staticmethod
+    def _apply_pagination(
+        query: Select, model: type[UserModel], filters: GetUsersFilters
+    ) -> Select:
+        # One extra row tells whether there is a next page without counting.
+        query = query.order_by(model.created_at, model.oid).limit(filters.limit + 1)
+
+        if filters.cursor is None:
+            return query.offset(filters.offset)
+
+        created_at, oid = convert_cursor_to_user_keyset(filters.cursor)
+        return query.where(
+            tuple_(model.created_at, model.oid)
+            > tuple_(
+                literal(created_at, UserModel.created_at.type),
+                literal(oid, UserModel.oid.type),
+            )
+        )
 
     def _build_count_users_query(self, filters: GetUsersFilters) -> Select:
         query = select(func.count()).select_from(self._model)
@@ -87,13 +230,15 @@ class SqlAlchemyUserRepository(IUserRepository, ISqlalchemyRepository):
     @exception_mapper
     async def delete(self, oid: str) -> UserEntity | None:
         async with self.get_session() as session:
-            result = await session.execute(select(self._model).filter_by(oid=oid))
+            result = await session.execute(
+                self._build_update_user_query(
+                    oid,
+                    {"is_deleted": True, "deleted_at": datetime.now()},
+                )
+            )
             user = result.scalars().first()
-            if user:
-                user.is_deleted = True
-                user.deleted_at = datetime.now().replace(tzinfo=None)
-                await session.commit()
 
+            if user:
                 return convert_user_model_to_entity(user)
 
     @exception_mapper
@@ -110,26 +255,70 @@ class SqlAlchemyUserRepository(IUserRepository, ISqlalchemyRepository):
 
     @exception_mapper
     async def update(self, user: UserEntity) -> UserEntity:
+        changes = convert_user_entity_to_changes(user)
+        if not changes:
+            return user
+
         async with self.get_session() as session:
-            user_model = convert_user_entity_to_model(user)
-            await session.merge(user_model)
-            await session.commit()
+            result = await session.execute(
+                self._build_update_user_query(user.oid, changes)
+            )
+            user_model = result.scalars().first()
 
-            return convert_user_model_to_entity(user_model)
+        user.clear_dirty_fields()
+        return convert_user_model_to_entity(user_model) if user_model else user
 
     @exception_mapper
     async def restore(self, user: UserEntity) -> None:
+        changes = convert_user_entity_to_changes(user)
+        changes.update(is_deleted=False, deleted_at=None)
+
         async with self.get_session() as session:
-            user_model = convert_user_entity_to_model(user)
+            await session.execute(self._build_update_user_query(user.oid, changes))
+
+        user.clear_dirty_fields()
 
-            user_model.is_deleted = False
-            user_model.deleted_at = None
-            await session.merge(user_model)
-            await session.commit()
+    def _build_update_user_query(self, oid: str, changes: dict) -> Update:
+        """Single `UPDATE ... RETURNING` writing only the changed columns."""
+        return (
+            update(self._model)
+            .where(self._model.oid == oid)
+            .values(**changes)
+            .returning(self._model)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+
+    @exception_mapper
+    async def check_username_exists(self, username: str) -> bool:
+        async with self.get_session() as session:
+            result = await session.execute(
+                select(exists().where(self._model.username == username))
+            )
+            return result.scalar()
 
     @exception_mapper
-    async def get_existing_usernames(self) -> list[str]:
+    async def get_existing_usernames(self, usernames: Iterable[str]) -> set[str]:
         async with self.get_session() as session:
-            return await session.scalars(
-                select(self._model.username).where(self._model.username.is_not(None))
+            # `= ANY($1)` keeps one statement text for any number of usernames.
+            result = await session.scalars(
+                select(self._model.username).where(
+                    self._model.username
+                    == any_(literal(list(usernames), ARRAY(String)))
+                )
             )
+            return set(result.all())
+
+    async def iter_usernames(self, batch_size: int = 10_000) -> AsyncIterator[str]:
+        async with self.get_session() as session:
+            result = await session.stream_scalars(
+                select(self._model.username).execution_options(yield_per=batch_size)
+            )
+            async for username in result:
+                yield username
+
+    async def warm_up(self) -> None:
+        await self.get_by_oid("")
+        await self.get_by_username("")
+        await self.check_username_exists("")
+        await self.check_user_exists_by_phone_and_username("", "")
+        await self.get_all(GetUsersFilters())
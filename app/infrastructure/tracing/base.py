@@ -0,0 +1,245 @@
+import logging
+import random
+import re
+import time
+from abc import ABC, abstractmethod
+from contextvars import ContextVar, Token
+from dataclasses import dataclass, field
+from enum import IntEnum
+from types import TracebackType
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+class SpanKind(IntEnum):
+    # Values of the OTLP `Span.SpanKind` enum.
+    INTERNAL = 1
+    SERVER = 2
+    CLIENT = 3
+    PRODUCER = 4
+    CONSUMER = 5
+
+
+class SpanStatus(IntEnum):
+    UNSET = 0
+    OK = 1
+    ERROR = 2
+
+
+def generate_trace_id() -> str:
+    return f"{random.getrandbits(128) or 1:032x}"
+
+
+def generate_span_id() -> str:
+    return f"{random.getrandbits(64) or 1:016x}"
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """What is propagated: ids, the sampling decision and, if sampled, the trace."""
+
+    trace_id: str
+    span_id: str
+    sampled: bool = False
+    trace: "TraceBuffer | None" = field(default=None, compare=False, repr=False)
+
+    def to_traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+    @classmethod
+    def from_traceparent(cls, traceparent: str) -> "SpanContext | None":
+        """Parse a W3C `traceparent` value; anything malformed starts a new trace."""
+        match = TRACEPARENT.match(traceparent.strip().lower())
+        if match is None:
+            return None
+
+        trace_id, span_id, flags = match.groups()
+        return cls(trace_id=trace_id, span_id=span_id, sampled=int(flags, 16) & 1 == 1)
+
+
+# Context of the innermost span of the current task, recorded or not.
+current_span_context: ContextVar[SpanContext | None] = ContextVar(
+    "current_span_context", default=None
+)
+
+
+@dataclass(eq=False)
+class Span:
+    name: str
+    context: SpanContext
+    parent_span_id: str | None = None
+    kind: SpanKind = SpanKind.INTERNAL
+    attributes: dict[str, Any] = field(default_factory=dict)
+    start_time: int = field(default_factory=time.time_ns)
+    end_time: int | None = None
+    status: SpanStatus = SpanStatus.UNSET
+    status_message: str | None = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException) -> None:
+        self.status = SpanStatus.ERROR
+        self.status_message = f"{error.__class__.__name__}: {error}"
+
+    def end(self) -> None:
+        self.end_time = time.time_ns()
+
+
+class ISpanExporter(ABC):
+    @abstractmethod
+    def export(self, spans: list[Span]) -> None:
+        """Hand finished spans over; called from the event loop, so keep it quick."""
+
+
+@dataclass(eq=False)
+class TraceBuffer:
+    """Finished spans of one sampled trace, exported together with the root.
+
+    Spans that end after the root, in tasks the request left behind, are
+    exported on their own.
+    """
+
+    exporter: ISpanExporter
+    spans: list[Span] = field(default_factory=list)
+    is_flushed: bool = False
+
+    def add(self, span: Span) -> None:
+        if self.is_flushed:
+            self._export([span])
+        else:
+            self.spans.append(span)
+
+    def flush(self) -> None:
+        self.is_flushed = True
+        spans, self.spans = self.spans, []
+        self._export(spans)
+
+    def _export(self, spans: list[Span]) -> None:
+        try:
+            self.exporter.export(spans)
+        except Exception:
+            logger.exception("Could not export %s spans", len(spans))
+
+
+class SpanScope:
+    """Makes a span current for a block and ends it on the way out."""
+
+    __slots__ = ("span", "_context", "_is_root", "_token")
+
+    def __init__(self, span: Span | None, context: SpanContext, is_root: bool) -> None:
+        self.span = span
+        self._context = context
+        self._is_root = is_root
+
+    def __enter__(self) -> Span | None:
+        self._token: Token = current_span_context.set(self._context)
+        return self.span
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        current_span_context.reset(self._token)
+        if self.span is None:
+            return
+
+        if isinstance(exc, Exception):
+            self.span.record_error(exc)
+        self.span.end()
+
+        trace = self._context.trace
+        trace.add(self.span)
+        if self._is_root:
+            trace.flush()
+
+
+class NoOpSpanScope:
+    """Stands in for spans outside a sampled trace, leaving the context as is."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, *exc_info) -> None:
+        return None
+
+
+NOOP_SPAN_SCOPE = NoOpSpanScope()
+
+
+@dataclass(eq=False)
+class Tracer:
+    """Starts traces and spans; only sampled traces record anything.
+
+    Unsampled traces still get ids, so they can be passed downstream.
+    """
+
+    exporter: ISpanExporter | None = None
+    sample_rate: float = 0.0
+
+    def start_trace(
+        self,
+        name: str,
+        parent: SpanContext | None = None,
+        kind: SpanKind = SpanKind.SERVER,
+        attributes: dict[str, Any] | None = None,
+    ) -> SpanScope:
+        """Root span of this process, continuing `parent` when it came from a caller."""
+        if parent is None:
+            trace_id = generate_trace_id()
+            sampled = random.random() < self.sample_rate
+        else:
+            trace_id, sampled = parent.trace_id, parent.sampled
+
+        if not sampled or self.exporter is None:
+            context = SpanContext(trace_id=trace_id, span_id=generate_span_id())
+            return SpanScope(None, context, is_root=True)
+
+        context = SpanContext(
+            trace_id=trace_id,
+            span_id=generate_span_id(),
+            sampled=True,
+            trace=TraceBuffer(self.exporter),
+        )
+        span = Span(
+            name=name,
+            context=context,
+            parent_span_id=parent.span_id if parent else None,
+            kind=kind,
+            attributes=dict(attributes) if attributes else {},
+        )
+        return SpanScope(span, context, is_root=True)
+
+    def start_span(
+        self,
+        name: str,
+        kind: SpanKind = SpanKind.INTERNAL,
+        attributes: dict[str, Any] | None = None,
+    ) -> SpanScope | NoOpSpanScope:
+        """Child of the current span; a no-op outside a sampled trace."""
+        parent = current_span_context.get()
+        if parent is None or not parent.sampled:
+            return NOOP_SPAN_SCOPE
+
+        context = SpanContext(
+            trace_id=parent.trace_id,
+            span_id=generate_span_id(),
+            sampled=True,
+            trace=parent.trace,
+        )
+        span = Span(
+            name=name,
+            context=context,
+            parent_span_id=parent.span_id,
+            kind=kind,
+            attributes=dict(attributes) if attributes else {},
+        )
+        return SpanScope(span, context, is_root=False)
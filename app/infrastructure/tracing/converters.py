@@ -0,0 +1,62 @@
+from typing import Any
+
+from infrastructure.tracing.base import Span, SpanStatus
+
+
+def convert_value_to_otlp(value: Any) -> dict[str, Any]:
+    # bool first, it is an int too.
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+
+    return {"stringValue": str(value)}
+
+
+def convert_attributes_to_otlp(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [
+        {"key": key, "value": convert_value_to_otlp(value)}
+        for key, value in attributes.items()
+    ]
+
+
+def convert_span_to_otlp(span: Span) -> dict[str, Any]:
+    otlp_span = {
+        "traceId": span.context.trace_id,
+        "spanId": span.context.span_id,
+        "name": span.name,
+        "kind": int(span.kind),
+        "startTimeUnixNano": str(span.start_time),
+        "endTimeUnixNano": str(span.end_time),
+        "attributes": convert_attributes_to_otlp(span.attributes),
+        "status": {"code": int(span.status)},
+    }
+    if span.parent_span_id is not None:
+        otlp_span["parentSpanId"] = span.parent_span_id
+    if span.status == SpanStatus.ERROR and span.status_message:
+        otlp_span["status"]["message"] = span.status_message
+
+    return otlp_span
+
+
+def convert_spans_to_otlp(spans: list[Span], service_name: str) -> dict[str, Any]:
+    """An OTLP/JSON `ExportTraceServiceRequest`, as collectors read from files."""
+    return {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": convert_attributes_to_otlp(
+                        {"service.name": service_name}
+                    )
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": service_name},
+                        "spans": [convert_span_to_otlp(span) for span in spans],
+                    }
+                ],
+            }
+        ]
+    }
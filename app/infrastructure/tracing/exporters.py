@@ -0,0 +1,44 @@
+import sys
+from dataclasses import dataclass, field
+from typing import TextIO
+
+import orjson
+
+from infrastructure.tracing.base import ISpanExporter, Span
+from infrastructure.tracing.converters import convert_spans_to_otlp
+
+
+@dataclass
+class StreamSpanExporter(ISpanExporter):
+    """Writes every export as one line of OTLP/JSON."""
+
+    service_name: str
+    stream: TextIO = field(default_factory=lambda: sys.stdout)
+
+    def export(self, spans: list[Span]) -> None:
+        if not spans:
+            return
+
+        stream = self.get_stream()
+        stream.write(
+            orjson.dumps(convert_spans_to_otlp(spans, self.service_name)).decode()
+        )
+        stream.write("\n")
+        stream.flush()
+
+    def get_stream(self) -> TextIO:
+        return self.stream
+
+
+@dataclass
+class FileSpanExporter(StreamSpanExporter):
+    """Appends to a JSON lines file an OpenTelemetry collector can read back."""
+
+    path: str = "traces.jsonl"
+    stream: TextIO | None = field(default=None, init=False)
+
+    def get_stream(self) -> TextIO:
+        if self.stream is None:
+            self.stream = open(self.path, "a", encoding="utf-8")
+
+        return self.stream
@@ -0,0 +1,33 @@
+from infrastructure.tracing.base import ISpanExporter, Tracer, current_span_context
+from infrastructure.tracing.exporters import FileSpanExporter, StreamSpanExporter
+from settings.settings import settings
+
+
+TRACEPARENT_HEADER = "traceparent"
+
+TraceHeaders = tuple[tuple[str, bytes], ...]
+
+
+def create_span_exporter() -> ISpanExporter | None:
+    if settings.TRACING_EXPORTER == "stdout":
+        return StreamSpanExporter(service_name=settings.TRACING_SERVICE_NAME)
+    if settings.TRACING_EXPORTER == "file":
+        return FileSpanExporter(
+            service_name=settings.TRACING_SERVICE_NAME, path=settings.TRACING_FILE_PATH
+        )
+
+    return None
+
+
+tracer = Tracer(
+    exporter=create_span_exporter(), sample_rate=settings.TRACING_SAMPLE_RATE
+)
+
+
+def get_trace_headers() -> TraceHeaders:
+    """Message headers carrying the current trace to consumers, if there is one."""
+    context = current_span_context.get()
+    if context is None:
+        return ()
+
+    return ((TRACEPARENT_HEADER, context.to_traceparent().encode("ascii")),)
@@ -0,0 +1,16 @@
+from abc import ABC, abstractmethod
+from contextlib import AbstractAsyncContextManager
+
+
+class IUnitOfWork(ABC):
+    @abstractmethod
+    def begin(self) -> AbstractAsyncContextManager[None]:
+        """Scope in which every repository call shares one transaction.
+
+        Commits when the scope exits cleanly and rolls back on error. Nested
+        scopes join the outermost one.
+        """
+
+    @property
+    @abstractmethod
+    def is_active(self) -> bool: ...
@@ -0,0 +1,26 @@
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+
+from infrastructure.unit_of_work.base import IUnitOfWork
+
+
+@dataclass(frozen=True)
+class InMemoryUnitOfWork(IUnitOfWork):
+    _depth: ContextVar[int] = field(
+        default_factory=lambda: ContextVar("in_memory_unit_of_work", default=0),
+        kw_only=True,
+    )
+
+    @asynccontextmanager
+    async def begin(self) -> AsyncIterator[None]:
+        token = self._depth.set(self._depth.get() + 1)
+        try:
+            yield
+        finally:
+            self._depth.reset(token)
+
+    @property
+    def is_active(self) -> bool:
+        return self._depth.get() > 0
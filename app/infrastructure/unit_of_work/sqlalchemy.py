@@ -0,0 +1,31 @@
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import AsyncIterator, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from infrastructure.repositories.common.database import async_session, current_session
+from infrastructure.unit_of_work.base import IUnitOfWork
+
+
+@dataclass(frozen=True)
+class SqlAlchemyUnitOfWork(IUnitOfWork):
+    session_factory: Callable[[], AsyncSession] = async_session
+
+    @asynccontextmanager
+    async def begin(self) -> AsyncIterator[None]:
+        if self.is_active:
+            yield
+            return
+
+        async with self.session_factory() as session:
+            token = current_session.set(session)
+            try:
+                async with session.begin():
+                    yield
+            finally:
+                current_session.reset(token)
+
+    @property
+    def is_active(self) -> bool:
+        return current_session.get() is not None
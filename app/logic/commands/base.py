@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
-from typing import Any, Generic, TypeVar
+from typing import Any, ClassVar, Generic, TypeVar
 
 from logic.mediator.event import EventMediator
 
@@ -15,6 +15,10 @@ CR = TypeVar("CR", bound=Any)
 
 @dataclass(frozen=True)
 class CommandHandler(ABC, Generic[CT, CR]):
+    # Handlers that are not transactional run outside the command's unit of
+    # work and open short ones themselves, keeping slow work out of them.
+    transactional: ClassVar[bool] = True
+
     _mediator: EventMediator
 
     @abstractmethod
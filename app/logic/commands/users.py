@@ -1,13 +1,19 @@
 from dataclasses import dataclass
+from typing import ClassVar
 
 from domain.entities.users import UserEntity
 from domain.values.users import Phone, Password, Username
+from infrastructure.exceptions.base import UniqueFieldViolationException
+from infrastructure.hashers.base import IPasswordHasher
+from infrastructure.repositories.users.availability import UsernameAvailability
 from infrastructure.repositories.users.base import (
     IUserRepository,
 )
+from infrastructure.unit_of_work.base import IUnitOfWork
 from logic.commands.base import BaseCommand, CommandHandler
 from logic.exceptions.users import (
     InvalidCredentialsException,
+    PhoneAlreadyExists,
     UserAlreadyExistsException,
     UserNotFoundException,
     UsernameAlreadyExists,
@@ -24,25 +30,32 @@ class CreateUserCommand(BaseCommand):
 @dataclass(frozen=True)
 class CreateUserCommandHandler(CommandHandler[CreateUserCommand, UserEntity]):
     user_repository: IUserRepository
+    password_hasher: IPasswordHasher
 
     async def handle(self, command: CreateUserCommand) -> UserEntity:
         username = Username(value=command.username)
         phone = Phone(value=command.phone)
         password = Password(value=command.password)
 
-        # TODO move existing check to entity layer
-        if await self.user_repository.check_user_exists_by_phone_and_username(
-            phone=phone.as_generic_type(), username=username.as_generic_type()
-        ):
-            raise UserAlreadyExistsException()
-
         new_user = await UserEntity.create(
             username=username,
             phone=phone,
-            password=password,
+            password=Password(
+                value=await self.password_hasher.hash(password.as_generic_type()),
+                is_hashed=True,
+            ),
         )
 
-        await self.user_repository.add(new_user)
+        # The insert itself detects taken phones and usernames in one round trip.
+        try:
+            await self.user_repository.add(new_user)
+        except UniqueFieldViolationException as e:
+            if e.field_name == "phone":
+                raise PhoneAlreadyExists(e.value)
+            if e.field_name == "username":
+                raise UsernameAlreadyExists(e.value)
+            raise UserAlreadyExistsException()
+
         await self._mediator.publish(new_user.pull_events())
 
         return new_user
@@ -57,6 +70,7 @@ class ChangeUsernameCommand(BaseCommand):
 @dataclass(frozen=True)
 class ChangeUsernameCommandHandler(CommandHandler[ChangeUsernameCommand, None]):
     user_repository: IUserRepository
+    username_availability: UsernameAvailability
 
     async def handle(self, command: ChangeUsernameCommand) -> None:
         user = await self.user_repository.get_by_oid(oid=command.user_oid)
@@ -64,12 +78,13 @@ class ChangeUsernameCommandHandler(CommandHandler[ChangeUsernameCommand, None]):
             raise UserNotFoundException(value=command.user_oid)
 
         if command.new_username != user.username.as_generic_type():
-            existing_usernames = await self.user_repository.get_existing_usernames()
+            new_username = Username(value=command.new_username)
 
-            if command.new_username in existing_usernames:
+            if await self.username_availability.is_taken(
+                new_username.as_generic_type()
+            ):
                 raise UsernameAlreadyExists(command.new_username)
 
-            new_username = Username(value=command.new_username)
             await user.change_username(new_username=new_username)
             await self.user_repository.update(user)
             await self._mediator.publish(user.pull_events())
@@ -84,19 +99,76 @@ class ChangePasswordCommand(BaseCommand):
 
 @dataclass(frozen=True)
 class ChangePasswordCommandHandler(CommandHandler[ChangePasswordCommand, None]):
+    # Hashing takes long; no connection is held while it runs.
+    transactional: ClassVar[bool] = False
+
     user_repository: IUserRepository
+    password_hasher: IPasswordHasher
+    unit_of_work: IUnitOfWork
 
     async def handle(self, command: ChangePasswordCommand) -> None:
-        user = await self.user_repository.get_by_oid(oid=command.user_oid)
+        # Read in a unit of work of its own: that entity is this command's to
+        # change, never one shared with concurrent lookups.
+        async with self.unit_of_work.begin():
+            user = await self.user_repository.get_by_oid(oid=command.user_oid)
         if not user:
             raise UserNotFoundException(value=command.user_oid)
-        if not user.password.check_password(command.old_password):
+        if not await self.password_hasher.verify(
+            command.old_password, user.password.as_generic_type()
+        ):
             raise InvalidCredentialsException()
 
         new_password = Password(value=command.new_password)
-        await user.change_password(new_password=new_password)
-        await self.user_repository.update(user)
-        await self._mediator.publish(user.pull_events())
+        await user.change_password(
+            new_password=Password(
+                value=await self.password_hasher.hash(new_password.as_generic_type()),
+                is_hashed=True,
+            )
+        )
+        # Only the password column is written, so changes made meanwhile stay.
+        async with self.unit_of_work.begin():
+            await self.user_repository.update(user)
+            await self._mediator.publish(user.pull_events())
+
+
+@dataclass(frozen=True)
+class AuthenticateUserCommand(BaseCommand):
+    username: str
+    password: str
+
+
+@dataclass(frozen=True)
+class AuthenticateUserCommandHandler(
+    CommandHandler[AuthenticateUserCommand, UserEntity]
+):
+    # Reading and rehashing run in transactions of their own, so a login
+    # holds no connection while the password is verified.
+    transactional: ClassVar[bool] = False
+
+    user_repository: IUserRepository
+    password_hasher: IPasswordHasher
+
+    async def handle(self, command: AuthenticateUserCommand) -> UserEntity:
+        user = await self.user_repository.get_by_username(username=command.username)
+        if not user or user.is_deleted:
+            raise InvalidCredentialsException()
+
+        password_hash = user.password.as_generic_type()
+        if not await self.password_hasher.verify(command.password, password_hash):
+            raise InvalidCredentialsException()
+
+        # Hashes from older algorithms or parameters are upgraded while the
+        # plain password is at hand.
+        if self.password_hasher.needs_rehash(password_hash):
+            await user.rehash_password(
+                Password(
+                    value=await self.password_hasher.hash(command.password),
+                    is_hashed=True,
+                )
+            )
+            await self.user_repository.update(user)
+
+        return user
 
 
 @dataclass(frozen=True)
@@ -1,6 +1,6 @@
 from abc import ABC
 from dataclasses import dataclass
-from typing import Any, Generic, TypeVar
+from typing import Any, ClassVar, Generic, TypeVar
 
 from domain.events.base import BaseEvent
 from infrastructure.message_brokers.base import IMessageBroker
@@ -12,7 +12,15 @@ ER = TypeVar("ER", bound=Any)
 
 @dataclass
 class EventHandler(ABC, Generic[ET, ER]):
+    # Transactional handlers write in the command's unit of work, so they run
+    # inline and their errors fail the command whatever the publish mode.
+    transactional: ClassVar[bool] = False
+
     message_broker: IMessageBroker
     broker_topic: str | None = None
 
     def handle(self, event: ET) -> ER: ...
+
+    async def handle_batch(self, events: list[ET]) -> list[ER]:
+        """Events pulled from one aggregate at once; override to send them together."""
+        return [await self.handle(event) for event in events]
@@ -1,28 +1,93 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from typing import ClassVar
 
 from domain.events.users import (
+    RestoreUserEvent,
+    UserChangedPasswordEvent,
+    UserChangedUsernameEvent,
     UserCreatedEvent,
     UserDeletedEvent,
 )
+from infrastructure.message_brokers.base import BrokerMessage
 from infrastructure.message_brokers.converters import convert_event_to_broker_message
-from logic.events.base import EventHandler
+from infrastructure.repositories.outbox.base import IOutboxRepository
+from infrastructure.repositories.users.availability import UsernameAvailability
+from infrastructure.tracing.tracer import get_trace_headers
+from logic.events.base import ET, EventHandler
+from logic.queries.cache import QueryCache
+from logic.queries.users import USERS_TAG, get_user_tag
+
+
+UserEvent = (
+    UserCreatedEvent
+    | UserChangedUsernameEvent
+    | UserChangedPasswordEvent
+    | RestoreUserEvent
+    | UserDeletedEvent
+)
 
 
 @dataclass
-class NewUserCreatedEventHandler(EventHandler[UserCreatedEvent, None]):
-    async def handle(self, event: UserCreatedEvent) -> None:
-        await self.message_broker.send_message(
-            topic=self.broker_topic,
-            value=convert_event_to_broker_message(event=event),
-            key=event.event_id.encode(),
+class PublishUserEventHandler(EventHandler[ET, None]):
+    """Queues user events in the outbox, committed with the change they describe.
+
+    The outbox relay sends them on. Keys are user oids, so the events of one
+    user land on one partition, in order.
+    """
+
+    transactional: ClassVar[bool] = True
+
+    outbox_repository: IOutboxRepository = field(kw_only=True)
+
+    async def handle(self, event: ET) -> None:
+        await self.handle_batch([event])
+
+    async def handle_batch(self, events: list[ET]) -> list[None]:
+        # Stored with the message, so the relay sends it on in this trace.
+        trace_headers = get_trace_headers()
+        await self.outbox_repository.add_messages(
+            BrokerMessage(
+                topic=self.broker_topic,
+                value=convert_event_to_broker_message(event=event),
+                key=event.user_oid.encode(),
+                headers=trace_headers,
+            )
+            for event in events
         )
+        return [None] * len(events)
 
 
 @dataclass
-class UserDeletedEventHandler(EventHandler[UserDeletedEvent, None]):
-    async def handle(self, event: UserDeletedEvent) -> None:
-        await self.message_broker.send_message(
-            topic=self.broker_topic,
-            value=convert_event_to_broker_message(event=event),
-            key=event.event_id.encode(),
-        )
+class NewUserCreatedEventHandler(PublishUserEventHandler[UserCreatedEvent]): ...
+
+
+@dataclass
+class UserDeletedEventHandler(PublishUserEventHandler[UserDeletedEvent]): ...
+
+
+@dataclass
+class TrackCreatedUsernameEventHandler(EventHandler[UserCreatedEvent, None]):
+    username_availability: UsernameAvailability = field(kw_only=True)
+
+    async def handle(self, event: UserCreatedEvent) -> None:
+        self.username_availability.add(event.username)
+
+
+@dataclass
+class TrackChangedUsernameEventHandler(EventHandler[UserChangedUsernameEvent, None]):
+    username_availability: UsernameAvailability = field(kw_only=True)
+
+    async def handle(self, event: UserChangedUsernameEvent) -> None:
+        self.username_availability.add(event.new_username)
+
+
+@dataclass
+class InvalidateUserQueriesEventHandler(EventHandler[UserEvent, None]):
+    # Dropping entries is quick and local, so it runs inline in every publish
+    # mode: a read right after the command must not get the old result.
+    transactional: ClassVar[bool] = True
+
+    query_cache: QueryCache = field(kw_only=True)
+
+    async def handle(self, event: UserEvent) -> None:
+        self.query_cache.invalidate((get_user_tag(event.user_oid), USERS_TAG))
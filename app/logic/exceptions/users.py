@@ -33,3 +33,12 @@ class UsernameAlreadyExists(LogicException):
     @property
     def message(self) -> str:
         return f"User with username {self.value} already exists"
+
+
+@dataclass(eq=False)
+class PhoneAlreadyExists(LogicException):
+    value: str
+
+    @property
+    def message(self) -> str:
+        return f"User with phone {self.value} already exists"
@@ -1,14 +1,43 @@
+from datetime import timedelta
 from functools import lru_cache
 from uuid import uuid4
 from aiokafka import AIOKafkaConsumer, AIOKafkaProducer
 from punq import Container, Scope
 
 
+from infrastructure.hashers.base import IPasswordHasher
+from infrastructure.hashers.scrypt import ScryptPasswordHasher
 from infrastructure.message_brokers.base import IMessageBroker
 from infrastructure.message_brokers.kafka import KafkaMessageBroker
+from infrastructure.message_brokers.outbox_relay import OutboxRelay
+from infrastructure.repositories.outbox.base import IOutboxRepository
+from infrastructure.repositories.outbox.memory import InMemoryOutboxRepository
+from infrastructure.repositories.outbox.sqlalchemy import SqlAlchemyOutboxRepository
+from infrastructure.repositories.products.base import IProductRepository
+from infrastructure.repositories.products.sqlalchemy import (
+    SqlAlchemyProductRepository,
+)
 from infrastructure.repositories.users.base import IUserRepository
+from domain.events.users import (
+    RestoreUserEvent,
+    UserChangedPasswordEvent,
+    UserChangedUsernameEvent,
+    UserCreatedEvent,
+    UserDeletedEvent,
+)
+from infrastructure.repositories.common.database import async_session, test_session
+from infrastructure.repositories.common.warm_up import DatabaseWarmUp
+from infrastructure.repositories.users.asyncpg import AsyncpgUserRepository
+from infrastructure.repositories.users.availability import UsernameAvailability
+from infrastructure.repositories.users.coalescing import CoalescingUserRepository
+from infrastructure.repositories.users.memory import InMemoryUserRepository
 from infrastructure.repositories.users.sqlalchemy import SqlAlchemyUserRepository
+from infrastructure.unit_of_work.base import IUnitOfWork
+from infrastructure.unit_of_work.memory import InMemoryUnitOfWork
+from infrastructure.unit_of_work.sqlalchemy import SqlAlchemyUnitOfWork
 from logic.commands.users import (
+    AuthenticateUserCommand,
+    AuthenticateUserCommandHandler,
     ChangePasswordCommand,
     ChangePasswordCommandHandler,
     ChangeUsernameCommand,
@@ -20,16 +49,40 @@ from logic.commands.users import (
     RestoreUserCommand,
     RestoreUserCommandHandler,
 )
-from logic.mediator.base import Mediator
+from logic.events.users import (
+    InvalidateUserQueriesEventHandler,
+    NewUserCreatedEventHandler,
+    TrackChangedUsernameEventHandler,
+    TrackCreatedUsernameEventHandler,
+    UserDeletedEventHandler,
+)
+from logic.mediator.base import Mediator, PublishMode
 from logic.mediator.event import EventMediator
+from logic.queries.cache import QueryCache, QueryCachePolicy
+from logic.queries.single_flight import SingleFlight
 
+from logic.queries.products import (
+    GetProductsQuery,
+    GetProductsQueryHandler,
+    SearchProductsQuery,
+    SearchProductsQueryHandler,
+)
 from logic.queries.users import (
+    CheckUsernameAvailabilityQuery,
+    CheckUsernameAvailabilityQueryHandler,
+    CheckUsernamesAvailabilityQuery,
+    CheckUsernamesAvailabilityQueryHandler,
     GetUserByIdQuery,
     GetUserByIdQueryHandler,
     GetUserByUsernameQuery,
     GetUserByUsernameQueryHandler,
+    GetUsersByIdsQuery,
+    GetUsersByIdsQueryHandler,
     GetUsersQuery,
     GetUsersQueryHandler,
+    get_user_tags,
+    get_users_by_ids_tags,
+    get_users_page_tags,
 )
 from settings.settings import Settings
 
@@ -48,9 +101,121 @@ def _init_container() -> Container:
     def init_user_sqlalchemy_repository() -> IUserRepository:
         return SqlAlchemyUserRepository()
 
+    def init_user_asyncpg_repository() -> IUserRepository:
+        return AsyncpgUserRepository()
+
+    def init_user_memory_repository() -> IUserRepository:
+        return InMemoryUserRepository()
+
     # Repositories
+    if settings.USERS_REPOSITORY == "memory":
+        init_user_repository = init_user_memory_repository
+    elif settings.USERS_REPOSITORY == "asyncpg":
+        init_user_repository = init_user_asyncpg_repository
+    else:
+        init_user_repository = init_user_sqlalchemy_repository
+
+    def init_user_coalescing_repository() -> IUserRepository:
+        return CoalescingUserRepository(
+            user_repository=init_user_repository(),
+            unit_of_work=container.resolve(IUnitOfWork),
+            max_batch_size=settings.USERS_COALESCE_MAX_BATCH_SIZE,
+        )
+
+    container.register(
+        IUserRepository,
+        factory=init_user_coalescing_repository
+        if settings.USERS_COALESCE_LOOKUPS
+        else init_user_repository,
+        scope=Scope.singleton,
+    )
+
+    def init_outbox_sqlalchemy_repository() -> IOutboxRepository:
+        return SqlAlchemyOutboxRepository(
+            key_partitions=settings.OUTBOX_KEY_PARTITIONS,
+            partitions_per_claim=settings.OUTBOX_PARTITIONS_PER_CLAIM,
+        )
+
+    def init_outbox_memory_repository() -> IOutboxRepository:
+        return InMemoryOutboxRepository()
+
+    if settings.USERS_REPOSITORY == "memory":
+        container.register(
+            IOutboxRepository,
+            factory=init_outbox_memory_repository,
+            scope=Scope.singleton,
+        )
+    else:
+        container.register(
+            IOutboxRepository,
+            factory=init_outbox_sqlalchemy_repository,
+            scope=Scope.singleton,
+        )
+
+    def init_product_sqlalchemy_repository() -> IProductRepository:
+        return SqlAlchemyProductRepository()
+
+    container.register(
+        IProductRepository,
+        factory=init_product_sqlalchemy_repository,
+        scope=Scope.singleton,
+    )
+
+    def init_username_availability() -> UsernameAvailability:
+        return UsernameAvailability(
+            user_repository=container.resolve(IUserRepository),
+            expected_usernames=settings.USERNAME_FILTER_CAPACITY,
+            error_rate=settings.USERNAME_FILTER_ERROR_RATE,
+        )
+
+    container.register(
+        UsernameAvailability,
+        factory=init_username_availability,
+        scope=Scope.singleton,
+    )
+
+    # Password hashing
+    def init_password_hasher() -> IPasswordHasher:
+        return ScryptPasswordHasher(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            max_concurrency=settings.PASSWORD_HASH_MAX_CONCURRENCY,
+        )
+
+    container.register(
+        IPasswordHasher, factory=init_password_hasher, scope=Scope.singleton
+    )
+
+    # Unit of work
+    def init_sqlalchemy_unit_of_work() -> IUnitOfWork:
+        return SqlAlchemyUnitOfWork(
+            session_factory=test_session if settings.TEST_MODE else async_session
+        )
+
+    def init_memory_unit_of_work() -> IUnitOfWork:
+        return InMemoryUnitOfWork()
+
+    if settings.USERS_REPOSITORY == "memory":
+        container.register(
+            IUnitOfWork, factory=init_memory_unit_of_work, scope=Scope.singleton
+        )
+    else:
+        container.register(
+            IUnitOfWork, factory=init_sqlalchemy_unit_of_work, scope=Scope.singleton
+        )
+
+    # Connections beyond the pool size are closed on return, so they are not warmed.
+    def init_database_warm_up() -> DatabaseWarmUp:
+        return DatabaseWarmUp(
+            unit_of_work=container.resolve(IUnitOfWork),
+            primers=[
+                container.resolve(IUserRepository).warm_up,
+                container.resolve(IProductRepository).warm_up,
+            ],
+            connections=min(settings.DB_WARM_UP_CONNECTIONS, settings.DB_POOL_SIZE),
+        )
+
     container.register(
-        IUserRepository, factory=init_user_sqlalchemy_repository, scope=Scope.singleton
+        DatabaseWarmUp, factory=init_database_warm_up, scope=Scope.singleton
     )
 
     # Command handlers
@@ -59,16 +224,27 @@ def _init_container() -> Container:
     container.register(ChangePasswordCommandHandler)
     container.register(RestoreUserCommandHandler)
     container.register(DeleteUserCommandHandler)
+    container.register(AuthenticateUserCommandHandler)
 
     # Query Handlers
     container.register(GetUsersQueryHandler)
     container.register(GetUserByIdQueryHandler)
+    container.register(GetUsersByIdsQueryHandler)
     container.register(GetUserByUsernameQueryHandler)
+    container.register(CheckUsernameAvailabilityQueryHandler)
+    container.register(CheckUsernamesAvailabilityQueryHandler)
+    container.register(GetProductsQueryHandler)
+    container.register(SearchProductsQueryHandler)
 
     # Message broker
     def create_message_broker() -> IMessageBroker:
         return KafkaMessageBroker(
-            producer=AIOKafkaProducer(bootstrap_servers=settings.KAFKA_URL),
+            producer=AIOKafkaProducer(
+                bootstrap_servers=settings.KAFKA_URL,
+                linger_ms=settings.KAFKA_LINGER_MS,
+                max_batch_size=settings.KAFKA_MAX_BATCH_SIZE,
+                compression_type=settings.KAFKA_COMPRESSION_TYPE,
+            ),
             consumer=AIOKafkaConsumer(
                 bootstrap_servers=settings.KAFKA_URL,
                 group_id=f"{uuid4()}",
@@ -80,22 +256,59 @@ def _init_container() -> Container:
         IMessageBroker, factory=create_message_broker, scope=Scope.singleton
     )
 
+    # Outbox relay
+    def init_outbox_relay() -> OutboxRelay:
+        return OutboxRelay(
+            outbox_repository=container.resolve(IOutboxRepository),
+            message_broker=container.resolve(IMessageBroker),
+            unit_of_work=container.resolve(IUnitOfWork),
+            batch_size=settings.OUTBOX_RELAY_BATCH_SIZE,
+            idle_interval=settings.OUTBOX_RELAY_IDLE_SECONDS,
+            retention=timedelta(hours=settings.OUTBOX_RETENTION_HOURS),
+        )
+
+    container.register(OutboxRelay, factory=init_outbox_relay, scope=Scope.singleton)
+
+    # Query cache
+    def init_query_cache() -> QueryCache:
+        return QueryCache(max_entries=settings.QUERY_CACHE_MAX_ENTRIES)
+
+    container.register(QueryCache, factory=init_query_cache, scope=Scope.singleton)
+
+    def init_single_flight() -> SingleFlight:
+        return SingleFlight(timeout=settings.QUERY_SINGLE_FLIGHT_TIMEOUT_SECONDS)
+
+    container.register(SingleFlight, factory=init_single_flight, scope=Scope.singleton)
+
     # Mediator
     def init_mediator() -> Mediator:
-        mediator = Mediator()
+        mediator = Mediator(
+            unit_of_work=container.resolve(IUnitOfWork),
+            publish_mode=PublishMode(settings.EVENT_PUBLISH_MODE),
+            query_cache=container.resolve(QueryCache)
+            if settings.QUERY_CACHE_ENABLED
+            else None,
+            single_flight=container.resolve(SingleFlight)
+            if settings.QUERY_SINGLE_FLIGHT_ENABLED
+            else None,
+        )
 
         # Command Handlers
         create_user_handler = CreateUserCommandHandler(
             _mediator=mediator,
             user_repository=container.resolve(IUserRepository),
+            password_hasher=container.resolve(IPasswordHasher),
         )
         change_username_handler = ChangeUsernameCommandHandler(
             _mediator=mediator,
             user_repository=container.resolve(IUserRepository),
+            username_availability=container.resolve(UsernameAvailability),
         )
         change_password_handler = ChangePasswordCommandHandler(
             _mediator=mediator,
             user_repository=container.resolve(IUserRepository),
+            password_hasher=container.resolve(IPasswordHasher),
+            unit_of_work=container.resolve(IUnitOfWork),
         )
         restore_user_handler = RestoreUserCommandHandler(
             _mediator=mediator,
@@ -105,6 +318,11 @@ def _init_container() -> Container:
             _mediator=mediator,
             user_repository=container.resolve(IUserRepository),
         )
+        authenticate_user_handler = AuthenticateUserCommandHandler(
+            _mediator=mediator,
+            user_repository=container.resolve(IUserRepository),
+            password_hasher=container.resolve(IPasswordHasher),
+        )
         mediator.register_command(
             CreateUserCommand,
             [create_user_handler],
@@ -125,24 +343,109 @@ def _init_container() -> Container:
             DeleteUserCommand,
             [delete_user_handler],
         )
+        mediator.register_command(
+            AuthenticateUserCommand,
+            [authenticate_user_handler],
+        )
+
+        # Event Handlers
+        mediator.register_event(
+            UserCreatedEvent,
+            [
+                TrackCreatedUsernameEventHandler(
+                    message_broker=container.resolve(IMessageBroker),
+                    username_availability=container.resolve(UsernameAvailability),
+                ),
+                NewUserCreatedEventHandler(
+                    message_broker=container.resolve(IMessageBroker),
+                    broker_topic=settings.USER_EVENTS_TOPIC,
+                    outbox_repository=container.resolve(IOutboxRepository),
+                ),
+            ],
+        )
+        mediator.register_event(
+            UserDeletedEvent,
+            [
+                UserDeletedEventHandler(
+                    message_broker=container.resolve(IMessageBroker),
+                    broker_topic=settings.USER_EVENTS_TOPIC,
+                    outbox_repository=container.resolve(IOutboxRepository),
+                ),
+            ],
+        )
+        mediator.register_event(
+            UserChangedUsernameEvent,
+            [
+                TrackChangedUsernameEventHandler(
+                    message_broker=container.resolve(IMessageBroker),
+                    username_availability=container.resolve(UsernameAvailability),
+                ),
+            ],
+        )
+
+        if mediator.query_cache is not None:
+            invalidate_user_queries_handler = InvalidateUserQueriesEventHandler(
+                message_broker=container.resolve(IMessageBroker),
+                query_cache=mediator.query_cache,
+            )
+            for user_event in (
+                UserCreatedEvent,
+                UserChangedUsernameEvent,
+                UserChangedPasswordEvent,
+                RestoreUserEvent,
+                UserDeletedEvent,
+            ):
+                mediator.register_event(user_event, [invalidate_user_queries_handler])
 
         # Query Handlers
+        def init_query_cache_policy(tags) -> QueryCachePolicy:
+            return QueryCachePolicy(
+                ttl=settings.QUERY_CACHE_TTL_SECONDS,
+                stale_ttl=settings.QUERY_CACHE_STALE_SECONDS,
+                tags=tags,
+            )
+
         mediator.register_query(
             GetUsersQuery,
             container.resolve(GetUsersQueryHandler),
+            cache_policy=init_query_cache_policy(get_users_page_tags),
         )
         mediator.register_query(
             GetUserByIdQuery,
             container.resolve(GetUserByIdQueryHandler),
+            cache_policy=init_query_cache_policy(get_user_tags),
+        )
+        mediator.register_query(
+            GetUsersByIdsQuery,
+            container.resolve(GetUsersByIdsQueryHandler),
+            cache_policy=init_query_cache_policy(get_users_by_ids_tags),
         )
         mediator.register_query(
             GetUserByUsernameQuery,
             container.resolve(GetUserByUsernameQueryHandler),
+            cache_policy=init_query_cache_policy(get_user_tags),
+        )
+        mediator.register_query(
+            CheckUsernameAvailabilityQuery,
+            container.resolve(CheckUsernameAvailabilityQueryHandler),
+        )
+        mediator.register_query(
+            CheckUsernamesAvailabilityQuery,
+            container.resolve(CheckUsernamesAvailabilityQueryHandler),
+        )
+        mediator.register_query(
+            GetProductsQuery,
+            container.resolve(GetProductsQueryHandler),
+        )
+        mediator.register_query(
+            SearchProductsQuery,
+            container.resolve(SearchProductsQueryHandler),
         )
 
         return mediator
 
-    container.register(Mediator, factory=init_mediator)
-    container.register(EventMediator, factory=init_mediator)
+    # Built once per process: the handler graph is stateless between requests.
+    container.register(Mediator, factory=init_mediator, scope=Scope.singleton)
+    container.register(EventMediator, factory=lambda: container.resolve(Mediator))
 
     return container
@@ -1,17 +1,50 @@
+import asyncio
+import logging
 from collections import defaultdict
-from collections.abc import Iterable
+from collections.abc import Awaitable, Callable, Iterable
+from contextlib import nullcontext
 from dataclasses import dataclass, field
+from enum import Enum
+from functools import partial
 
 from domain.events.base import BaseEvent
+from infrastructure.metrics.base import Timer
+from infrastructure.metrics.registry import (
+    MEDIATOR_HANDLE_DURATION,
+    MEDIATOR_HANDLE_ERRORS,
+)
+from infrastructure.tracing.tracer import tracer
+from infrastructure.unit_of_work.base import IUnitOfWork
 from logic.commands.base import CR, CT, BaseCommand, CommandHandler
 from logic.events.base import ER, ET, EventHandler
 from logic.exceptions.mediator import (
     CommandHandlersNotRegisteredException,
 )
 from logic.mediator.command import CommandMediator
+from logic.mediator.deferred import defer_publication
 from logic.mediator.event import EventMediator
 from logic.mediator.query import QueryMediator
 from logic.queries.base import QR, QT, BaseQuery, BaseQueryHandler
+from logic.queries.cache import QueryCache, QueryCachePolicy
+from logic.queries.single_flight import SingleFlight
+
+
+logger = logging.getLogger(__name__)
+
+EventBatch = tuple[EventHandler, list[BaseEvent]]
+
+
+class PublishMode(str, Enum):
+    """How handlers that are not `transactional` run.
+
+    `sequential` awaits them one by one, `concurrent` runs them side by side
+    with failures logged per handler, and `deferred` does the same once the
+    current request has been answered.
+    """
+
+    SEQUENTIAL = "sequential"
+    CONCURRENT = "concurrent"
+    DEFERRED = "deferred"
 
 
 @dataclass(eq=False)
@@ -29,6 +62,15 @@ class Mediator(EventMediator, CommandMediator, QueryMediator):
         default_factory=dict,
         kw_only=True,
     )
+    unit_of_work: IUnitOfWork | None = field(default=None, kw_only=True)
+    publish_mode: PublishMode = field(default=PublishMode.SEQUENTIAL, kw_only=True)
+    query_cache: QueryCache | None = field(default=None, kw_only=True)
+    query_cache_policies: dict[QT, QueryCachePolicy] = field(
+        default_factory=dict, kw_only=True
+    )
+    single_flight: SingleFlight | None = field(default=None, kw_only=True)
+    # Bumped as every command finishes, after its writes were committed.
+    _write_generation: int = field(default=0, init=False, repr=False)
 
     def register_event(
         self, event: ET, event_handlers: Iterable[EventHandler[ET, ER]]
@@ -40,26 +82,132 @@ class Mediator(EventMediator, CommandMediator, QueryMediator):
     ) -> CR:
         self.commands_map[command].extend(command_handlers)
 
-    def register_query(self, query: QT, query_handler: BaseQueryHandler[QT, QR]) -> QR:
+    def register_query(
+        self,
+        query: QT,
+        query_handler: BaseQueryHandler[QT, QR],
+        cache_policy: QueryCachePolicy | None = None,
+    ) -> QR:
         self.queries_map[query] = query_handler
+        if cache_policy is not None:
+            self.query_cache_policies[query] = cache_policy
 
     async def publish(self, events: Iterable[BaseEvent]) -> Iterable[ER]:
-        if not events:
-            raise Exception(events)
-        result = []
+        # Each handler gets its events in one call, in the order they were raised,
+        # which keeps them ordered per aggregate whatever the mode.
+        batches: dict[int, EventBatch] = {}
         for event in events:
-            handlers: Iterable[EventHandler] = self.events_map[event.__class__]
-            result.extend([await handler.handle(event) for handler in handlers])
+            for handler in self.events_map[event.__class__]:
+                batches.setdefault(id(handler), (handler, []))[1].append(event)
+
+        result = []
+        detached: list[EventBatch] = []
+        for handler, handler_events in batches.values():
+            if handler.transactional or self.publish_mode == PublishMode.SEQUENTIAL:
+                result.extend(await self._handle_batch(handler, handler_events))
+            else:
+                detached.append((handler, handler_events))
 
+        if not detached:
+            return result
+
+        if self.publish_mode == PublishMode.DEFERRED and defer_publication(
+            partial(self._publish_concurrently, detached)
+        ):
+            return result
+
+        result.extend(await self._publish_concurrently(detached))
         return result
 
+    async def _publish_concurrently(self, batches: list[EventBatch]) -> list[ER]:
+        async with asyncio.TaskGroup() as task_group:
+            tasks = [
+                task_group.create_task(self._handle_isolated(handler, handler_events))
+                for handler, handler_events in batches
+            ]
+
+        return [result for task in tasks for result in task.result()]
+
+    @classmethod
+    async def _handle_isolated(
+        cls, handler: EventHandler, events: list[BaseEvent]
+    ) -> list[ER]:
+        try:
+            return await cls._handle_batch(handler, events)
+        except Exception:
+            logger.exception("Event handler %s failed", type(handler).__name__)
+            return []
+
+    @staticmethod
+    async def _handle_batch(handler: EventHandler, events: list[BaseEvent]) -> list[ER]:
+        name = handler.__class__.__name__
+        with (
+            Timer(MEDIATOR_HANDLE_DURATION, MEDIATOR_HANDLE_ERRORS, "event", name),
+            tracer.start_span(f"event {name}"),
+        ):
+            return await handler.handle_batch(events)
+
     async def handle_command(self, command: BaseCommand) -> Iterable[CR]:
         command_type = command.__class__
         handlers = self.commands_map.get(command_type)
         if not handlers:
             raise CommandHandlersNotRegisteredException(command_type)
 
-        return [await handler.handle(command) for handler in handlers]
+        # Every repository call made by the handlers shares one transaction.
+        is_transactional = self.unit_of_work is not None and all(
+            handler.transactional for handler in handlers
+        )
+        scope = self.unit_of_work.begin() if is_transactional else nullcontext()
+        invalidation_scope = (
+            self.query_cache.invalidating_again_on_exit()
+            if self.query_cache
+            else nullcontext()
+        )
+        name = command_type.__name__
+        with (
+            Timer(MEDIATOR_HANDLE_DURATION, MEDIATOR_HANDLE_ERRORS, "command", name),
+            tracer.start_span(f"command {name}"),
+        ):
+            try:
+                with invalidation_scope:
+                    async with scope:
+                        return [await handler.handle(command) for handler in handlers]
+            finally:
+                self._write_generation += 1
 
     async def handle_query(self, query: BaseQuery) -> QR:
-        return await self.queries_map[query.__class__].handle(query=query)
+        name = query.__class__.__name__
+        with (
+            Timer(MEDIATOR_HANDLE_DURATION, MEDIATOR_HANDLE_ERRORS, "query", name),
+            tracer.start_span(f"query {name}"),
+        ):
+            return await self._handle_query(query)
+
+    async def _handle_query(self, query: BaseQuery) -> QR:
+        query_handler = self.queries_map[query.__class__]
+        load = partial(query_handler.handle, query=query)
+
+        cache_policy = self.query_cache_policies.get(query.__class__)
+        if self.query_cache is None or cache_policy is None:
+            if self.single_flight is None:
+                return await load()
+
+            # Queries are frozen, so equal ones can share a single run. One
+            # started before a command committed may return the rows it
+            # changed; queries sent after it must not join that run.
+            key = (query, self._write_generation)
+            return await self.single_flight.run(key, load)
+
+        if self.single_flight is not None:
+            load = partial(self._load_cached_once, query, load)
+
+        return await self.query_cache.get_or_load(query, load, cache_policy)
+
+    async def _load_cached_once(
+        self, query: BaseQuery, load: Callable[[], Awaitable[QR]]
+    ) -> QR:
+        # Runs as the cache starts a load, so the generation is the one that
+        # load is stored under. A flight started before an invalidation may
+        # return rows it made stale; later loads must not join it.
+        key = (query, self.query_cache.generation)
+        return await self.single_flight.run(key, load)
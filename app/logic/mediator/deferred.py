@@ -0,0 +1,41 @@
+import logging
+from collections.abc import AsyncIterator, Awaitable, Callable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+
+logger = logging.getLogger(__name__)
+
+DeferredPublication = Callable[[], Awaitable[object]]
+
+# Publications waiting for the surrounding request to finish; None outside one.
+deferred_publications: ContextVar[list[DeferredPublication] | None] = ContextVar(
+    "deferred_publications", default=None
+)
+
+
+def defer_publication(publication: DeferredPublication) -> bool:
+    """Queue a publication for after the response; False when no scope collects it."""
+    pending = deferred_publications.get()
+    if pending is None:
+        return False
+
+    pending.append(publication)
+    return True
+
+
+@asynccontextmanager
+async def collect_deferred_publications() -> AsyncIterator[None]:
+    """Run publications deferred inside the block once it completes without error."""
+    pending: list[DeferredPublication] = []
+    token = deferred_publications.set(pending)
+    try:
+        yield
+    finally:
+        deferred_publications.reset(token)
+
+    for publication in pending:
+        try:
+            await publication()
+        except Exception:
+            logger.exception("Deferred event publication failed")
@@ -2,6 +2,7 @@ from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 
 from logic.queries.base import QR, QT, BaseQuery, BaseQueryHandler
+from logic.queries.cache import QueryCachePolicy
 
 
 @dataclass(eq=False)
@@ -13,7 +14,10 @@ class QueryMediator(ABC):
 
     @abstractmethod
     def register_query(
-        self, query: QT, query_handler: BaseQueryHandler[QT, QR]
+        self,
+        query: QT,
+        query_handler: BaseQueryHandler[QT, QR],
+        cache_policy: QueryCachePolicy | None = None,
     ) -> QR: ...
 
     @abstractmethod
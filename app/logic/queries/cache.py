@@ -0,0 +1,219 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class QueryCachePolicy:
+    """How long results of one query type are served from the cache.
+
+    Past `ttl` an entry is stale: for `stale_ttl` more seconds it is still
+    returned while a background load refreshes it. `tags` names what a result
+    was read from, so events about those rows can invalidate it.
+    """
+
+    ttl: float
+    stale_ttl: float = 0.0
+    tags: Callable[[Any, Any], Iterable[str]] = lambda query, result: ()
+
+
+@dataclass
+class QueryCacheStats:
+    hits: int = 0
+    stale_hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+    invalidations: int = 0
+    refresh_failures: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+@dataclass
+class QueryCacheEntry:
+    value: Any
+    tags: frozenset[str]
+    fresh_until: float
+    stale_until: float
+
+
+@dataclass
+class QueryCache:
+    """Bounded LRU of query results keyed by the (frozen) query itself.
+
+    Invalidation is per process: other workers only drop an entry when its
+    `ttl` and `stale_ttl` run out.
+    """
+
+    max_entries: int = 10_000
+    clock: Callable[[], float] = time.monotonic
+    stats: QueryCacheStats = field(default_factory=QueryCacheStats)
+    _entries: OrderedDict[Hashable, QueryCacheEntry] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _keys_by_tag: dict[str, set[Hashable]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    # Bumped by every invalidation, so loads racing one are not stored.
+    _generation: int = field(default=0, init=False)
+    _refreshing: dict[Hashable, asyncio.Task] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _pending_tags: ContextVar[set[str] | None] = field(
+        default_factory=lambda: ContextVar("query_cache_pending_tags", default=None),
+        init=False,
+        repr=False,
+    )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def generation(self) -> int:
+        """Bumped by every invalidation; a load is stored only if it is unchanged."""
+        return self._generation
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        load: Callable[[], Awaitable[Any]],
+        policy: QueryCachePolicy,
+    ) -> Any:
+        entry = self._entries.get(key)
+        if entry is not None:
+            now = self.clock()
+            if now < entry.fresh_until:
+                self._entries.move_to_end(key)
+                self.stats.hits += 1
+                return entry.value
+
+            if now < entry.stale_until:
+                self._entries.move_to_end(key)
+                self.stats.stale_hits += 1
+                self._refresh_in_background(key, load, policy)
+                return entry.value
+
+            self._remove(key)
+            self.stats.expirations += 1
+
+        self.stats.misses += 1
+        return await self._load(key, load, policy)
+
+    def invalidate(self, tags: Iterable[str]) -> int:
+        tags = set(tags)
+        self._generation += 1
+
+        pending_tags = self._pending_tags.get()
+        if pending_tags is not None:
+            pending_tags.update(tags)
+
+        removed = 0
+        for tag in tags:
+            for key in list(self._keys_by_tag.get(tag, ())):
+                self._remove(key)
+                removed += 1
+
+        self.stats.invalidations += removed
+        return removed
+
+    @contextmanager
+    def invalidating_again_on_exit(self) -> Iterator[None]:
+        """Repeat the invalidations made in the block once it has finished.
+
+        Events are handled before the command commits, and a read running in
+        the meantime may cache the rows it still sees; the second pass, after
+        the commit, drops those entries.
+        """
+        pending_tags: set[str] = set()
+        token = self._pending_tags.set(pending_tags)
+        try:
+            yield
+        finally:
+            self._pending_tags.reset(token)
+            if pending_tags:
+                self.invalidate(pending_tags)
+
+    def clear(self) -> None:
+        self._generation += 1
+        self._entries.clear()
+        self._keys_by_tag.clear()
+
+    async def _load(
+        self,
+        key: Hashable,
+        load: Callable[[], Awaitable[Any]],
+        policy: QueryCachePolicy,
+    ) -> Any:
+        generation = self._generation
+        value = await load()
+
+        if generation == self._generation:
+            self._store(key, value, policy)
+
+        return value
+
+    def _refresh_in_background(
+        self,
+        key: Hashable,
+        load: Callable[[], Awaitable[Any]],
+        policy: QueryCachePolicy,
+    ) -> None:
+        if key not in self._refreshing:
+            self._refreshing[key] = asyncio.create_task(
+                self._refresh(key, load, policy)
+            )
+
+    async def _refresh(
+        self,
+        key: Hashable,
+        load: Callable[[], Awaitable[Any]],
+        policy: QueryCachePolicy,
+    ) -> None:
+        try:
+            await self._load(key, load, policy)
+        except Exception:
+            self.stats.refresh_failures += 1
+            logger.exception("Could not refresh the cached result of %r", key)
+        finally:
+            self._refreshing.pop(key, None)
+
+    def _store(self, key: Hashable, value: Any, policy: QueryCachePolicy) -> None:
+        if key in self._entries:
+            self._remove(key)
+
+        now = self.clock()
+        tags = frozenset(policy.tags(key, value))
+        self._entries[key] = QueryCacheEntry(
+            value=value,
+            tags=tags,
+            fresh_until=now + policy.ttl,
+            stale_until=now + policy.ttl + policy.stale_ttl,
+        )
+        for tag in tags:
+            self._keys_by_tag.setdefault(tag, set()).add(key)
+
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+            self.stats.evictions += 1
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key)
+        for tag in entry.tags:
+            keys = self._keys_by_tag.get(tag)
+            if keys is None:
+                continue
+
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_tag[tag]
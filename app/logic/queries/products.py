@@ -0,0 +1,36 @@
+from dataclasses import dataclass
+
+from domain.entities.products import ProductEntity
+from infrastructure.repositories.common.pagination import Page
+from infrastructure.repositories.products.base import IProductRepository
+from infrastructure.repositories.products.filters.products import (
+    GetProductsFilters,
+    SearchProductsFilters,
+)
+from logic.queries.base import BaseQuery, BaseQueryHandler
+
+
+@dataclass(frozen=True)
+class GetProductsQuery(BaseQuery):
+    filters: GetProductsFilters
+
+
+@dataclass(frozen=True)
+class GetProductsQueryHandler(BaseQueryHandler):
+    product_repository: IProductRepository
+
+    async def handle(self, query: GetProductsQuery) -> Page[ProductEntity]:
+        return await self.product_repository.get_all(filters=query.filters)
+
+
+@dataclass(frozen=True)
+class SearchProductsQuery(BaseQuery):
+    filters: SearchProductsFilters
+
+
+@dataclass(frozen=True)
+class SearchProductsQueryHandler(BaseQueryHandler):
+    product_repository: IProductRepository
+
+    async def handle(self, query: SearchProductsQuery) -> Page[ProductEntity]:
+        return await self.product_repository.search(filters=query.filters)
@@ -0,0 +1,100 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import asdict, dataclass, field
+from typing import Any
+
+
+@dataclass
+class SingleFlightStats:
+    flights: int = 0
+    collapsed: int = 0
+    timeouts: int = 0
+    abandoned: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+@dataclass
+class Flight:
+    task: asyncio.Task
+    waiters: int = 0
+
+
+@dataclass
+class SingleFlight:
+    """Lets concurrent identical calls share one in-flight run.
+
+    The first caller for a key starts the call; callers arriving before it
+    finishes wait for the same result or error instead of running their own.
+    A flight ends after `timeout` seconds with `TimeoutError` for everyone
+    waiting on it, and is cancelled once every caller has given up on it.
+    """
+
+    timeout: float = 10.0
+    stats: SingleFlightStats = field(default_factory=SingleFlightStats)
+    _flights: dict[Hashable, Flight] = field(default_factory=dict, init=False)
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    async def run(
+        self,
+        key: Hashable,
+        call: Callable[[], Awaitable[Any]],
+        timeout: float | None = None,
+    ) -> Any:
+        flight = self._flights.get(key)
+        if flight is None:
+            if timeout is None:
+                timeout = self.timeout
+            flight = self._start(key, call, timeout)
+        else:
+            self.stats.collapsed += 1
+
+        flight.waiters += 1
+        try:
+            return await asyncio.shield(flight.task)
+        except asyncio.CancelledError:
+            if flight.waiters == 1 and not flight.task.done():
+                self._abandon(key, flight)
+            raise
+        finally:
+            flight.waiters -= 1
+
+    def _start(
+        self, key: Hashable, call: Callable[[], Awaitable[Any]], timeout: float
+    ) -> Flight:
+        flight = self._flights[key] = Flight(
+            task=asyncio.create_task(self._fly(call, timeout))
+        )
+        flight.task.add_done_callback(lambda _: self._land(key, flight))
+        self.stats.flights += 1
+
+        return flight
+
+    async def _fly(self, call: Callable[[], Awaitable[Any]], timeout: float) -> Any:
+        try:
+            async with asyncio.timeout(timeout):
+                return await call()
+        except TimeoutError:
+            self.stats.timeouts += 1
+            raise
+
+    def _abandon(self, key: Hashable, flight: Flight) -> None:
+        # Forgotten right away, so a new caller starts afresh instead of
+        # joining a flight that is being cancelled.
+        self._forget(key, flight)
+        flight.task.cancel()
+        self.stats.abandoned += 1
+
+    def _land(self, key: Hashable, flight: Flight) -> None:
+        self._forget(key, flight)
+
+        if not flight.task.cancelled():
+            # Nobody may be left to see the error; mark it retrieved.
+            flight.task.exception()
+
+    def _forget(self, key: Hashable, flight: Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
@@ -1,7 +1,10 @@
-from collections.abc import Iterable
 from dataclasses import dataclass
 
 from domain.entities.users import UserEntity
+from domain.exceptions.base import ApplicationException
+from domain.values.users import Username
+from infrastructure.repositories.common.pagination import Page
+from infrastructure.repositories.users.availability import UsernameAvailability
 from infrastructure.repositories.users.base import (
     IUserRepository,
 )
@@ -12,6 +15,14 @@ from logic.exceptions.users import UserNotFoundException
 from logic.queries.base import BaseQuery, BaseQueryHandler
 
 
+# Cache tags of user query results; user events invalidate both.
+USERS_TAG = "users"
+
+
+def get_user_tag(user_oid: str) -> str:
+    return f"user:{user_oid}"
+
+
 @dataclass(frozen=True)
 class GetUsersQuery(BaseQuery):
     filters: GetUsersFilters
@@ -21,7 +32,7 @@ class GetUsersQuery(BaseQuery):
 class GetUsersQueryHandler(BaseQueryHandler):
     user_repository: IUserRepository
 
-    async def handle(self, query: GetUsersQuery) -> Iterable[UserEntity]:
+    async def handle(self, query: GetUsersQuery) -> Page[UserEntity]:
         return await self.user_repository.get_all(filters=query.filters)
 
 
@@ -42,6 +53,23 @@ class GetUserByIdQueryHandler(BaseQueryHandler):
         return user
 
 
+@dataclass(frozen=True)
+class GetUsersByIdsQuery(BaseQuery):
+    user_oids: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class GetUsersByIdsQueryHandler(BaseQueryHandler):
+    user_repository: IUserRepository
+
+    async def handle(self, query: GetUsersByIdsQuery) -> dict[str, UserEntity]:
+        """Found users keyed by oid, in the order their oids were asked for."""
+        user_oids = dict.fromkeys(query.user_oids)
+        users = await self.user_repository.get_by_oids(user_oids)
+
+        return {oid: users[oid] for oid in user_oids if oid in users}
+
+
 @dataclass(frozen=True)
 class GetUserByUsernameQuery(BaseQuery):
     username: str
@@ -57,3 +85,58 @@ class GetUserByUsernameQueryHandler(BaseQueryHandler):
             raise UserNotFoundException(value=query.username)
 
         return user
+
+
+@dataclass(frozen=True)
+class CheckUsernameAvailabilityQuery(BaseQuery):
+    username: str
+
+
+@dataclass(frozen=True)
+class CheckUsernameAvailabilityQueryHandler(BaseQueryHandler):
+    username_availability: UsernameAvailability
+
+    async def handle(self, query: CheckUsernameAvailabilityQuery) -> bool:
+        username = Username(value=query.username)
+        return not await self.username_availability.is_taken(username.as_generic_type())
+
+
+@dataclass(frozen=True)
+class CheckUsernamesAvailabilityQuery(BaseQuery):
+    usernames: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class CheckUsernamesAvailabilityQueryHandler(BaseQueryHandler):
+    username_availability: UsernameAvailability
+
+    async def handle(self, query: CheckUsernamesAvailabilityQuery) -> dict[str, bool]:
+        valid_usernames = set()
+        for username in query.usernames:
+            try:
+                valid_usernames.add(Username(value=username).as_generic_type())
+            except ApplicationException:
+                continue
+
+        taken_usernames = await self.username_availability.get_taken(valid_usernames)
+        return {
+            username: username in valid_usernames and username not in taken_usernames
+            for username in query.usernames
+        }
+
+
+def get_user_tags(query: BaseQuery, user: UserEntity) -> tuple[str, ...]:
+    return (get_user_tag(user.oid),)
+
+
+def get_users_by_ids_tags(
+    query: GetUsersByIdsQuery, users: dict[str, UserEntity]
+) -> tuple[str, ...]:
+    # Missing oids too: creating one of those users changes the result.
+    return tuple(get_user_tag(oid) for oid in query.user_oids)
+
+
+def get_users_page_tags(
+    query: GetUsersQuery, page: Page[UserEntity]
+) -> tuple[str, ...]:
+    return (USERS_TAG,)
@@ -1,3 +1,5 @@
+from typing import Literal
+
 from pydantic import Field
 from pydantic_settings import BaseSettings
 
@@ -10,6 +12,14 @@ class Settings(BaseSettings):
     DB_NAME: str
     DB_HOST: str
     DB_PORT: int
+    DB_POOL_SIZE: int = Field(default=10)
+    DB_MAX_OVERFLOW: int = Field(default=10)
+    DB_WARM_UP_CONNECTIONS: int = Field(default=5)
+    DB_WARM_UP_RETRY_SECONDS: float = Field(default=5)
+    DB_ECHO: bool = Field(default=False)
+    DB_SLOW_QUERY_SECONDS: float = Field(default=0.2)
+    DB_SLOW_QUERY_EXPLAIN: bool = Field(default=False)
+    DB_QUERY_STATS_MAX_FINGERPRINTS: int = Field(default=1000)
 
     TEST_DB_USER: str
     TEST_DB_PASS: str
@@ -18,6 +28,53 @@ class Settings(BaseSettings):
     TEST_DB_PORT: int
 
     KAFKA_URL: str = Field(default="kafka:29092")
+    KAFKA_LINGER_MS: int = Field(default=20)
+    KAFKA_MAX_BATCH_SIZE: int = Field(default=64 * 1024)
+    KAFKA_COMPRESSION_TYPE: Literal["gzip", "snappy", "lz4", "zstd"] | None = Field(
+        default="gzip"
+    )
+    USER_EVENTS_TOPIC: str = Field(default="users")
+
+    EVENT_PUBLISH_MODE: Literal["sequential", "concurrent", "deferred"] = Field(
+        default="concurrent"
+    )
+
+    OUTBOX_RELAY_BATCH_SIZE: int = Field(default=1000)
+    OUTBOX_RELAY_IDLE_SECONDS: float = Field(default=1.0)
+    OUTBOX_RETENTION_HOURS: float = Field(default=24)
+    OUTBOX_RELAY_METRICS_PORT: int = Field(default=9100)
+    # Changing it reorders in-flight keys. Relays working at once are bounded
+    # by OUTBOX_KEY_PARTITIONS / OUTBOX_PARTITIONS_PER_CLAIM.
+    OUTBOX_KEY_PARTITIONS: int = Field(default=16)
+    OUTBOX_PARTITIONS_PER_CLAIM: int = Field(default=4)
+
+    USERS_REPOSITORY: Literal["sqlalchemy", "asyncpg", "memory"] = Field(
+        default="sqlalchemy"
+    )
+    USERS_COALESCE_LOOKUPS: bool = Field(default=True)
+    USERS_COALESCE_MAX_BATCH_SIZE: int = Field(default=500)
+
+    # Invalidated per process, other workers serve a result for up to
+    # ttl + stale seconds after it changed.
+    QUERY_CACHE_ENABLED: bool = Field(default=False)
+    QUERY_CACHE_MAX_ENTRIES: int = Field(default=10_000)
+    QUERY_CACHE_TTL_SECONDS: float = Field(default=5)
+    QUERY_CACHE_STALE_SECONDS: float = Field(default=10)
+    QUERY_SINGLE_FLIGHT_ENABLED: bool = Field(default=True)
+    QUERY_SINGLE_FLIGHT_TIMEOUT_SECONDS: float = Field(default=10)
+
+    USERNAME_FILTER_CAPACITY: int = Field(default=100_000)
+    USERNAME_FILTER_ERROR_RATE: float = Field(default=0.01)
+    USERNAME_FILTER_REFRESH_SECONDS: float = Field(default=300)
+
+    # Spans are recorded for a sampled share of requests and written as OTLP/JSON.
+    TRACING_EXPORTER: Literal["none", "stdout", "file"] = Field(default="none")
+    TRACING_FILE_PATH: str = Field(default="traces.jsonl")
+    TRACING_SAMPLE_RATE: float = Field(default=0.01)
+    TRACING_SERVICE_NAME: str = Field(default="product-service")
+
+    PASSWORD_HASH_WORKERS: int = Field(default=4)
+    PASSWORD_HASH_MAX_CONCURRENCY: int = Field(default=8)
 
     @property
     def DB_URL(self) -> str:
@@ -0,0 +1,25 @@
+import pytest
+
+from infrastructure.hashers.scrypt import ScryptPasswordHasher
+
+
+async def test_hash_verifies_only_its_password():
+    hasher = ScryptPasswordHasher(n=2**10)
+    password_hash = await hasher.hash("correct-horse")
+
+    assert await hasher.verify("correct-horse", password_hash)
+    assert not await hasher.verify("wrong-horse", password_hash)
+    assert not hasher.needs_rehash(password_hash)
+
+
+@pytest.mark.parametrize(
+    "parameters",
+    ["n=1000,r=8,p=1", "n=1024,r=0,p=1", "n=1024,r=8,p=0", "n,r=8,p=1", "n=1024"],
+)
+async def test_hash_with_invalid_parameters_matches_nothing(parameters):
+    hasher = ScryptPasswordHasher(n=2**10)
+    algorithm, _, salt, key = (await hasher.hash("correct-horse")).split("$")
+
+    password_hash = "$".join((algorithm, parameters, salt, key))
+
+    assert not await hasher.verify("correct-horse", password_hash)
@@ -0,0 +1,80 @@
+import asyncio
+from dataclasses import dataclass, field
+
+import pytest
+
+from infrastructure.message_brokers.base import BrokerMessage
+from infrastructure.message_brokers.kafka import KafkaMessageBroker
+from infrastructure.tracing.base import ISpanExporter, Span, SpanKind
+from infrastructure.tracing.tracer import tracer
+
+
+REQUEST_TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+REQUEST_SPAN_ID = "00f067aa0ba902b7"
+
+
+@dataclass
+class FakeProducer:
+    sent: list[bytes] = field(default_factory=list)
+    deliveries: list[asyncio.Future] = field(default_factory=list)
+
+    async def send(self, topic, key, value, headers) -> asyncio.Future:
+        self.sent.append(value)
+        delivery = asyncio.get_running_loop().create_future()
+        self.deliveries.append(delivery)
+        return delivery
+
+
+@dataclass
+class CollectingExporter(ISpanExporter):
+    spans: list[Span] = field(default_factory=list)
+
+    def export(self, spans: list[Span]) -> None:
+        self.spans.extend(spans)
+
+
+@pytest.fixture
+def exporter(monkeypatch) -> CollectingExporter:
+    exporter = CollectingExporter()
+    monkeypatch.setattr(tracer, "exporter", exporter)
+    return exporter
+
+
+def create_message(value: bytes, sampled: bool | None) -> BrokerMessage:
+    if sampled is None:
+        return BrokerMessage(topic="users", value=value)
+
+    traceparent = f"00-{REQUEST_TRACE_ID}-{REQUEST_SPAN_ID}-{'01' if sampled else '00'}"
+    return BrokerMessage(
+        topic="users", value=value, headers=(("traceparent", traceparent.encode()),)
+    )
+
+
+async def test_delivery_continues_the_trace_each_message_was_raised_in(exporter):
+    producer = FakeProducer()
+    broker = KafkaMessageBroker(producer=producer, consumer=None)
+
+    delivery = asyncio.create_task(
+        broker.deliver_messages(
+            [
+                create_message(b"1", sampled=True),
+                create_message(b"2", sampled=False),
+                create_message(b"3", sampled=None),
+            ]
+        )
+    )
+    await asyncio.sleep(0)
+    # Spans last until the broker acknowledged the message.
+    assert producer.sent == [b"1", b"2", b"3"]
+    assert not exporter.spans
+
+    for pending in producer.deliveries:
+        pending.set_result(None)
+    await delivery
+
+    [span] = exporter.spans
+    assert span.name == "users publish"
+    assert span.kind == SpanKind.PRODUCER
+    assert span.context.trace_id == REQUEST_TRACE_ID
+    assert span.parent_span_id == REQUEST_SPAN_ID
+    assert span.end_time is not None
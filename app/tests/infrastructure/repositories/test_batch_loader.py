@@ -0,0 +1,113 @@
+import asyncio
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass, field
+
+import pytest
+
+from infrastructure.repositories.common.batch_loader import BatchLoader
+
+
+@dataclass
+class FakeRows:
+    """Loads rows in batches, holding each batch until released."""
+
+    rows: dict[str, str]
+    release: asyncio.Event = field(default_factory=asyncio.Event)
+    batches: list[list[str]] = field(default_factory=list)
+
+    async def load_many(self, keys: Sequence[str]) -> Mapping[str, str]:
+        self.batches.append(list(keys))
+        await self.release.wait()
+        return {key: self.rows[key] for key in keys if key in self.rows}
+
+
+async def let_tasks_run() -> None:
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+async def test_loads_of_one_tick_share_a_batch():
+    rows = FakeRows(rows={"a": "A", "b": "B"})
+    rows.release.set()
+    loader = BatchLoader(rows.load_many)
+
+    values = await asyncio.gather(
+        loader.load("a"), loader.load("b"), loader.load("a"), loader.load("missing")
+    )
+
+    assert values == ["A", "B", "A", None]
+    assert rows.batches == [["a", "b", "missing"]]
+
+
+async def test_key_in_flight_is_not_loaded_again():
+    rows = FakeRows(rows={"a": "A"})
+    loader = BatchLoader(rows.load_many)
+
+    first = asyncio.create_task(loader.load("a"))
+    await let_tasks_run()
+    second = asyncio.create_task(loader.load("a"))
+    await let_tasks_run()
+    rows.release.set()
+
+    assert await asyncio.gather(first, second) == ["A", "A"]
+    assert rows.batches == [["a"]]
+
+
+async def test_batches_are_split_by_max_batch_size():
+    rows = FakeRows(rows={str(number): str(number) for number in range(5)})
+    rows.release.set()
+    loader = BatchLoader(rows.load_many, max_batch_size=2)
+
+    values = await asyncio.gather(*(loader.load(str(number)) for number in range(5)))
+
+    assert values == ["0", "1", "2", "3", "4"]
+    assert rows.batches == [["0", "1"], ["2", "3"], ["4"]]
+
+
+async def test_cancelled_caller_does_not_cancel_the_load_for_others():
+    rows = FakeRows(rows={"a": "A"})
+    loader = BatchLoader(rows.load_many)
+
+    impatient = asyncio.create_task(loader.load("a"))
+    patient = asyncio.create_task(loader.load("a"))
+    await let_tasks_run()
+    impatient.cancel()
+    await let_tasks_run()
+    rows.release.set()
+
+    assert await patient == "A"
+    assert impatient.cancelled()
+    assert rows.batches == [["a"]]
+
+
+async def test_failed_batch_fails_every_caller_and_is_not_remembered():
+    rows = FakeRows(rows={})
+    rows.release.set()
+    loader = BatchLoader(rows.load_many)
+
+    async def fail(keys: Sequence[str]) -> Mapping[str, str]:
+        raise ConnectionError("database is down")
+
+    loader.load_many = fail
+    results = await asyncio.gather(
+        loader.load("a"), loader.load("b"), return_exceptions=True
+    )
+    assert [type(result) for result in results] == [ConnectionError] * 2
+
+    loader.load_many = rows.load_many
+    rows.rows["a"] = "A"
+    assert await loader.load("a") == "A"
+
+
+async def test_cancelled_batch_cancels_its_callers():
+    rows = FakeRows(rows={"a": "A"})
+    loader = BatchLoader(rows.load_many)
+
+    caller = asyncio.create_task(loader.load("a"))
+    await let_tasks_run()
+    for task in loader._tasks:
+        task.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await caller
+    assert not loader._in_flight
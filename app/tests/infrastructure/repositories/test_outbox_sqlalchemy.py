@@ -0,0 +1,72 @@
+import asyncio
+from collections.abc import AsyncIterator
+
+import asyncpg
+import pytest
+from sqlalchemy import delete
+from sqlalchemy.exc import SQLAlchemyError
+
+from infrastructure.message_brokers.base import BrokerMessage
+from infrastructure.models.outbox import OutboxMessageModel
+from infrastructure.repositories.common import database
+from infrastructure.repositories.outbox.base import OutboxMessage
+from infrastructure.repositories.outbox.sqlalchemy import SqlAlchemyOutboxRepository
+from infrastructure.unit_of_work.sqlalchemy import SqlAlchemyUnitOfWork
+
+
+@pytest.fixture
+async def outbox_table() -> AsyncIterator[None]:
+    try:
+        async with database.test_async_engine.begin() as connection:
+            await connection.run_sync(
+                OutboxMessageModel.__table__.create, checkfirst=True
+            )
+            await connection.execute(delete(OutboxMessageModel))
+    except (OSError, SQLAlchemyError, asyncpg.PostgresError) as error:
+        await database.test_async_engine.dispose()
+        pytest.skip(f"test database is unavailable: {error}")
+
+    yield
+
+    async with database.test_async_engine.begin() as connection:
+        await connection.execute(delete(OutboxMessageModel))
+    await database.test_async_engine.dispose()
+
+
+def get_keys(claimed: list[OutboxMessage]) -> set[bytes | None]:
+    return {outbox_message.message.key for outbox_message in claimed}
+
+
+async def test_relays_claim_disjoint_key_partitions(outbox_table):
+    repository = SqlAlchemyOutboxRepository(key_partitions=16, partitions_per_claim=4)
+    unit_of_work = SqlAlchemyUnitOfWork(session_factory=database.test_session)
+    async with unit_of_work.begin():
+        await repository.add_messages(
+            BrokerMessage(topic="users", key=f"user-{number % 64}".encode(), value=b"")
+            for number in range(2000)
+        )
+
+    first_claimed = asyncio.Event()
+    second_claimed = asyncio.Event()
+
+    async def claim(is_first: bool) -> list[OutboxMessage]:
+        if not is_first:
+            await first_claimed.wait()
+
+        # Both claims stay in their transactions until both have been made.
+        async with unit_of_work.begin():
+            claimed = await repository.claim_unsent(limit=1000)
+            if is_first:
+                first_claimed.set()
+                await second_claimed.wait()
+            else:
+                second_claimed.set()
+
+        return claimed
+
+    first, second = await asyncio.gather(claim(True), claim(False))
+
+    assert first and second
+    assert not {message.id for message in first} & {message.id for message in second}
+    # Messages of one key are never held by two relays at once.
+    assert not get_keys(first) & get_keys(second)
@@ -0,0 +1,34 @@
+from domain.events.users import UserDeletedEvent
+from logic.events.users import InvalidateUserQueriesEventHandler
+from logic.mediator.base import Mediator, PublishMode
+from logic.mediator.deferred import collect_deferred_publications
+from logic.queries.cache import QueryCache, QueryCachePolicy
+from logic.queries.users import get_user_tag
+
+
+async def test_deferred_publication_still_invalidates_before_the_response():
+    query_cache = QueryCache()
+    mediator = Mediator(publish_mode=PublishMode.DEFERRED, query_cache=query_cache)
+    mediator.register_event(
+        UserDeletedEvent,
+        [
+            InvalidateUserQueriesEventHandler(
+                message_broker=None, query_cache=query_cache
+            )
+        ],
+    )
+
+    async def load() -> str:
+        return "user"
+
+    await query_cache.get_or_load(
+        "user-1",
+        load,
+        QueryCachePolicy(ttl=60, tags=lambda key, value: {get_user_tag(key)}),
+    )
+
+    async with collect_deferred_publications():
+        await mediator.publish(
+            [UserDeletedEvent(user_oid="user-1", username="user", phone="+70000000000")]
+        )
+        assert len(query_cache) == 0
@@ -0,0 +1,121 @@
+import asyncio
+from dataclasses import dataclass, field
+
+from logic.commands.base import BaseCommand, CommandHandler
+from logic.mediator.base import Mediator
+from logic.queries.base import BaseQuery, BaseQueryHandler
+from logic.queries.cache import QueryCache, QueryCachePolicy
+from logic.queries.single_flight import SingleFlight
+
+
+@dataclass(frozen=True)
+class GetRowQuery(BaseQuery):
+    key: str
+
+
+@dataclass(frozen=True, eq=False)
+class GetRowQueryHandler(BaseQueryHandler[GetRowQuery, str]):
+    """Reads a row, holding the first load after the read until released."""
+
+    rows: dict[str, str]
+    release_first_load: asyncio.Event = field(default_factory=asyncio.Event)
+    loads: list[str] = field(default_factory=list)
+
+    async def handle(self, query: GetRowQuery) -> str:
+        value = self.rows[query.key]
+        self.loads.append(value)
+        if len(self.loads) == 1:
+            await self.release_first_load.wait()
+
+        return value
+
+
+@dataclass(frozen=True)
+class SetRowCommand(BaseCommand):
+    key: str
+    value: str
+
+
+@dataclass(frozen=True)
+class SetRowCommandHandler(CommandHandler[SetRowCommand, None]):
+    rows: dict[str, str]
+
+    async def handle(self, command: SetRowCommand) -> None:
+        self.rows[command.key] = command.value
+
+
+async def let_tasks_run() -> None:
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+def init_mediator(handler: GetRowQueryHandler) -> Mediator:
+    mediator = Mediator(query_cache=QueryCache(), single_flight=SingleFlight())
+    mediator.register_query(
+        GetRowQuery,
+        handler,
+        cache_policy=QueryCachePolicy(
+            ttl=60, stale_ttl=60, tags=lambda query, result: {f"row:{query.key}"}
+        ),
+    )
+    return mediator
+
+
+async def test_load_after_invalidation_does_not_join_stale_flight():
+    handler = GetRowQueryHandler(rows={"a": "old"})
+    mediator = init_mediator(handler)
+
+    # A reads the old row and is still in flight...
+    first = asyncio.create_task(mediator.handle_query(GetRowQuery("a")))
+    await let_tasks_run()
+    assert handler.loads == ["old"]
+
+    # ...when a command commits and invalidates, before and after the commit.
+    handler.rows["a"] = "new"
+    mediator.query_cache.invalidate({"row:a"})
+    mediator.query_cache.invalidate({"row:a"})
+
+    second = asyncio.create_task(mediator.handle_query(GetRowQuery("a")))
+    await let_tasks_run()
+    handler.release_first_load.set()
+
+    assert await first == "old"
+    assert await second == "new"
+    assert await mediator.handle_query(GetRowQuery("a")) == "new"
+    assert handler.loads == ["old", "new"]
+
+
+async def test_equal_queries_share_one_load():
+    handler = GetRowQueryHandler(rows={"a": "old"})
+    mediator = init_mediator(handler)
+
+    tasks = [
+        asyncio.create_task(mediator.handle_query(GetRowQuery("a"))) for _ in range(5)
+    ]
+    await let_tasks_run()
+    handler.release_first_load.set()
+
+    assert await asyncio.gather(*tasks) == ["old"] * 5
+    assert handler.loads == ["old"]
+    assert mediator.single_flight.stats.collapsed == 4
+
+
+async def test_query_after_a_command_does_not_join_an_older_uncached_run():
+    handler = GetRowQueryHandler(rows={"a": "old"})
+    mediator = Mediator(single_flight=SingleFlight())
+    mediator.register_query(GetRowQuery, handler)
+    mediator.register_command(
+        SetRowCommand, [SetRowCommandHandler(mediator, rows=handler.rows)]
+    )
+
+    first = asyncio.create_task(mediator.handle_query(GetRowQuery("a")))
+    await let_tasks_run()
+    await mediator.handle_command(SetRowCommand("a", "new"))
+
+    second = asyncio.create_task(mediator.handle_query(GetRowQuery("a")))
+    await let_tasks_run()
+    handler.release_first_load.set()
+
+    assert await first == "old"
+    assert await second == "new"
+    assert handler.loads == ["old", "new"]
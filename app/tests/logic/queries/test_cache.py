@@ -0,0 +1,163 @@
+import asyncio
+from dataclasses import dataclass, field
+
+from logic.queries.cache import QueryCache, QueryCachePolicy
+
+
+POLICY = QueryCachePolicy(ttl=10, stale_ttl=5, tags=lambda key, value: {f"row:{key}"})
+
+
+@dataclass
+class FakeClock:
+    now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@dataclass
+class FakeRows:
+    """Reads rows, holding a load while `paused` is set until released."""
+
+    rows: dict[str, str]
+    paused: bool = False
+    release: asyncio.Event = field(default_factory=asyncio.Event)
+    loads: list[str] = field(default_factory=list)
+
+    def loader(self, key: str):
+        async def load() -> str:
+            value = self.rows[key]
+            self.loads.append(key)
+            if self.paused:
+                await self.release.wait()
+            return value
+
+        return load
+
+
+async def let_tasks_run() -> None:
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+async def test_fresh_entry_is_served_without_loading():
+    rows = FakeRows(rows={"a": "A"})
+    cache = QueryCache()
+
+    assert await cache.get_or_load("a", rows.loader("a"), POLICY) == "A"
+    rows.rows["a"] = "changed"
+    assert await cache.get_or_load("a", rows.loader("a"), POLICY) == "A"
+
+    assert rows.loads == ["a"]
+    assert (cache.stats.misses, cache.stats.hits) == (1, 1)
+
+
+async def test_least_recently_used_entry_is_evicted():
+    rows = FakeRows(rows={"a": "A", "b": "B", "c": "C"})
+    cache = QueryCache(max_entries=2)
+
+    await cache.get_or_load("a", rows.loader("a"), POLICY)
+    await cache.get_or_load("b", rows.loader("b"), POLICY)
+    # A hit makes "a" the most recently used, so "b" goes first.
+    await cache.get_or_load("a", rows.loader("a"), POLICY)
+    await cache.get_or_load("c", rows.loader("c"), POLICY)
+
+    assert len(cache) == 2
+    assert cache.stats.evictions == 1
+    await cache.get_or_load("a", rows.loader("a"), POLICY)
+    await cache.get_or_load("b", rows.loader("b"), POLICY)
+    assert rows.loads == ["a", "b", "c", "b"]
+
+
+async def test_invalidation_drops_tagged_entries_only():
+    rows = FakeRows(rows={"a": "A", "b": "B"})
+    cache = QueryCache()
+    await cache.get_or_load("a", rows.loader("a"), POLICY)
+    await cache.get_or_load("b", rows.loader("b"), POLICY)
+
+    assert cache.invalidate({"row:a"}) == 1
+
+    await cache.get_or_load("a", rows.loader("a"), POLICY)
+    await cache.get_or_load("b", rows.loader("b"), POLICY)
+    assert rows.loads == ["a", "b", "a"]
+
+
+async def test_load_racing_an_invalidation_is_not_stored():
+    rows = FakeRows(rows={"a": "old"}, paused=True)
+    cache = QueryCache()
+
+    load = asyncio.create_task(cache.get_or_load("a", rows.loader("a"), POLICY))
+    await let_tasks_run()
+    rows.rows["a"] = "new"
+    cache.invalidate({"row:a"})
+    rows.release.set()
+
+    # The caller still gets what it read, but nobody else will.
+    assert await load == "old"
+    assert len(cache) == 0
+    assert await cache.get_or_load("a", rows.loader("a"), POLICY) == "new"
+
+
+async def test_invalidating_again_on_exit_drops_entries_cached_meanwhile():
+    rows = FakeRows(rows={"a": "old"})
+    cache = QueryCache()
+
+    with cache.invalidating_again_on_exit():
+        cache.invalidate({"row:a"})
+        # A read between the event and the commit still sees the old row.
+        await cache.get_or_load("a", rows.loader("a"), POLICY)
+        rows.rows["a"] = "new"
+
+    assert await cache.get_or_load("a", rows.loader("a"), POLICY) == "new"
+
+
+async def test_stale_entry_is_served_while_refreshed_once():
+    clock = FakeClock()
+    rows = FakeRows(rows={"a": "old"})
+    cache = QueryCache(clock=clock)
+    await cache.get_or_load("a", rows.loader("a"), POLICY)
+
+    clock.now = 12
+    rows.rows["a"] = "new"
+    rows.paused = True
+    stale = [await cache.get_or_load("a", rows.loader("a"), POLICY) for _ in range(3)]
+    await let_tasks_run()
+
+    assert stale == ["old"] * 3
+    assert cache.stats.stale_hits == 3
+    assert rows.loads == ["a", "a"]
+
+    rows.release.set()
+    await let_tasks_run()
+    assert await cache.get_or_load("a", rows.loader("a"), POLICY) == "new"
+    assert cache.stats.hits == 1
+
+
+async def test_failed_refresh_keeps_the_stale_entry():
+    clock = FakeClock()
+    cache = QueryCache(clock=clock)
+    rows = FakeRows(rows={"a": "old"})
+    await cache.get_or_load("a", rows.loader("a"), POLICY)
+
+    async def fail() -> str:
+        raise ConnectionError("database is down")
+
+    clock.now = 12
+    assert await cache.get_or_load("a", fail, POLICY) == "old"
+    await let_tasks_run()
+
+    assert cache.stats.refresh_failures == 1
+    assert await cache.get_or_load("a", fail, POLICY) == "old"
+
+
+async def test_expired_entry_is_loaded_again():
+    clock = FakeClock()
+    rows = FakeRows(rows={"a": "old"})
+    cache = QueryCache(clock=clock)
+    await cache.get_or_load("a", rows.loader("a"), POLICY)
+
+    clock.now = 15
+    rows.rows["a"] = "new"
+
+    assert await cache.get_or_load("a", rows.loader("a"), POLICY) == "new"
+    assert cache.stats.expirations == 1
@@ -0,0 +1,121 @@
+import asyncio
+from dataclasses import dataclass, field
+
+import pytest
+
+from logic.queries.single_flight import SingleFlight
+
+
+@dataclass
+class FakeCall:
+    """Counts its runs, each held until released."""
+
+    result: str = "value"
+    release: asyncio.Event = field(default_factory=asyncio.Event)
+    runs: int = 0
+    cancelled: int = 0
+
+    async def __call__(self) -> str:
+        self.runs += 1
+        try:
+            await self.release.wait()
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        return self.result
+
+
+async def let_tasks_run() -> None:
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+async def test_concurrent_calls_share_one_run():
+    call = FakeCall()
+    single_flight = SingleFlight()
+
+    tasks = [asyncio.create_task(single_flight.run("a", call)) for _ in range(5)]
+    await let_tasks_run()
+    call.release.set()
+
+    assert await asyncio.gather(*tasks) == ["value"] * 5
+    assert call.runs == 1
+    assert (single_flight.stats.flights, single_flight.stats.collapsed) == (1, 4)
+    assert len(single_flight) == 0
+
+
+async def test_calls_after_landing_run_again():
+    call = FakeCall()
+    call.release.set()
+    single_flight = SingleFlight()
+
+    await single_flight.run("a", call)
+    await single_flight.run("a", call)
+
+    assert call.runs == 2
+
+
+async def test_error_reaches_every_waiter():
+    single_flight = SingleFlight()
+    release = asyncio.Event()
+
+    async def fail() -> str:
+        await release.wait()
+        raise ConnectionError("database is down")
+
+    tasks = [asyncio.create_task(single_flight.run("a", fail)) for _ in range(3)]
+    await let_tasks_run()
+    release.set()
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    assert [type(result) for result in results] == [ConnectionError] * 3
+
+
+async def test_cancelled_waiter_does_not_cancel_the_run_for_others():
+    call = FakeCall()
+    single_flight = SingleFlight()
+
+    impatient = asyncio.create_task(single_flight.run("a", call))
+    patient = asyncio.create_task(single_flight.run("a", call))
+    await let_tasks_run()
+    impatient.cancel()
+    await let_tasks_run()
+    call.release.set()
+
+    assert await patient == "value"
+    assert impatient.cancelled()
+    assert call.cancelled == 0
+    assert single_flight.stats.abandoned == 0
+
+
+async def test_run_is_cancelled_once_every_waiter_gave_up():
+    call = FakeCall()
+    single_flight = SingleFlight()
+
+    waiters = [asyncio.create_task(single_flight.run("a", call)) for _ in range(2)]
+    await let_tasks_run()
+    for waiter in waiters:
+        waiter.cancel()
+    await let_tasks_run()
+
+    assert call.cancelled == 1
+    assert single_flight.stats.abandoned == 1
+    assert len(single_flight) == 0
+
+    # A new caller starts afresh instead of joining the cancelled run.
+    call.release.set()
+    assert await single_flight.run("a", call) == "value"
+    assert call.runs == 2
+
+
+async def test_run_times_out_for_every_waiter():
+    call = FakeCall()
+    single_flight = SingleFlight(timeout=0.01)
+
+    tasks = [asyncio.create_task(single_flight.run("a", call)) for _ in range(2)]
+
+    for task in tasks:
+        with pytest.raises(TimeoutError):
+            await task
+    assert single_flight.stats.timeouts == 1
+    assert len(single_flight) == 0